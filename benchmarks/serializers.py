@@ -0,0 +1,70 @@
+"""Compares speed and output size of serializers supported by Async Caches.
+
+Usage:
+
+    python benchmarks/serializers.py [--number N]
+
+Serializers which dependencies are not installed are skipped.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from caches.serializers import SERIALIZERS, get_serializer
+
+
+def make_payload(items: int) -> dict:
+    return {
+        "count": items,
+        "results": [
+            {
+                "id": i,
+                "title": f"Result number {i}",
+                "score": i * 1.5,
+                "is_active": i % 2 == 0,
+                "tags": ["cache", "async", str(i)],
+                "author": {"id": i % 10, "name": "Author", "url": f"/u/{i % 10}/"},
+            }
+            for i in range(items)
+        ],
+    }
+
+
+PAYLOADS = {
+    "small": make_payload(1),
+    "medium": make_payload(100),
+    "large": make_payload(2500),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100, help="Runs per payload")
+    args = parser.parse_args()
+
+    print(f"{'serializer':<10} {'payload':<8} {'size':>10} {'dumps':>10} {'loads':>10}")
+    for name in sorted(SERIALIZERS):
+        if name == "none":
+            continue
+        try:
+            serializer = get_serializer(name)
+        except ImportError:
+            print(f"{name:<10} skipped, not installed")
+            continue
+
+        for label, payload in PAYLOADS.items():
+            data = serializer.dumps(payload)
+            dumps = timeit.timeit(lambda: serializer.dumps(payload), number=args.number)
+            loads = timeit.timeit(lambda: serializer.loads(data), number=args.number)
+            print(
+                f"{name:<10} {label:<8} {len(data):>10} "
+                f"{dumps / args.number * 1e6:>8.1f}us {loads / args.number * 1e6:>8.1f}us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,27 @@
-import json
 from abc import ABCMeta, abstractmethod
-from typing import Any, Awaitable, Dict, Iterable, Mapping, Optional, Union
+from inspect import isawaitable
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Union,
+)
 
 from ..core import CacheURL
+from ..serializers import get_serializer
 from ..types import Serializable
 
 
-class BaseBackend(metaclass=ABCMeta):
+class BaseBackend(metaclass=ABCMeta):  # pylint: disable=too-many-public-methods
     def __init__(self, cache_url: Union[CacheURL, str], **options: Any):
         self._cache_url = CacheURL(cache_url)
         self._options = options
+        self._serializer = get_serializer(self._get_option("serializer"))
 
     @abstractmethod
     async def connect(self):
@@ -33,10 +45,43 @@ class BaseBackend(metaclass=ABCMeta):
 
     @abstractmethod
     async def get_or_set(
-        self, key: str, default: Union[Awaitable[Serializable], Serializable], *, ttl: Optional[int]
+        self,
+        key: str,
+        default: Union[Awaitable[Serializable], Serializable],
+        *,
+        ttl: Optional[int],
     ) -> Any:
         raise NotImplementedError()
 
+    async def compare_and_set(
+        self,
+        key: str,
+        expected: Serializable,
+        value: Serializable,
+        *,
+        ttl: Optional[int],
+    ) -> bool:
+        current = await self.get(key, None)
+        if current is None or current != expected:
+            return False
+        await self.set(key, value, ttl=ttl)
+        return True
+
+    async def get_and_touch(self, key: str, default: Any, *, ttl: Optional[int]) -> Any:
+        value = await self.get(key, None)
+        if value is None:
+            return default
+        await self.touch(key, ttl)
+        return value
+
+    async def set_tagged(
+        self, key: str, value: Serializable, *, ttl: Optional[int], tags: Iterable[str]
+    ) -> Any:
+        raise self._not_supported("tags")
+
+    async def invalidate_tags(self, tags: Iterable[str]):
+        raise self._not_supported("tags")
+
     @abstractmethod
     async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
         raise NotImplementedError()
@@ -55,14 +100,38 @@ class BaseBackend(metaclass=ABCMeta):
     async def delete_many(self, keys: Iterable[str]):
         raise NotImplementedError()
 
+    async def delete_if_equal(self, key: str, value: Serializable) -> bool:
+        current = await self.get(key, None)
+        if current is None or current != value:
+            return False
+        await self.delete(key)
+        return True
+
     @abstractmethod
     async def clear(self):
         raise NotImplementedError()
 
+    async def clear_prefix(self, prefix: str):  # pylint: disable=unused-argument
+        # Backends which can't find keys by prefix delete all keys
+        await self.clear()
+
+    async def scan_keys(
+        self, prefix: str, pattern: str, batch: int  # pylint: disable=unused-argument
+    ) -> AsyncIterator[List[str]]:
+        """Yields batches of keys starting with prefix, which rest matches
+        glob-style pattern."""
+        raise self._not_supported("iterating keys")
+        yield  # pylint: disable=unreachable
+
     @abstractmethod
     async def touch(self, key: str, ttl: Optional[int]) -> bool:
         raise NotImplementedError()
 
+    async def touch_many(
+        self, keys: Iterable[str], ttl: Optional[int]
+    ) -> Dict[str, bool]:
+        return {key: await self.touch(key, ttl) for key in keys}
+
     @abstractmethod
     async def incr(self, key: str, delta: Union[float, int]) -> Union[float, int]:
         raise NotImplementedError()
@@ -71,26 +140,80 @@ class BaseBackend(metaclass=ABCMeta):
     async def decr(self, key: str, delta: Union[float, int]) -> Union[float, int]:
         raise NotImplementedError()
 
+    async def incr_many(
+        self, mapping: Mapping[str, Union[float, int]]
+    ) -> Dict[str, Union[float, int]]:
+        return {key: await self.incr(key, delta) for key, delta in mapping.items()}
+
     @staticmethod
-    def _serialize(value: Any) -> str:
-        """Serializes value to string.
+    async def _get_default_value(
+        default: Union[Awaitable[Serializable], Serializable]
+    ) -> Serializable:
+        """Returns default value, calling and awaiting it if necessary.
+
+        Args:
+            default (Union[Awaitable[Serializable], Serializable]): Value, callable
+                or awaitable.
+
+        Returns:
+            Serializable: Value to set in cache.
+        """
+        if callable(default):
+            default = default()
+        if isawaitable(default):
+            default = await default
+        return default
+
+    def _not_supported(self, feature: str) -> NotImplementedError:
+        """Returns error raised by optional methods backend doesn't implement.
+
+        Optional methods raise error returned by this method instead of
+        NotImplementedError, so linters don't require backends to override them.
+        """
+        return NotImplementedError(f"{type(self).__name__} doesn't support {feature}.")
+
+    def _get_option(self, name: str, default: Any = None) -> Any:
+        """Returns option's value, preferring kwargs over cache URL querystring.
+
+        Args:
+            name (str): Name of option.
+            default (Any): Value returned if option is not set.
+
+        Returns:
+            Any: Option's value.
+        """
+        if self._options.get(name) is not None:
+            return self._options[name]
+        return self._cache_url.options.get(name, default)
+
+    def _get_flag_option(self, name: str, default: bool = False) -> bool:
+        """Returns boolean option's value, accepting "true", "yes", "on" or "1"
+        strings from cache URL querystring as True."""
+        value = self._get_option(name)
+        if value is None:
+            return default
+        if isinstance(value, str):
+            return value.lower() in ("1", "true", "yes", "on")
+        return bool(value)
+
+    def _serialize(self, value: Any) -> Union[bytes, str]:
+        """Serializes value using cache's serializer.
 
         Args:
             value (Any): Whatever to serialize.
 
         Returns:
-            str: Serialized value to string.
+            Union[bytes, str]: Serialized value.
         """
-        return json.dumps(value)
+        return self._serializer.dumps(value)
 
-    @staticmethod
-    def _deserialize(value: str) -> Any:
+    def _deserialize(self, value: Union[bytes, str]) -> Any:
         """Deserializes value to original data structure.
 
         Args:
-            value (str): Serialized value
+            value (Union[bytes, str]): Serialized value
 
         Returns:
             Any: Original data
         """
-        return json.loads(value)
+        return self._serializer.loads(value)
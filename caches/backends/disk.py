@@ -0,0 +1,600 @@
+import asyncio
+import mmap
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from functools import partial
+from time import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from ..core import CacheURL
+from ..serializers import NullSerializer
+from ..types import Serializable
+from .base import BaseBackend
+
+LOG_FILE = "cache.log"
+
+# Record is checksum of its header, key and value, followed by them
+CHECKSUM = struct.Struct("<I")
+# Kind of record, flags, expires, key size, value size
+HEADER = struct.Struct("<BBdII")
+RECORD_SIZE = CHECKSUM.size + HEADER.size
+
+RECORD_SET = 1
+RECORD_DELETE = 2
+
+# Flags stored with values, telling if serializer returned str or bytes
+FLAG_STR = 0
+FLAG_BYTES = 1
+
+# Log isn't compacted before it grows to this size, even if most of it are old records
+MIN_COMPACTION_SIZE = 1024 * 1024
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Offset of key's record in log, size of record, size of value at its end, flags and expires
+Entry = Tuple[int, int, int, int, float]
+# Value, flags and expires, or None for deleted key
+Item = Optional[Tuple[Union[bytes, memoryview], int, float]]
+
+
+def make_record(key: str, item: Item) -> bytes:
+    key_ = key.encode("utf-8")
+    if item is None:
+        body = HEADER.pack(RECORD_DELETE, 0, 0.0, len(key_), 0) + key_
+    else:
+        data, flags, expires = item
+        body = (
+            HEADER.pack(RECORD_SET, flags, expires, len(key_), len(data)) + key_ + data
+        )
+    return CHECKSUM.pack(zlib.crc32(body)) + body
+
+
+def read_log(fd: int) -> Tuple[Dict[str, Entry], int]:
+    """Reads index of keys from log.
+
+    Returns:
+        Tuple[Dict[str, Entry], int]: Index and size of valid part of log. Log may
+            end with incomplete record, if process was killed while writing it.
+    """
+    index: Dict[str, Entry] = {}
+    size = os.fstat(fd).st_size
+    if not size:
+        return index, 0
+
+    now = time()
+    offset = 0
+    with mmap.mmap(fd, size, access=mmap.ACCESS_READ) as buffer:
+        while offset + RECORD_SIZE <= size:
+            checksum = CHECKSUM.unpack_from(buffer, offset)[0]
+            kind, flags, expires, key_size, value_size = HEADER.unpack_from(
+                buffer, offset + CHECKSUM.size
+            )
+            end = offset + RECORD_SIZE + key_size + value_size
+            if (
+                end > size
+                or zlib.crc32(buffer[offset + CHECKSUM.size : end]) != checksum
+            ):
+                break
+
+            key = buffer[offset + RECORD_SIZE : offset + RECORD_SIZE + key_size].decode(
+                "utf-8"
+            )
+            index.pop(key, None)
+            if kind == RECORD_SET and not (expires and expires <= now):
+                index[key] = (offset, end - offset, value_size, flags, expires)
+            offset = end
+
+    return index, offset
+
+
+def copy_records(
+    source: str, destination: str, entries: List[Entry]
+) -> Tuple[Dict[int, int], int]:
+    """Copies records that didn't expire to new log.
+
+    Returns:
+        Tuple[Dict[int, int], int]: Offsets of copied records in old log mapped to
+            their offsets in new log, and new log's size.
+    """
+    relocations = {}
+    now = time()
+    size = 0
+    with open(source, "rb") as old, open(destination, "wb") as new:
+        for offset, record_size, _, _, expires in sorted(entries):
+            if expires and expires <= now:
+                continue
+            old.seek(offset)
+            new.write(old.read(record_size))
+            relocations[offset] = size
+            size += record_size
+    return relocations, size
+
+
+class DiskBackend(BaseBackend):  # pylint: disable=too-many-public-methods
+    """Backend storing values in append-only log file, surviving process restarts.
+
+    Index of keys is kept in memory and values are read from log mapped to memory.
+    Records are appended to log by single thread, so writes don't block the event
+    loop, and values are visible to reads since they were set. When most of the
+    log are old records, it's compacted in background.
+    """
+
+    _writer: Optional[ThreadPoolExecutor]
+    _mmap: Optional[mmap.mmap]
+
+    def __init__(self, cache_url: Union[CacheURL, str], **options: Any) -> None:
+        super().__init__(cache_url, **options)
+
+        if isinstance(self._serializer, NullSerializer):
+            raise ValueError("Disk backend can't store values without serialization.")
+
+        directory = (self._cache_url.netloc or "") + self._cache_url.components.path
+        assert (
+            directory
+        ), "Disk cache requires path to directory, eg. disk:///var/cache/app"
+        self._directory = directory
+        self._path = os.path.join(directory, LOG_FILE)
+        self._max_size = int(self._get_option("max_size", 1024 * 1024 * 1024))
+
+        self._writer = None
+        # Keys are ordered from least recently written, which are evicted first
+        self._index: Dict[str, Entry] = {}
+        # Items which are being written, with ids of their writes
+        self._pending: Dict[str, Tuple[int, Item]] = {}
+        self._writes = 0
+        # Changed by clear, so writes started before it don't update index
+        self._generation = 0
+        # Size of log, and of records of keys in index
+        self._size = 0
+        self._live = 0
+        self._compaction: Optional[asyncio.Future] = None
+        self._mmap = None
+        self._map_fd = -1
+
+        # Used by writer thread only
+        self._fd = -1
+        self._end = 0
+
+    async def connect(self):
+        assert self._writer is None, "Cache backend is already running"
+        self._writer = ThreadPoolExecutor(max_workers=1)
+        loop = asyncio.get_event_loop()
+        self._index, self._size = await loop.run_in_executor(self._writer, self._open)
+        self._live = sum(entry[1] for entry in self._index.values())
+        self._map_fd = os.open(self._path, os.O_RDONLY)
+
+    async def disconnect(self):
+        assert self._writer is not None, "Cache backend is not running"
+        if self._compaction:
+            await self._compaction
+
+        await asyncio.get_event_loop().run_in_executor(self._writer, self._close)
+        self._writer.shutdown()
+        self._writer = None
+        os.close(self._map_fd)
+        self._map_fd = -1
+        self._mmap = None
+        self._index = {}
+        self._pending = {}
+
+    def _open(self) -> Tuple[Dict[str, Entry], int]:
+        os.makedirs(self._directory, exist_ok=True)
+        self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+        index, self._end = read_log(self._fd)
+        if self._end < os.fstat(self._fd).st_size:
+            os.ftruncate(self._fd, self._end)
+        return index, self._end
+
+    def _close(self):
+        os.close(self._fd)
+        self._fd = -1
+
+    def _append(self, data: bytes) -> int:
+        """Writes records at the end of log.
+
+        Returns:
+            int: Offset of first record.
+        """
+        offset = self._end
+        os.lseek(self._fd, offset, os.SEEK_SET)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self._fd, view) :]
+        self._end += len(data)
+        return offset
+
+    def _truncate(self):
+        os.ftruncate(self._fd, 0)
+        self._end = 0
+
+    def _replace(self, path: str, end: int, size: int, generation: int) -> bool:
+        """Replaces log with compacted log, copying records appended since compaction
+        started to its end."""
+        if generation != self._generation:
+            os.remove(path)
+            return False
+
+        fd = os.open(path, os.O_RDWR)
+        try:
+            os.lseek(self._fd, end, os.SEEK_SET)
+            os.lseek(fd, size, os.SEEK_SET)
+            remaining = self._end - end
+            while remaining:
+                view = memoryview(os.read(self._fd, min(remaining, COPY_BUFFER_SIZE)))
+                remaining -= len(view)
+                while view:
+                    view = view[os.write(fd, view) :]
+            os.replace(path, self._path)
+        except BaseException:
+            os.close(fd)
+            os.remove(path)
+            raise
+
+        os.close(self._fd)
+        self._fd = fd
+        self._end = size + self._end - end
+        return True
+
+    def _submit(self, items: Mapping[str, Item]) -> asyncio.Future:
+        """Appends records of items to log in writer thread.
+
+        Items are visible to reads immediately, and are moved to index after their
+        records are written. Records are written in the same order they were submitted.
+        """
+        assert self._writer is not None, "Cache backend is not running"
+        records = []
+        writes = []
+        for key, item in items.items():
+            record = make_record(key, item)
+            if item is not None and self._max_size and len(record) > self._max_size:
+                # Value would never fit in cache, so don't evict everything else for it
+                item = None
+                record = make_record(key, item)
+
+            self._writes += 1
+            self._pending[key] = (self._writes, item)
+            records.append(record)
+            writes.append((key, item, self._writes, len(record)))
+
+        loop = asyncio.get_event_loop()
+        future = loop.run_in_executor(self._writer, self._append, b"".join(records))
+        future.add_done_callback(partial(self._apply, self._generation, writes))
+        return future
+
+    async def _write(self, items: Mapping[str, Item]):
+        if items:
+            # Write can't be cancelled once it was submitted
+            await asyncio.shield(self._submit(items))
+
+    def _apply(
+        self,
+        generation: int,
+        writes: List[Tuple[str, Item, int, int]],
+        future: asyncio.Future,
+    ):
+        """Moves written items from pending to index."""
+        if generation != self._generation:
+            return
+
+        failed = future.cancelled() or future.exception() is not None
+        offset = 0 if failed else future.result()
+        for key, item, write, size in writes:
+            if self._pending.get(key, (0, None))[0] == write:
+                del self._pending[key]
+            if failed:
+                continue
+
+            self._drop(key)
+            if item is not None:
+                data, flags, expires = item
+                self._index[key] = (offset, size, len(data), flags, expires)
+                self._live += size
+            offset += size
+
+        if not failed:
+            self._size = offset
+            self._evict()
+            self._start_compaction()
+
+    def _drop(self, key: str):
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self._live -= entry[1]
+
+    def _evict(self):
+        """Removes least recently written keys until cache fits in its size limit."""
+        if not self._max_size or self._live <= self._max_size:
+            return
+
+        evicted: Dict[str, Item] = {}
+        while self._live > self._max_size and self._index:
+            key = next(iter(self._index))
+            self._drop(key)
+            if key not in self._pending:
+                evicted[key] = None
+
+        # Evicted keys are deleted in log, so they aren't read back after restart
+        if evicted:
+            self._submit(evicted)
+
+    def _start_compaction(self):
+        if (
+            self._compaction is None
+            and self._size > MIN_COMPACTION_SIZE
+            and self._size > self._live * 2
+        ):
+            self._compaction = asyncio.ensure_future(self._compact())
+
+    async def _compact(self):
+        """Rewrites log with only records of keys that are in index.
+
+        Records are copied to new log in separate thread, while new records are still
+        appended to old log. Those are then copied to new log by writer thread, before
+        it replaces old log.
+        """
+        loop = asyncio.get_event_loop()
+        path = self._path + ".compact"
+        generation = self._generation
+        end = self._size
+        try:
+            relocations, size = await loop.run_in_executor(
+                None, copy_records, self._path, path, list(self._index.values())
+            )
+            future = loop.run_in_executor(
+                self._writer, self._replace, path, end, size, generation
+            )
+            future.add_done_callback(
+                partial(self._relocate, generation, end, size, relocations)
+            )
+            await future
+        except OSError:
+            # Log stays not compacted, eg. until there's more free disk space
+            if os.path.exists(path):
+                os.remove(path)
+        finally:
+            self._compaction = None
+
+    def _relocate(
+        self,
+        generation: int,
+        end: int,
+        size: int,
+        relocations: Dict[int, int],
+        future: asyncio.Future,
+    ):
+        """Updates index with offsets of records in compacted log."""
+        if future.cancelled() or future.exception() is not None or not future.result():
+            return
+
+        os.close(self._map_fd)
+        self._map_fd = os.open(self._path, os.O_RDONLY)
+        self._mmap = None
+        if generation != self._generation:
+            return
+
+        index = {}
+        for key, entry in self._index.items():
+            if entry[0] >= end:
+                index[key] = (entry[0] - end + size, *entry[1:])
+            elif entry[0] in relocations:
+                index[key] = (relocations[entry[0]], *entry[1:])
+            else:
+                # Key expired and wasn't copied
+                self._live -= entry[1]
+        self._index = index
+        self._size = self._size - end + size
+
+    def _read(self, offset: int, size: int) -> memoryview:
+        """Returns view of log's part, without copying it."""
+        if self._mmap is None or len(self._mmap) < offset + size:
+            self._mmap = mmap.mmap(self._map_fd, 0, access=mmap.ACCESS_READ)
+        return memoryview(self._mmap)[offset : offset + size]
+
+    def _get_item(self, key: str) -> Item:
+        if key in self._pending:
+            item = self._pending[key][1]
+            if item is None or (item[2] and item[2] <= time()):
+                return None
+            return item
+
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+
+        offset, size, value_size, flags, expires = entry
+        if expires and expires <= time():
+            self._drop(key)
+            return None
+        return self._read(offset + size - value_size, value_size), flags, expires
+
+    @staticmethod
+    def _make_expires(ttl: Optional[int]) -> float:
+        if ttl is None:
+            return 0.0
+        return time() + ttl
+
+    def _encode(self, value: Serializable, expires: float) -> Item:
+        data = self._serialize(value)
+        if isinstance(data, str):
+            return data.encode("utf-8"), FLAG_STR, expires
+        return data, FLAG_BYTES, expires
+
+    def _decode(self, item: Item) -> Any:
+        assert item is not None
+        data, flags, _ = item
+        if flags == FLAG_STR:
+            return self._deserialize(str(data, "utf-8"))
+        return self._deserialize(bytes(data))
+
+    def _touch_item(self, item: Item, ttl: Optional[int]) -> Item:
+        assert item is not None
+        return bytes(item[0]), item[1], self._make_expires(ttl)
+
+    async def get(self, key: str, default: Any) -> Any:
+        item = self._get_item(key)
+        if item is None:
+            return default
+        return self._decode(item)
+
+    async def set(self, key: str, value: Serializable, *, ttl: Optional[int]) -> Any:
+        await self._write({key: self._encode(value, self._make_expires(ttl))})
+
+    async def add(self, key: str, value: Serializable, *, ttl: Optional[int]) -> bool:
+        if self._get_item(key) is not None:
+            return False
+        await self._write({key: self._encode(value, self._make_expires(ttl))})
+        return True
+
+    async def get_or_set(
+        self,
+        key: str,
+        default: Union[Awaitable[Serializable], Serializable],
+        *,
+        ttl: Optional[int],
+    ) -> Any:
+        value = await self.get(key, None)
+        if value is None:
+            value = await self._get_default_value(default)
+            await self.set(key, value, ttl=ttl)
+        return value
+
+    async def compare_and_set(
+        self,
+        key: str,
+        expected: Serializable,
+        value: Serializable,
+        *,
+        ttl: Optional[int],
+    ) -> bool:
+        item = self._get_item(key)
+        if item is None or self._decode(item) != expected:
+            return False
+        await self._write({key: self._encode(value, self._make_expires(ttl))})
+        return True
+
+    async def get_and_touch(self, key: str, default: Any, *, ttl: Optional[int]) -> Any:
+        item = self._get_item(key)
+        if item is None:
+            return default
+        value = self._decode(item)
+        await self._write({key: self._touch_item(item, ttl)})
+        return value
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        return {key: await self.get(key, None) for key in keys}
+
+    async def set_many(
+        self, mapping: Mapping[str, Serializable], *, ttl: Optional[int]
+    ):
+        expires = self._make_expires(ttl)
+        await self._write(
+            {key: self._encode(value, expires) for key, value in mapping.items()}
+        )
+
+    async def delete(self, key: str):
+        await self.delete_many([key])
+
+    async def delete_many(self, keys: Iterable[str]):
+        await self._write(
+            {key: None for key in keys if self._get_item(key) is not None}
+        )
+
+    async def delete_if_equal(self, key: str, value: Serializable) -> bool:
+        item = self._get_item(key)
+        if item is None or self._decode(item) != value:
+            return False
+        await self._write({key: None})
+        return True
+
+    async def clear(self):
+        assert self._writer is not None, "Cache backend is not running"
+        self._generation += 1
+        self._index = {}
+        self._pending = {}
+        self._size = 0
+        self._live = 0
+        self._mmap = None
+        await asyncio.shield(
+            asyncio.get_event_loop().run_in_executor(self._writer, self._truncate)
+        )
+
+    async def clear_prefix(self, prefix: str):
+        keys = set(self._index) | set(self._pending)
+        if all(key.startswith(prefix) for key in keys):
+            # Truncating the log is cheaper than writing tombstones for all keys
+            await self.clear()
+        else:
+            await self.delete_many([key for key in keys if key.startswith(prefix)])
+
+    async def scan_keys(
+        self, prefix: str, pattern: str, batch: int
+    ) -> AsyncIterator[List[str]]:
+        # Keys are copied, so cache can change while they are iterated
+        keys = [
+            key
+            for key in set(self._index) | set(self._pending)
+            if key.startswith(prefix) and fnmatchcase(key[len(prefix) :], pattern)
+        ]
+        for i in range(0, len(keys), batch):
+            found = [
+                key for key in keys[i : i + batch] if self._get_item(key) is not None
+            ]
+            if found:
+                yield found
+
+    async def touch(self, key: str, ttl: Optional[int]) -> bool:
+        return (await self.touch_many([key], ttl))[key]
+
+    async def touch_many(
+        self, keys: Iterable[str], ttl: Optional[int]
+    ) -> Dict[str, bool]:
+        items = {key: self._get_item(key) for key in keys}
+        await self._write(
+            {
+                key: self._touch_item(item, ttl)
+                for key, item in items.items()
+                if item is not None
+            }
+        )
+        return {key: item is not None for key, item in items.items()}
+
+    async def incr(self, key: str, delta: Union[float, int]) -> Union[float, int]:
+        if not isinstance(delta, (float, int)):
+            raise ValueError(f"incr value must be int or float")
+        return (await self.incr_many({key: delta}))[key]
+
+    async def decr(self, key: str, delta: Union[float, int]) -> Union[float, int]:
+        if not isinstance(delta, (float, int)):
+            raise ValueError(f"decr value must be int or float")
+        return (await self.incr_many({key: delta * -1}))[key]
+
+    async def incr_many(
+        self, mapping: Mapping[str, Union[float, int]]
+    ) -> Dict[str, Union[float, int]]:
+        values = {}
+        items: Dict[str, Item] = {}
+        for key, delta in mapping.items():
+            if not isinstance(delta, (float, int)):
+                raise ValueError(f"incr value must be int or float")
+            item = self._get_item(key)
+            if item is None:
+                raise ValueError(f"'{key}' is not set in the cache")
+
+            values[key] = self._decode(item) + delta
+            items[key] = self._encode(values[key], item[2])
+
+        await self._write(items)
+        return values
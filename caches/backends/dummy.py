@@ -1,5 +1,15 @@
 from inspect import isawaitable
-from typing import Any, Awaitable, Dict, Iterable, Mapping, Optional, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Union,
+)
 
 from ..types import Serializable
 from .base import BaseBackend
@@ -48,6 +58,19 @@ class DummyBackend(BaseBackend):
             self._serialize(default)
         return default
 
+    async def set_tagged(
+        self,
+        key: str,
+        value: Serializable,
+        *,
+        ttl: Optional[int],  # pylint: disable=unused-argument
+        tags: Iterable[str],  # pylint: disable=unused-argument
+    ) -> Any:
+        self._serialize(value)
+
+    async def invalidate_tags(self, tags: Iterable[str]):
+        pass
+
     async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
         return {key: None for key in keys}
 
@@ -69,6 +92,15 @@ class DummyBackend(BaseBackend):
     async def clear(self):
         pass
 
+    async def clear_prefix(self, prefix: str):
+        pass
+
+    async def scan_keys(
+        self, prefix: str, pattern: str, batch: int
+    ) -> AsyncIterator[List[str]]:
+        return
+        yield  # pylint: disable=unreachable
+
     async def touch(self, key: str, ttl: Optional[int]) -> bool:
         return False
 
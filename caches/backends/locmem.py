@@ -1,38 +1,213 @@
+import asyncio
+import os
+import pickle
+import struct
+import sys
+from fnmatch import fnmatchcase
+from heapq import heapify, heappop, heappush
 from inspect import isawaitable
 from time import time
-from typing import Any, Awaitable, Dict, Iterable, Mapping, Optional, Tuple, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
+from ..eviction import EvictionPolicy, get_eviction_policy
 from ..types import Serializable
 from .base import BaseBackend
 
+SNAPSHOT_MAGIC = b"ACLMSNP1"
+# Expiration timestamp (0 if key doesn't expire), kind of value, key size, value size
+SNAPSHOT_RECORD = struct.Struct("<qBII")
 
-class LocMemBackend(BaseBackend):
+VALUE_STR = 0
+VALUE_BYTES = 1
+# Value stored without serialization, pickled in snapshot
+VALUE_OBJECT = 2
+
+Entry = Tuple[str, Any, Optional[int]]
+
+# Number of outdated deadlines allowed in heap over number of cached keys,
+# before the heap is rebuilt from cache
+DEADLINES_SLACK = 1000
+
+
+def write_snapshot(path: str, entries: Iterable[Entry]):
+    """Writes cache's entries to file, replacing it after all entries were written.
+
+    Values stored without serialization that can't be pickled are skipped.
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as snapshot:
+        snapshot.write(SNAPSHOT_MAGIC)
+        for key, value, ttl in entries:
+            if isinstance(value, str):
+                kind, data = VALUE_STR, value.encode("utf-8")
+            elif isinstance(value, bytes):
+                kind, data = VALUE_BYTES, value
+            else:
+                try:
+                    kind, data = (
+                        VALUE_OBJECT,
+                        pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+                    )
+                except (pickle.PicklingError, AttributeError, TypeError):
+                    continue
+
+            key_ = key.encode("utf-8")
+            snapshot.write(SNAPSHOT_RECORD.pack(ttl or 0, kind, len(key_), len(data)))
+            snapshot.write(key_)
+            snapshot.write(data)
+    os.replace(temp_path, path)
+
+
+def read_snapshot(path: str) -> List[Entry]:
+    """Reads entries that didn't expire yet from snapshot file.
+
+    Incomplete record at the end of file is ignored.
+    """
+    entries = []
+    now = time()
+    with open(path, "rb") as snapshot:
+        if snapshot.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise ValueError(f"'{path}' is not a local memory cache snapshot.")
+
+        while True:
+            header = snapshot.read(SNAPSHOT_RECORD.size)
+            if len(header) < SNAPSHOT_RECORD.size:
+                break
+            ttl, kind, key_size, value_size = SNAPSHOT_RECORD.unpack(header)
+            key = snapshot.read(key_size)
+            data = snapshot.read(value_size)
+            if len(key) < key_size or len(data) < value_size:
+                break
+            if ttl and ttl < now:
+                continue
+
+            value: Any = data
+            if kind == VALUE_STR:
+                value = data.decode("utf-8")
+            elif kind == VALUE_OBJECT:
+                value = pickle.loads(data)
+            entries.append((key.decode("utf-8"), value, ttl or None))
+    return entries
+
+
+class LocMemBackend(BaseBackend):  # pylint: disable=too-many-public-methods
     _caches: Dict[str, Dict[str, Tuple[Any, Optional[int]]]] = {}
+    _policies: Dict[str, Optional[EvictionPolicy]] = {}
+    _deadlines: Dict[str, List[Tuple[int, str]]] = {}
+    # Keys set with tag, by tag, and tags of key, by key
+    _tags: Dict[str, Dict[str, Set[str]]] = {}
+    _key_tags: Dict[str, Dict[str, Set[str]]] = {}
 
     async def connect(self):
         # pylint: disable=attribute-defined-outside-init
         self._id = self._cache_url.netloc or "_"
+        self._max_entries = int(self._get_option("max_entries", 0))
+        self._max_bytes = int(self._get_option("max_bytes", 0))
+        self._expiry_interval = float(self._get_option("expiry_interval", 1))
+        self._expiry_batch = int(self._get_option("expiry_batch", 1000))
+        self._snapshot_path = self._get_option("snapshot")
         self._caches[self._id] = {}
+        self._deadlines[self._id] = []
+        self._tags[self._id] = {}
+        self._key_tags[self._id] = {}
+        self._policies[self._id] = None
+        if self._max_entries or self._max_bytes:
+            self._policies[self._id] = get_eviction_policy(self._get_option("eviction"))
+
+        if self._snapshot_path and os.path.exists(self._snapshot_path):
+            await self.restore(self._snapshot_path)
+
+        self._expiry_task = None
+        if self._expiry_interval:
+            self._expiry_task = asyncio.ensure_future(self._expire())
         return True
 
     async def disconnect(self):
-        self._caches.pop(self._id)
+        if self._expiry_task:
+            self._expiry_task.cancel()
+            try:
+                await self._expiry_task
+            except asyncio.CancelledError:
+                pass
+
+        try:
+            if self._snapshot_path:
+                await self.snapshot(self._snapshot_path)
+        finally:
+            self._caches.pop(self._id)
+            self._deadlines.pop(self._id)
+            self._tags.pop(self._id)
+            self._key_tags.pop(self._id)
+            self._policies.pop(self._id)
         return True
 
+    @property
+    def evictions(self) -> int:
+        """Number of keys evicted from cache to stay within its size limits."""
+        policy = self._policies.get(self._id)
+        return policy.evictions if policy is not None else 0
+
+    async def snapshot(self, path: str):
+        """Writes keys that didn't expire to file, from which they can be restored.
+
+        File is written in separate thread. Keys keep their expiration times.
+        """
+        now = time()
+        entries = [
+            (key, value, ttl)
+            for key, (value, ttl) in self._caches[self._id].items()
+            if not ttl or ttl >= now
+        ]
+        await asyncio.get_event_loop().run_in_executor(
+            None, write_snapshot, path, entries
+        )
+
+    async def restore(self, path: str):
+        """Reads keys from snapshot file, skipping keys that expired since.
+
+        Keys that are already set in cache are not overwritten.
+        """
+        entries = await asyncio.get_event_loop().run_in_executor(
+            None, read_snapshot, path
+        )
+        cache = self._caches[self._id]
+        for key, value, ttl in entries:
+            if key not in cache:
+                self._store(key, value, ttl)
+
     async def get(self, key: str, default: Any) -> Any:
         if key not in self._caches[self._id]:
             return default
 
         value, ttl = self._caches[self._id][key]
         if ttl and ttl < time():
+            await self.delete(key)
             return default
 
+        policy = self._policies[self._id]
+        if policy is not None:
+            policy.touch(key)
+
         return self._deserialize(value)
 
     async def set(self, key: str, value: Serializable, *, ttl: Optional[int]) -> Any:
         if ttl is not None:
             ttl += int(time())
-        self._caches[self._id][key] = self._serialize(value), ttl
+        # New value replaces tags of the old one
+        self._untag(key)
+        self._store(key, self._serialize(value), ttl)
 
     async def add(self, key: str, value: Serializable, *, ttl: Optional[int]) -> bool:
         if key not in self._caches[self._id]:
@@ -41,7 +216,11 @@ class LocMemBackend(BaseBackend):
         return False
 
     async def get_or_set(
-        self, key: str, default: Union[Awaitable[Serializable], Serializable], *, ttl: Optional[int]
+        self,
+        key: str,
+        default: Union[Awaitable[Serializable], Serializable],
+        *,
+        ttl: Optional[int],
     ) -> Any:
         value = await self.get(key, None)
         if value is None:
@@ -53,6 +232,24 @@ class LocMemBackend(BaseBackend):
             return default
         return value
 
+    async def set_tagged(
+        self, key: str, value: Serializable, *, ttl: Optional[int], tags: Iterable[str]
+    ) -> Any:
+        await self.set(key, value, ttl=ttl)
+        if key not in self._caches[self._id]:
+            return  # Value was too big to store
+
+        key_tags = self._key_tags[self._id].setdefault(key, set())
+        for tag in tags:
+            self._tags[self._id].setdefault(tag, set()).add(key)
+            key_tags.add(tag)
+
+    async def invalidate_tags(self, tags: Iterable[str]):
+        keys: Set[str] = set()
+        for tag in tags:
+            keys.update(self._tags[self._id].pop(tag, ()))
+        await self.delete_many(keys)
+
     async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
         return {key: await self.get(key, None) for key in keys}
 
@@ -64,13 +261,50 @@ class LocMemBackend(BaseBackend):
 
     async def delete(self, key: str):
         self._caches[self._id].pop(key, None)
+        self._untag(key)
+        policy = self._policies[self._id]
+        if policy is not None:
+            policy.remove(key)
 
     async def delete_many(self, keys: Iterable[str]):
         for key in keys:
-            self._caches[self._id].pop(key, None)
+            await self.delete(key)
 
     async def clear(self):
         self._caches[self._id] = {}
+        self._deadlines[self._id] = []
+        self._tags[self._id] = {}
+        self._key_tags[self._id] = {}
+        policy = self._policies[self._id]
+        if policy is not None:
+            policy.clear()
+
+    async def clear_prefix(self, prefix: str):
+        # Tags of deleted keys are removed with them
+        await self.delete_many(
+            [key for key in self._caches[self._id] if key.startswith(prefix)]
+        )
+
+    async def scan_keys(
+        self, prefix: str, pattern: str, batch: int
+    ) -> AsyncIterator[List[str]]:
+        # Keys are copied, so cache can change while they are iterated
+        keys = [
+            key
+            for key in self._caches[self._id]
+            if key.startswith(prefix) and fnmatchcase(key[len(prefix) :], pattern)
+        ]
+        for i in range(0, len(keys), batch):
+            cache = self._caches[self._id]
+            now = time()
+            found = []
+            for key in keys[i : i + batch]:
+                if key in cache:
+                    ttl = cache[key][1]
+                    if not ttl or ttl >= now:
+                        found.append(key)
+            if found:
+                yield found
 
     async def touch(self, key: str, ttl: Optional[int]) -> bool:
         if key not in self._caches[self._id]:
@@ -78,8 +312,10 @@ class LocMemBackend(BaseBackend):
         if ttl is not None:
             ttl += int(time())
 
-        value, _ = self._caches[self._id][key]
+        value, old_ttl = self._caches[self._id][key]
         self._caches[self._id][key] = value, ttl
+        if ttl is not None and ttl != old_ttl:
+            self._push_deadline(key, ttl)
         return True
 
     async def incr(self, key: str, delta: Union[float, int]) -> Union[float, int]:
@@ -90,7 +326,7 @@ class LocMemBackend(BaseBackend):
 
         value, ttl = self._caches[self._id][key]
         value = self._deserialize(value) + delta
-        self._caches[self._id][key] = self._serialize(value), ttl
+        self._store(key, self._serialize(value), ttl)
         return value
 
     async def decr(self, key: str, delta: Union[float, int]) -> Union[float, int]:
@@ -101,5 +337,148 @@ class LocMemBackend(BaseBackend):
 
         value, ttl = self._caches[self._id][key]
         value = self._deserialize(value) - delta
-        self._caches[self._id][key] = self._serialize(value), ttl
+        self._store(key, self._serialize(value), ttl)
         return value
+
+    async def incr_many(
+        self, mapping: Mapping[str, Union[float, int]]
+    ) -> Dict[str, Union[float, int]]:
+        for key, delta in mapping.items():
+            if key not in self._caches[self._id]:
+                raise ValueError(f"'{key}' is not set in the cache")
+            if not isinstance(delta, (float, int)):
+                raise ValueError(f"incr value must be int or float")
+
+        return {key: await self.incr(key, delta) for key, delta in mapping.items()}
+
+    def _store(self, key: str, value: Any, ttl: Optional[int]):
+        """Stores serialized value in cache, evicting other keys to make room for it.
+
+        Args:
+            key (str): Cache key.
+            value (Any): Serialized value.
+            ttl (int): Timestamp after which key expires, or None.
+        """
+        cache = self._caches[self._id]
+        # Key's deadline is already in heap if it didn't change, eg. in incr
+        deadline = None
+        if ttl is not None and (key not in cache or cache[key][1] != ttl):
+            deadline = ttl
+
+        policy = self._policies[self._id]
+        if policy is None:
+            cache[key] = value, ttl
+            if deadline is not None:
+                self._push_deadline(key, deadline)
+            return
+
+        size = len(key) + self._get_value_size(value)
+        if self._max_bytes and size > self._max_bytes:
+            # Value would never fit in cache, so don't evict everything else for it
+            cache.pop(key, None)
+            self._untag(key)
+            policy.remove(key)
+            return
+
+        while len(policy) and (
+            (
+                self._max_entries
+                and key not in policy
+                and len(policy) >= self._max_entries
+            )
+            or (
+                self._max_bytes
+                and policy.size - policy.get_size(key) + size > self._max_bytes
+            )
+        ):
+            evicted = policy.evict()
+            cache.pop(evicted, None)
+            self._untag(evicted)
+
+        cache[key] = value, ttl
+        policy.add(key, size)
+        if deadline is not None:
+            self._push_deadline(key, deadline)
+
+    def _untag(self, key: str):
+        """Removes key from sets of keys of its tags."""
+        tags = self._key_tags[self._id].pop(key, None)
+        if not tags:
+            return
+
+        tag_keys = self._tags[self._id]
+        for tag in tags:
+            keys = tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del tag_keys[tag]
+
+    def _push_deadline(self, key: str, ttl: int):
+        """Adds key's deadline to heap.
+
+        Deadlines of keys deleted, evicted or set again stay in heap until they
+        pass, so heap is rebuilt from cache when they outnumber cached keys.
+        """
+        cache = self._caches[self._id]
+        deadlines = self._deadlines[self._id]
+        heappush(deadlines, (ttl, key))
+        if len(deadlines) > len(cache) * 2 + DEADLINES_SLACK:
+            deadlines[:] = [
+                (entry[1], cache_key)
+                for cache_key, entry in cache.items()
+                if entry[1] is not None
+            ]
+            heapify(deadlines)
+
+    def _get_value_size(self, value: Any) -> int:
+        """Returns approximate size of value stored in cache.
+
+        Size of serialized value is its length. For objects stored without
+        serialization its the shallow size of object, not including the objects
+        it references.
+        """
+        if isinstance(value, (bytes, str)):
+            return len(value)
+        return sys.getsizeof(value)
+
+    async def _expire(self):
+        """Periodically removes expired keys from cache.
+
+        Keys are removed in batches of `expiry_batch` size, and control is given back
+        to the event loop between the batches, so large number of keys expiring at
+        the same time doesn't block other tasks.
+        """
+        while True:
+            await asyncio.sleep(self._expiry_interval)
+            while self._remove_expired(self._expiry_batch) == self._expiry_batch:
+                await asyncio.sleep(0)
+
+    def _remove_expired(self, limit: int) -> int:
+        """Removes keys which deadlines have passed.
+
+        Deadlines heap may contain outdated entries for keys that were since
+        deleted, set again or touched. Those are discarded without removing the key.
+
+        Args:
+            limit (int): Maximum number of deadlines to process.
+
+        Returns:
+            int: Number of processed deadlines.
+        """
+        cache = self._caches[self._id]
+        deadlines = self._deadlines[self._id]
+        policy = self._policies[self._id]
+        now = time()
+
+        processed = 0
+        while deadlines and deadlines[0][0] < now and processed < limit:
+            ttl, key = heappop(deadlines)
+            processed += 1
+            if key in cache and cache[key][1] == ttl:
+                del cache[key]
+                self._untag(key)
+                if policy is not None:
+                    policy.remove(key)
+
+        return processed
@@ -0,0 +1,463 @@
+import asyncio
+import re
+from hashlib import sha1
+from time import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from ..core import CacheURL
+from ..serializers import JSONSerializer, NullSerializer
+from ..types import Serializable
+from .base import BaseBackend
+
+# Memcached treats expiration times longer than 30 days as unix timestamps
+MAX_RELATIVE_TTL = 60 * 60 * 24 * 30
+MAX_KEY_LENGTH = 250
+INVALID_KEY = re.compile(r"[\x00-\x20\x7f]")
+
+# Flags stored with values, telling if serializer returned str or bytes
+FLAG_STR = 0
+FLAG_BYTES = 1
+
+# Number of keys read by single get command
+GET_BATCH_SIZE = 100
+
+T = TypeVar("T")
+Item = Tuple[bytes, int, int]
+
+
+class MemcachedError(Exception):
+    """Raised when memcached replies with error."""
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def readline(self) -> bytes:
+        line = await self.reader.readuntil(b"\r\n")
+        if line.startswith((b"ERROR", b"CLIENT_ERROR", b"SERVER_ERROR")):
+            raise MemcachedError(line[:-2].decode("utf-8", "replace"))
+        return line[:-2]
+
+    async def readexactly(self, size: int) -> bytes:
+        return await self.reader.readexactly(size)
+
+    def close(self):
+        self.writer.close()
+
+
+class _ConnectionsPool:
+    """Pool of connections to memcached server, opened when needed."""
+
+    def __init__(self, host: str, port: int, minsize: int, maxsize: int):
+        self._host = host
+        self._port = port
+        self._minsize = minsize
+        self._maxsize = maxsize
+        self._size = 0
+        self._idle: List[_Connection] = []
+        self._waiters: List[asyncio.Future] = []
+        self._connections: Set[_Connection] = set()
+
+    async def connect(self):
+        connections = [await self.acquire() for _ in range(self._minsize)]
+        for connection in connections:
+            self.release(connection)
+
+    async def acquire(self) -> _Connection:
+        while not self._idle and self._size >= self._maxsize:
+            waiter = asyncio.get_event_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+        if self._idle:
+            return self._idle.pop()
+
+        self._size += 1
+        try:
+            reader, writer = await asyncio.open_connection(self._host, self._port)
+        except BaseException:
+            self._size -= 1
+            self._wake_waiter()
+            raise
+
+        connection = _Connection(reader, writer)
+        self._connections.add(connection)
+        return connection
+
+    def release(self, connection: _Connection, discard: bool = False):
+        """Returns connection to pool, or closes it if its state is unknown
+        (eg. command was cancelled before its reply was read)."""
+        if discard:
+            connection.close()
+            self._connections.discard(connection)
+            self._size -= 1
+        else:
+            self._idle.append(connection)
+        self._wake_waiter()
+
+    def _wake_waiter(self):
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    def close(self):
+        for connection in self._connections:
+            connection.close()
+        self._connections.clear()
+        self._idle.clear()
+        self._size = 0
+
+
+class MemcachedBackend(BaseBackend):
+    _pool: Optional[_ConnectionsPool]
+
+    def __init__(self, cache_url: Union[CacheURL, str], **options: Any) -> None:
+        super().__init__(cache_url, **options)
+        self._pool = None
+
+        if isinstance(self._serializer, NullSerializer):
+            raise ValueError(
+                "Memcached backend can't store values without serialization."
+            )
+
+        self._host = self._cache_url.hostname or "localhost"
+        self._port = self._cache_url.port or 11211
+        self._minsize = int(self._get_option("minsize", 1))
+        self._maxsize = int(self._get_option("maxsize", 10))
+        # Memcached's incr reads value as decimal number, which only json
+        # serializer stores it as, eg. msgpack stores 48 as b"0"
+        self._native_incr = isinstance(self._serializer, JSONSerializer)
+
+    async def connect(self):
+        assert self._pool is None, "Cache backend is already running"
+        self._pool = _ConnectionsPool(
+            self._host, self._port, self._minsize, self._maxsize
+        )
+        await self._pool.connect()
+
+    async def disconnect(self):
+        assert self._pool is not None, "Cache backend is not running"
+        self._pool.close()
+        self._pool = None
+
+    async def _execute(
+        self, request: bytes, read: Callable[[_Connection], Awaitable[T]]
+    ) -> T:
+        """Writes request to connection from pool and reads reply with read function.
+
+        Request can contain many commands, which are sent in single write and
+        which replies are read together, in single round-trip.
+        """
+        assert self._pool is not None, "Cache backend is not running"
+        connection = await self._pool.acquire()
+        try:
+            connection.writer.write(request)
+            result = await read(connection)
+        except BaseException:
+            # Replies to some of commands may still be waiting in connection
+            self._pool.release(connection, discard=True)
+            raise
+        self._pool.release(connection)
+        return result
+
+    @staticmethod
+    def _make_key(key: str) -> str:
+        """Returns key usable by memcached, which limits keys to 250 bytes without
+        whitespace or control characters. Other keys are replaced by their hash."""
+        if len(key.encode("utf-8")) > MAX_KEY_LENGTH or INVALID_KEY.search(key):
+            return "sha1:" + sha1(key.encode("utf-8")).hexdigest()
+        return key
+
+    @staticmethod
+    def _make_exptime(ttl: Optional[int]) -> int:
+        if not ttl:
+            return 0
+        if ttl > MAX_RELATIVE_TTL:
+            return int(time()) + ttl
+        return ttl
+
+    def _encode(self, value: Serializable) -> Tuple[bytes, int]:
+        value = self._serialize(value)
+        if isinstance(value, str):
+            return value.encode("utf-8"), FLAG_STR
+        return value, FLAG_BYTES
+
+    def _decode(self, data: bytes, flags: int) -> Any:
+        if flags == FLAG_STR:
+            return self._deserialize(data.decode("utf-8"))
+        return self._deserialize(data)
+
+    def _storage_command(
+        self,
+        command: str,
+        key: str,
+        value: Serializable,
+        ttl: Optional[int],
+        *args: Any,
+    ) -> bytes:
+        data, flags = self._encode(value)
+        fields = [
+            command,
+            self._make_key(key),
+            flags,
+            self._make_exptime(ttl),
+            len(data),
+            *args,
+        ]
+        header = " ".join(str(field) for field in fields)
+        return header.encode("utf-8") + b"\r\n" + data + b"\r\n"
+
+    @staticmethod
+    def _read_lines(count: int) -> Callable[[_Connection], Awaitable[List[bytes]]]:
+        async def read(connection: _Connection) -> List[bytes]:
+            return [await connection.readline() for _ in range(count)]
+
+        return read
+
+    @staticmethod
+    def _read_items(
+        count: int = 1
+    ) -> Callable[[_Connection], Awaitable[Dict[bytes, Item]]]:
+        """Returns function reading VALUE replies of count get commands.
+
+        Returns:
+            Dict[bytes, Item]: Found keys mapped to their data, flags and cas unique.
+        """
+
+        async def read(connection: _Connection) -> Dict[bytes, Item]:
+            items = {}
+            ends = 0
+            while ends < count:
+                line = await connection.readline()
+                if line == b"END":
+                    ends += 1
+                    continue
+
+                _, key, flags, size, *cas = line.split()
+                data = (await connection.readexactly(int(size) + 2))[:-2]
+                items[key] = (data, int(flags), int(cas[0]) if cas else 0)
+            return items
+
+        return read
+
+    async def _get_item(self, command: str, key: str, *args: Any) -> Optional[Item]:
+        key_ = self._make_key(key)
+        request = (
+            " ".join([command, *[str(arg) for arg in args], key_]).encode("utf-8")
+            + b"\r\n"
+        )
+        items = await self._execute(request, self._read_items())
+        return items.get(key_.encode("utf-8"))
+
+    async def get(self, key: str, default: Any) -> Any:
+        item = await self._get_item("get", key)
+        if item is None:
+            return default
+        return self._decode(item[0], item[1])
+
+    async def set(self, key: str, value: Serializable, *, ttl: Optional[int]) -> Any:
+        request = self._storage_command("set", key, value, ttl)
+        await self._execute(request, self._read_lines(1))
+
+    async def add(self, key: str, value: Serializable, *, ttl: Optional[int]) -> bool:
+        request = self._storage_command("add", key, value, ttl)
+        return (await self._execute(request, self._read_lines(1)))[0] == b"STORED"
+
+    async def get_or_set(
+        self,
+        key: str,
+        default: Union[Awaitable[Serializable], Serializable],
+        *,
+        ttl: Optional[int],
+    ) -> Any:
+        value = await self.get(key, None)
+        if value is None:
+            value = await self._get_default_value(default)
+            await self.set(key, value, ttl=ttl)
+        return value
+
+    async def compare_and_set(
+        self,
+        key: str,
+        expected: Serializable,
+        value: Serializable,
+        *,
+        ttl: Optional[int],
+    ) -> bool:
+        item = await self._get_item("gets", key)
+        if item is None or self._decode(item[0], item[1]) != expected:
+            return False
+        request = self._storage_command("cas", key, value, ttl, item[2])
+        return (await self._execute(request, self._read_lines(1)))[0] == b"STORED"
+
+    async def get_and_touch(self, key: str, default: Any, *, ttl: Optional[int]) -> Any:
+        item = await self._get_item("gat", key, self._make_exptime(ttl))
+        if item is None:
+            return default
+        return self._decode(item[0], item[1])
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys_ = {key: self._make_key(key) for key in keys}
+        if not keys_:
+            return {}
+
+        # Commands reading batches of keys are sent together, in single write
+        unique = list(dict.fromkeys(keys_.values()))
+        batches = [
+            unique[i : i + GET_BATCH_SIZE]
+            for i in range(0, len(unique), GET_BATCH_SIZE)
+        ]
+        request = b"".join(
+            b"get " + " ".join(batch).encode("utf-8") + b"\r\n" for batch in batches
+        )
+        items = await self._execute(request, self._read_items(len(batches)))
+
+        values = {}
+        for key, key_ in keys_.items():
+            item = items.get(key_.encode("utf-8"))
+            values[key] = self._decode(item[0], item[1]) if item is not None else None
+        return values
+
+    async def set_many(
+        self, mapping: Mapping[str, Serializable], *, ttl: Optional[int]
+    ):
+        if not mapping:
+            return
+
+        request = b"".join(
+            self._storage_command("set", key, value, ttl)
+            for key, value in mapping.items()
+        )
+        await self._execute(request, self._read_lines(len(mapping)))
+
+    async def delete(self, key: str):
+        request = f"delete {self._make_key(key)}\r\n".encode("utf-8")
+        await self._execute(request, self._read_lines(1))
+
+    async def delete_many(self, keys: Iterable[str]):
+        keys_ = [self._make_key(key) for key in keys]
+        if keys_:
+            request = "".join(f"delete {key}\r\n" for key in keys_).encode("utf-8")
+            await self._execute(request, self._read_lines(len(keys_)))
+
+    async def clear(self):
+        await self._execute(b"flush_all\r\n", self._read_lines(1))
+
+    async def touch(self, key: str, ttl: Optional[int]) -> bool:
+        return (await self.touch_many([key], ttl))[key]
+
+    async def touch_many(
+        self, keys: Iterable[str], ttl: Optional[int]
+    ) -> Dict[str, bool]:
+        keys = list(keys)
+        if not keys:
+            return {}
+
+        exptime = self._make_exptime(ttl)
+        request = "".join(f"touch {self._make_key(key)} {exptime}\r\n" for key in keys)
+        replies = await self._execute(
+            request.encode("utf-8"), self._read_lines(len(keys))
+        )
+        return {key: reply == b"TOUCHED" for key, reply in zip(keys, replies)}
+
+    async def incr(self, key: str, delta: Union[float, int]) -> Union[float, int]:
+        if not isinstance(delta, (float, int)):
+            raise ValueError(f"incr value must be int or float")
+        if self._native_incr and isinstance(delta, int) and delta >= 0:
+            return await self._incr_native(key, delta)
+        return await self._incr_with_cas(key, delta)
+
+    async def decr(self, key: str, delta: Union[float, int]) -> Union[float, int]:
+        if not isinstance(delta, (float, int)):
+            raise ValueError(f"decr value must be int or float")
+        # Memcached's decr doesn't decrease value below 0
+        return await self._incr_with_cas(key, delta * -1)
+
+    async def incr_many(
+        self, mapping: Mapping[str, Union[float, int]]
+    ) -> Dict[str, Union[float, int]]:
+        # Keys are checked in single round-trip before increasing any of them
+        for key, value in (await self.get_many(mapping)).items():
+            if value is None:
+                raise ValueError(f"'{key}' is not set in the cache")
+        return {key: await self.incr(key, delta) for key, delta in mapping.items()}
+
+    async def _incr_native(self, key: str, delta: int) -> Union[float, int]:
+        """Increases value with memcached's incr command.
+
+        It works only for non-negative integers stored as decimal numbers. Other
+        values (eg. floats) are increased by replacing value with cas command.
+        """
+        request = f"incr {self._make_key(key)} {delta}\r\n".encode("utf-8")
+        try:
+            reply = (await self._execute(request, self._read_lines(1)))[0]
+        except MemcachedError as error:
+            if not str(error).startswith("CLIENT_ERROR"):
+                raise
+            return await self._incr_with_cas(key, delta)
+
+        if reply == b"NOT_FOUND":
+            raise ValueError(f"'{key}' is not set in the cache")
+        return int(reply)
+
+    async def _incr_with_cas(
+        self, key: str, delta: Union[float, int]
+    ) -> Union[float, int]:
+        """Changes value by reading it and replacing it if it didn't change since.
+
+        Uses meta commands to keep key's remaining ttl.
+        """
+        key_ = self._make_key(key)
+        while True:
+            request = f"mg {key_} v f c t\r\n".encode("utf-8")
+            item = await self._execute(request, self._read_meta_item)
+            if item is None:
+                raise ValueError(f"'{key}' is not set in the cache")
+
+            data, flags, cas, ttl = item
+            value = self._decode(data, flags) + delta
+            data, flags = self._encode(value)
+            header = f"ms {key_} {len(data)} C{cas} F{flags}"
+            if ttl > 0:
+                header += f" T{ttl}"
+            request = header.encode("utf-8") + b"\r\n" + data + b"\r\n"
+            reply = (await self._execute(request, self._read_lines(1)))[0]
+            if reply == b"NF":
+                raise ValueError(f"'{key}' is not set in the cache")
+            if reply == b"HD":
+                return value
+            if reply != b"EX":
+                raise MemcachedError(reply.decode("utf-8", "replace"))
+
+    @staticmethod
+    async def _read_meta_item(
+        connection: _Connection
+    ) -> Optional[Tuple[bytes, int, int, int]]:
+        line = await connection.readline()
+        if line == b"EN":
+            return None
+
+        _, size, *flags = line.split()
+        values = {flag[:1]: int(flag[1:]) for flag in flags}
+        data = (await connection.readexactly(int(size) + 2))[:-2]
+        return data, values[b"f"], values[b"c"], values[b"t"]
@@ -1,22 +1,357 @@
 import asyncio
-from inspect import isawaitable
-from typing import Any, Awaitable, Dict, Iterable, Mapping, Optional, Union
+from collections import OrderedDict
+from hashlib import sha1
+from inspect import isawaitable, iscoroutine
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+)
+from uuid import uuid4
 
 import aioredis
+from aioredis.commands import Pipeline
 
-from ..types import Serializable
+from ..compression import compress, decompress, get_compressor
 from ..core import CacheURL
+from ..serializers import JSONSerializer, NullSerializer, OrJSONSerializer
+from ..types import Serializable
 from .base import BaseBackend
 
+# Lua functions used by scripts which replace or delete keys. Scripts pass them
+# key with set of its tags, and ARGV[1] is "1" if sets of keys of its tags
+# should be updated too, or empty string if they may be in other cluster slots.
+TAGS_FUNCTIONS = """
+local function add_tag(tag, key, ttl)
+    local tag_ttl = redis.call("TTL", tag)
+    redis.call("SADD", tag, key)
+    if not ttl then
+        redis.call("PERSIST", tag)
+    elseif tag_ttl == -2 or (tag_ttl >= 0 and tag_ttl < ttl) then
+        redis.call("EXPIRE", tag, ttl)
+    end
+end
+
+local function untag(key, tags_key)
+    if ARGV[1] == "1" then
+        for _, tag in ipairs(redis.call("SMEMBERS", tags_key)) do
+            redis.call("SREM", tag, key)
+        end
+    end
+    redis.call("DEL", tags_key)
+end
+"""
+
+# Deletes key only if its value equals ARGV[2], eg. lock still held by the client
+# that acquired it. KEYS[2] is set of key's tags, if key can have them.
+DELETE_IF_EQUAL_SCRIPT = (
+    TAGS_FUNCTIONS
+    + """
+if redis.call("GET", KEYS[1]) == ARGV[2] then
+    if KEYS[2] then
+        untag(KEYS[1], KEYS[2])
+    end
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+)
+
+# Sets key to ARGV[3] only if its current value equals ARGV[2]. ARGV[4] is ttl
+# in seconds or empty string if key should never expire.
+COMPARE_AND_SET_SCRIPT = (
+    TAGS_FUNCTIONS
+    + """
+if redis.call("GET", KEYS[1]) ~= ARGV[2] then
+    return 0
+end
+untag(KEYS[1], KEYS[2])
+if ARGV[4] == "" then
+    redis.call("SET", KEYS[1], ARGV[3])
+else
+    redis.call("SET", KEYS[1], ARGV[3], "EX", ARGV[4])
+end
+return 1
+"""
+)
+
+# Returns key's value, updating its ttl and ttl of set of its tags to ARGV[2]
+# seconds or removing it if ARGV[2] is empty string.
+GET_AND_TOUCH_SCRIPT = """
+local value = redis.call("GET", KEYS[1])
+if value then
+    if ARGV[2] == "" then
+        redis.call("PERSIST", KEYS[1])
+        redis.call("PERSIST", KEYS[2])
+    else
+        redis.call("EXPIRE", KEYS[1], ARGV[2])
+        redis.call("EXPIRE", KEYS[2], ARGV[2])
+    end
+end
+return value
+"""
+
+# Sets keys in odd KEYS to values from ARGV[3:], removing their tags. ARGV[2] is
+# ttl in seconds or empty string if keys should never expire.
+SET_SCRIPT = (
+    TAGS_FUNCTIONS
+    + """
+local ttl = tonumber(ARGV[2])
+for i = 1, #KEYS / 2 do
+    untag(KEYS[i * 2 - 1], KEYS[i * 2])
+    if ttl then
+        redis.call("SET", KEYS[i * 2 - 1], ARGV[i + 2], "EX", ttl)
+    else
+        redis.call("SET", KEYS[i * 2 - 1], ARGV[i + 2])
+    end
+end
+"""
+)
+
+# Deletes keys in odd KEYS, removing their tags.
+DELETE_SCRIPT = (
+    TAGS_FUNCTIONS
+    + """
+for i = 1, #KEYS / 2 do
+    untag(KEYS[i * 2 - 1], KEYS[i * 2])
+    redis.call("UNLINK", KEYS[i * 2 - 1])
+end
+"""
+)
+
+# Deletes keys in odd KEYS which are still tagged with any of tags in ARGV[2:].
+# Tag's set of keys may contain keys which were set again without it.
+DELETE_TAGGED_SCRIPT = (
+    TAGS_FUNCTIONS
+    + """
+for i = 1, #KEYS / 2 do
+    for j = 2, #ARGV do
+        if redis.call("SISMEMBER", KEYS[i * 2], ARGV[j]) == 1 then
+            untag(KEYS[i * 2 - 1], KEYS[i * 2])
+            redis.call("UNLINK", KEYS[i * 2 - 1])
+            break
+        end
+    end
+end
+"""
+)
+
+# Updates ttl of keys in odd KEYS and sets of their tags to ARGV[2] seconds, or
+# removes it if ARGV[2] is empty string. Returns results for keys.
+TOUCH_SCRIPT = """
+local ttl = tonumber(ARGV[2])
+local results = {}
+for i = 1, #KEYS / 2 do
+    if ttl then
+        results[i] = redis.call("EXPIRE", KEYS[i * 2 - 1], ttl)
+        redis.call("EXPIRE", KEYS[i * 2], ttl)
+    else
+        results[i] = redis.call("PERSIST", KEYS[i * 2 - 1])
+        redis.call("PERSIST", KEYS[i * 2])
+    end
+end
+return results
+"""
+
+# Increases keys by deltas, only if all of them exist. Each key has pair of
+# arguments: delta and "float" or "int", selecting INCRBYFLOAT or INCRBY.
+# Returns {1, value, ...} or {0, index of first missing key}.
+INCR_SCRIPT = """
+for i = 1, #KEYS do
+    if redis.call("EXISTS", KEYS[i]) == 0 then
+        return {0, i}
+    end
+end
+local results = {1}
+for i = 1, #KEYS do
+    if ARGV[i * 2] == "float" then
+        results[i + 1] = redis.call("INCRBYFLOAT", KEYS[i], ARGV[i * 2 - 1])
+    else
+        results[i + 1] = redis.call("INCRBY", KEYS[i], ARGV[i * 2 - 1])
+    end
+end
+return results
+"""
+
+# Sets key to ARGV[2] only if its current value equals ARGV[1], keeping its ttl.
+# Used to increase values which Redis can't increase itself.
+REPLACE_IF_EQUAL_SCRIPT = """
+if redis.call("GET", KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+local ttl = redis.call("PTTL", KEYS[1])
+if ttl > 0 then
+    redis.call("SET", KEYS[1], ARGV[2], "PX", ttl)
+else
+    redis.call("SET", KEYS[1], ARGV[2])
+end
+return 1
+"""
+
+# Sets KEYS[1] to ARGV[2], replacing its tags in KEYS[2] set with tags in ARGV[4:]
+# and adding it to their sets of keys, so tag invalidated concurrently can't miss
+# it. ARGV[3] is ttl in seconds or empty string if key should never expire. Tag's
+# set expires no sooner than its keys.
+SET_TAGGED_SCRIPT = (
+    TAGS_FUNCTIONS
+    + """
+local ttl = tonumber(ARGV[3])
+untag(KEYS[1], KEYS[2])
+if ttl then
+    redis.call("SET", KEYS[1], ARGV[2], "EX", ttl)
+else
+    redis.call("SET", KEYS[1], ARGV[2])
+end
+for i = 4, #ARGV do
+    redis.call("SADD", KEYS[2], ARGV[i])
+    if ARGV[1] == "1" then
+        add_tag(ARGV[i], KEYS[1], ttl)
+    end
+end
+if ttl then
+    redis.call("EXPIRE", KEYS[2], ttl)
+end
+"""
+)
+
+# Adds ARGV[1] key to set of keys of KEYS[1] tag, like SET_TAGGED_SCRIPT does
+# for every tag. Used when key and tag may be in different cluster slots.
+ADD_TAG_SCRIPT = (
+    TAGS_FUNCTIONS
+    + """
+add_tag(KEYS[1], ARGV[1], tonumber(ARGV[2]))
+"""
+)
+
+# Returns members of tag's set, deleting the set, so keys tagged after it are
+# added to new set
+POP_TAG_SCRIPT = """
+local members = redis.call("SMEMBERS", KEYS[1])
+redis.call("DEL", KEYS[1])
+return members
+"""
 
-class RedisBackend(BaseBackend):
+SCRIPTS = {
+    "add_tag": ADD_TAG_SCRIPT,
+    "compare_and_set": COMPARE_AND_SET_SCRIPT,
+    "delete": DELETE_SCRIPT,
+    "delete_if_equal": DELETE_IF_EQUAL_SCRIPT,
+    "delete_tagged": DELETE_TAGGED_SCRIPT,
+    "get_and_touch": GET_AND_TOUCH_SCRIPT,
+    "incr": INCR_SCRIPT,
+    "pop_tag": POP_TAG_SCRIPT,
+    "replace_if_equal": REPLACE_IF_EQUAL_SCRIPT,
+    "set": SET_SCRIPT,
+    "set_tagged": SET_TAGGED_SCRIPT,
+    "touch": TOUCH_SCRIPT,
+}
+
+INVALIDATION_CHANNEL = "__redis__:invalidate"
+
+# Lock keys and sets of keys' tags are kept outside of cache's key prefix, so
+# they aren't found by SCAN
+LOCK_PREFIX = "__lock__:"
+TAGS_PREFIX = "__tags__:"
+
+# Number of keys SCAN is asked for at once, deleted together by clear_prefix
+SCAN_COUNT = 1000
+
+
+def escape_pattern(value: str) -> str:
+    """Escapes characters special in Redis glob-style patterns, so pattern
+    matches value literally."""
+    return "".join(f"\\{char}" if char in "*?[]\\" else char for char in value)
+
+
+class _PipelineCommands:
+    """Commands factory for aioredis pipeline, queueing any Redis command."""
+
+    def __init__(self, buffer: Any):
+        self._buffer = buffer
+
+    def command(self, command: str, *args: Any) -> Awaitable[Any]:
+        return self._buffer.execute(command, *args)
+
+
+class RedisBackend(BaseBackend):  # pylint: disable=too-many-public-methods
     _pool: aioredis.RedisConnection
+    # Passed to scripts as ARGV[1], "1" if they can update sets of keys of tags
+    _tags_flag = "1"
 
     def __init__(self, cache_url: Union[CacheURL, str], **options: Any) -> None:
-        self._cache_url = CacheURL(cache_url)
-        self._options = options
+        super().__init__(cache_url, **options)
         self._pool = None
 
+        if isinstance(self._serializer, NullSerializer):
+            raise ValueError("Redis backend can't store values without serialization.")
+
+        self._compressor = None
+        self._compression_threshold = int(
+            self._get_option("compression_threshold", 1024)
+        )
+        if self._get_option("compression"):
+            level = self._get_option("compression_level")
+            self._compressor = get_compressor(
+                self._get_option("compression"),
+                int(level) if level is not None else None,
+            )
+
+        # INCRBY and INCRBYFLOAT only understand numbers serialized as text
+        self._native_incr = isinstance(
+            self._serializer, (JSONSerializer, OrJSONSerializer)
+        )
+
+        self._lock = self._get_flag_option("lock")
+        self._lock_ttl = float(self._get_option("lock_ttl", 10))
+        self._lock_timeout = float(self._get_option("lock_timeout", 5))
+        self._lock_poll_interval = float(self._get_option("lock_poll_interval", 0.05))
+
+        # Lua scripts and their SHA1 digests, by name
+        self._scripts: Dict[str, str] = {}
+        self._digests: Dict[str, str] = {}
+        for name, script in SCRIPTS.items():
+            self._register_script(name, script)
+
+        self._autopipeline = self._get_flag_option("autopipeline")
+        self._pipeline: Optional[Pipeline] = None
+        self._pipeline_tasks: Set[asyncio.Future] = set()
+
+        self._tracking = self._get_tracking_mode()
+        self._tracking_max_entries = int(
+            self._get_option("tracking_max_entries", 10000)
+        )
+        self._tracked: Optional[aioredis.RedisConnection] = None
+        self._invalidations: Optional[aioredis.RedisConnection] = None
+        self._invalidations_task: Optional[asyncio.Future] = None
+        # Serialized values read by tracked connection, dropped when invalidated
+        self._local: "OrderedDict[str, bytes]" = OrderedDict()
+        # Keys being read by tracked connection, mapped to marker of the read
+        self._pending: Dict[str, object] = {}
+
+    def _get_tracking_mode(self) -> Optional[str]:
+        tracking = self._get_option("tracking")
+        if tracking is None or tracking is False:
+            return None
+        tracking = str(tracking).lower()
+        if tracking in ("0", "false", "no", "off"):
+            return None
+        if tracking in ("bcast", "broadcast"):
+            return "broadcast"
+        if tracking in ("1", "true", "yes", "on", "default"):
+            return "default"
+        raise ValueError(
+            f"'{tracking}' is not a supported tracking mode. "
+            "Supported modes are: default, broadcast"
+        )
+
     def _get_connection_kwargs(self) -> dict:
         url_options = self._cache_url.options
 
@@ -36,40 +371,251 @@ class RedisBackend(BaseBackend):
 
         return kwargs
 
+    def _serialize(self, value: Any) -> Union[bytes, str]:
+        value = super()._serialize(value)
+        if self._compressor:
+            return compress(value, self._compressor, self._compression_threshold)
+        return value
+
+    def _deserialize(self, value: Union[bytes, str]) -> Any:
+        return super()._deserialize(decompress(value))
+
     async def connect(self):
         # pylint: disable=attribute-defined-outside-init
         assert self._pool is None, "Cache backend is already running"
         kwargs = self._get_connection_kwargs()
         self._pool = await aioredis.create_pool(str(self._cache_url), **kwargs)
+        await asyncio.gather(
+            *[
+                self._execute("SCRIPT", "LOAD", script)
+                for script in self._scripts.values()
+            ]
+        )
+        if self._tracking:
+            await self._enable_tracking()
 
     async def disconnect(self):
         assert self._pool is not None, "Cache backend is not running"
+        if self._pipeline:
+            self._flush_pipeline()
+        if self._pipeline_tasks:
+            await asyncio.gather(*self._pipeline_tasks)
+        if self._tracking:
+            await self._disable_tracking()
         self._pool.close()
         await self._pool.wait_closed()
 
+    def _execute(self, command: str, *args: Any) -> Awaitable[Any]:
+        """Executes Redis command using connections pool.
+
+        If automatic pipelining is enabled, commands executed during the same
+        event loop iteration are sent to Redis together in single pipeline.
+
+        Returns:
+            Awaitable[Any]: Future resolved with command's result.
+        """
+        if not self._autopipeline:
+            return self._pool.execute(command, *args)
+
+        if self._pipeline is None:
+            self._pipeline = Pipeline(self._pool, _PipelineCommands)
+            asyncio.get_event_loop().call_soon(self._flush_pipeline)
+        # Pipeline proxies calls to commands factory, returning future of result
+        return self._pipeline.command(command, *args)
+
+    def _register_script(self, name: str, script: str):
+        """Registers Lua script executable with `_execute_script`.
+
+        Registered scripts are loaded to Redis on connect.
+        """
+        self._scripts[name] = script
+        self._digests[name] = sha1(script.encode("utf-8")).hexdigest()
+
+    def _get_tags_key(self, key: str) -> str:
+        """Returns name of set of tags key was set with."""
+        return TAGS_PREFIX + key
+
+    async def _execute_keys_script(
+        self,
+        name: str,
+        keys: List[str],
+        args: List[Any],
+        key_args: Optional[List[Any]] = None,
+    ) -> List[Any]:
+        """Executes registered Lua script for keys, passing every key followed by
+        set of its tags in KEYS, and tags flag, args and key_args in ARGV.
+
+        Args:
+            name (str): Name of the script.
+            keys (List[str]): Cache keys.
+            args (List[Any]): Arguments common for all keys.
+            key_args (List[Any]): Arguments for each of keys, eg. their values.
+
+        Returns:
+            List[Any]: Results of script for keys, None if it didn't return any.
+        """
+        script_keys = []
+        for key in keys:
+            script_keys += [key, self._get_tags_key(key)]
+        results = await self._execute_script(
+            name, script_keys, [self._tags_flag, *args, *(key_args or [])]
+        )
+        results = list(results or [])
+        return results + [None] * (len(keys) - len(results))
+
+    async def _execute_script(self, name: str, keys: List[str], args: List[Any]) -> Any:
+        """Executes registered Lua script by its SHA1 digest.
+
+        Script is sent to Redis again only if EVALSHA fails with NOSCRIPT error,
+        eg. after server restart or SCRIPT FLUSH. Like other commands, scripts
+        are sent in pipeline if automatic pipelining is enabled.
+        """
+        digest = self._digests[name]
+        try:
+            return await self._execute("EVALSHA", digest, len(keys), *keys, *args)
+        except aioredis.ReplyError as error:
+            if not str(error).startswith("NOSCRIPT"):
+                raise
+        await self._execute("SCRIPT", "LOAD", self._scripts[name])
+        return await self._execute("EVALSHA", digest, len(keys), *keys, *args)
+
+    def _flush_pipeline(self):
+        if self._pipeline is None:
+            return
+
+        pipeline, self._pipeline = self._pipeline, None
+        # Errors are raised for callers awaiting results of failed commands
+        task = asyncio.ensure_future(pipeline.execute(return_exceptions=True))
+        self._pipeline_tasks.add(task)
+        task.add_done_callback(self._pipeline_tasks.discard)
+
+    async def _enable_tracking(self):
+        """Opens connection with client side caching enabled, and connection
+        receiving invalidation messages for keys read by it."""
+        url = str(self._cache_url)
+        self._invalidations = await aioredis.create_connection(url)
+        client_id = await self._invalidations.execute("CLIENT", "ID")
+        channel = aioredis.Channel(INVALIDATION_CHANNEL, is_pattern=False)
+        await self._invalidations.execute_pubsub("SUBSCRIBE", channel)
+
+        self._tracked = await aioredis.create_connection(url)
+        command: List[Any] = ["CLIENT", "TRACKING", "ON", "REDIRECT", client_id]
+        if self._tracking == "broadcast":
+            command.append("BCAST")
+            if self._options.get("key_prefix"):
+                command += ["PREFIX", f"{self._options['key_prefix']}:"]
+        await self._tracked.execute(*command)
+
+        self._invalidations_task = asyncio.ensure_future(
+            self._read_invalidations(channel)
+        )
+
+    async def _disable_tracking(self):
+        self._invalidations_task.cancel()
+        try:
+            await self._invalidations_task
+        except asyncio.CancelledError:
+            pass
+
+        for connection in (self._tracked, self._invalidations):
+            connection.close()
+            await connection.wait_closed()
+
+    async def _read_invalidations(self, channel: aioredis.Channel):
+        try:
+            while await channel.wait_message():
+                self._invalidate(await channel.get())
+        finally:
+            # Without invalidation messages, local values can't be trusted anymore
+            self._invalidate(None)
+
+    def _invalidate(
+        self, keys: Optional[Union[bytes, str, Sequence[Union[bytes, str]]]]
+    ):
+        """Drops local values of invalidated keys, or all of them if keys is None."""
+        if not self._tracking:
+            return
+        if keys is None:
+            self._local.clear()
+            self._pending.clear()
+            return
+
+        if isinstance(keys, (bytes, str)):
+            keys = [keys]
+        for key in keys:
+            if isinstance(key, bytes):
+                key = key.decode("utf-8")
+            self._local.pop(key, None)
+            self._pending.pop(key, None)
+
+    def _is_tracking(self) -> bool:
+        return bool(self._invalidations_task and not self._invalidations_task.done())
+
+    def _remember(self, key: str, value: bytes):
+        self._local[key] = value
+        self._local.move_to_end(key)
+        if len(self._local) > self._tracking_max_entries:
+            self._local.popitem(last=False)
+
+    async def _get_tracked(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Returns serialized values of keys, reading those that aren't stored
+        locally from Redis using tracked connection."""
+        values = {key: self._local[key] for key in keys if key in self._local}
+        for key in values:
+            self._local.move_to_end(key)
+
+        missing = [key for key in dict.fromkeys(keys) if key not in values]
+        if missing:
+            # Key invalidated while being read removes its marker, so outdated
+            # value won't be stored locally
+            assert self._tracked is not None
+            markers = {key: object() for key in missing}
+            self._pending.update(markers)
+            for key, value in zip(
+                missing, await self._tracked.execute("MGET", *missing)
+            ):
+                values[key] = value
+                if self._pending.get(key) is markers[key]:
+                    del self._pending[key]
+                    if value is not None:
+                        self._remember(key, value)
+
+        return [values[key] for key in keys]
+
     async def get(self, key: str, default: Any) -> Any:
-        value = await self._pool.execute("GET", key)
+        if self._is_tracking():
+            value = (await self._get_tracked([key]))[0]
+        else:
+            value = await self._execute("GET", key)
         return self._deserialize(value) if value is not None else default
 
     async def set(self, key: str, value: Serializable, *, ttl: Optional[int]) -> Any:
-        if ttl is None:
-            await self._pool.execute("SET", key, self._serialize(value))
-        elif ttl:
-            await self._pool.execute("SETEX", key, ttl, self._serialize(value))
+        self._invalidate([key])
+        if ttl is None or ttl:
+            await self._execute_keys_script(
+                "set", [key], ["" if ttl is None else ttl], [self._serialize(value)]
+            )
 
     async def add(self, key: str, value: Serializable, *, ttl: Optional[int]):
+        self._invalidate([key])
         if ttl is None:
-            return bool(await self._pool.execute("SET", key, self._serialize(value), "NX"))
+            return bool(await self._execute("SET", key, self._serialize(value), "NX"))
 
         return bool(
-            await self._pool.execute("SET", key, self._serialize(value), "EX", ttl, "NX")
+            await self._execute("SET", key, self._serialize(value), "EX", ttl, "NX")
         )
 
     async def get_or_set(
-        self, key: str, default: Union[Awaitable[Serializable], Serializable], *, ttl: Optional[int]
+        self,
+        key: str,
+        default: Union[Awaitable[Serializable], Serializable],
+        *,
+        ttl: Optional[int],
     ) -> Any:
         value = await self.get(key, None)
         if value is None:
+            if self._lock:
+                return await self._get_or_set_with_lock(key, default, ttl=ttl)
             if callable(default):
                 default = default()
             if isawaitable(default):
@@ -78,58 +624,249 @@ class RedisBackend(BaseBackend):
             return default
         return value
 
+    async def _get_or_set_with_lock(
+        self,
+        key: str,
+        default: Union[Awaitable[Serializable], Serializable],
+        *,
+        ttl: Optional[int],
+    ) -> Any:
+        """Sets key with default value while holding a lock on it in Redis.
+
+        Only client holding the lock evaluates the default. Other clients poll the
+        key until its set. If the key is not set within `lock_timeout`, they
+        evaluate the default themselves. Lock expires after `lock_ttl`, so other
+        client can take it over if its holder dies.
+        """
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + self._lock_timeout
+        lock_key = LOCK_PREFIX + key
+        token = uuid4().hex
+
+        while True:
+            acquired = await self._execute(
+                "SET", lock_key, token, "PX", int(self._lock_ttl * 1000), "NX"
+            )
+            if acquired:
+                try:
+                    # Key may have been set before lock was acquired
+                    value = await self.get(key, None)
+                    if value is None:
+                        value = await self._get_default_value(default)
+                        await self.set(key, value, ttl=ttl)
+                    elif iscoroutine(default):
+                        default.close()
+                    return value
+                finally:
+                    await self._execute_script(
+                        "delete_if_equal", [lock_key], ["", token]
+                    )
+
+            if loop.time() >= deadline:
+                break
+
+            await asyncio.sleep(self._lock_poll_interval)
+            value = await self.get(key, None)
+            if value is not None:
+                if iscoroutine(default):
+                    default.close()
+                return value
+
+        value = await self._get_default_value(default)
+        await self.set(key, value, ttl=ttl)
+        return value
+
+    async def compare_and_set(
+        self,
+        key: str,
+        expected: Serializable,
+        value: Serializable,
+        *,
+        ttl: Optional[int],
+    ) -> bool:
+        self._invalidate([key])
+        args = [
+            self._tags_flag,
+            self._serialize(expected),
+            self._serialize(value),
+            "" if ttl is None else ttl,
+        ]
+        keys = [key, self._get_tags_key(key)]
+        return bool(await self._execute_script("compare_and_set", keys, args))
+
+    async def get_and_touch(self, key: str, default: Any, *, ttl: Optional[int]) -> Any:
+        keys = [key, self._get_tags_key(key)]
+        args = [self._tags_flag, "" if ttl is None else ttl]
+        value = await self._execute_script("get_and_touch", keys, args)
+        return self._deserialize(value) if value is not None else default
+
+    async def delete_if_equal(self, key: str, value: Serializable) -> bool:
+        self._invalidate([key])
+        keys = [key, self._get_tags_key(key)]
+        args = [self._tags_flag, self._serialize(value)]
+        return bool(await self._execute_script("delete_if_equal", keys, args))
+
+    async def set_tagged(
+        self, key: str, value: Serializable, *, ttl: Optional[int], tags: Iterable[str]
+    ) -> Any:
+        self._invalidate([key])
+        keys = [key, self._get_tags_key(key)]
+        args = [self._tags_flag, self._serialize(value), "" if ttl is None else ttl]
+        await self._execute_script("set_tagged", keys, args + list(tags))
+
+    async def invalidate_tags(self, tags: Iterable[str]):
+        tags = list(tags)
+        members = await asyncio.gather(
+            *[self._execute_script("pop_tag", [tag], []) for tag in tags]
+        )
+        keys = {key.decode("utf-8") for tag_members in members for key in tag_members}
+        if keys:
+            # Keys set again without the tag after it was set with it are kept
+            self._invalidate(list(keys))
+            await self._execute_keys_script("delete_tagged", list(keys), tags)
+
     async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
-        values = await self._pool.execute("MGET", *keys)
+        if self._is_tracking():
+            keys = list(keys)
+            values = await self._get_tracked(keys)
+        else:
+            values = await self._execute("MGET", *keys)
         return {
-            key: self._deserialize(values[i]) if values[i] is not None else None
-            for i, key in enumerate(keys)
+            key: self._deserialize(value) if value is not None else None
+            for key, value in zip(keys, values)
         }
 
     async def set_many(
         self, mapping: Mapping[str, Serializable], *, ttl: Optional[int]
     ):
+        if not mapping:
+            return
+
+        self._invalidate(list(mapping))
         if ttl is None or ttl:
-            values = []
-            for key, value in mapping.items():
-                values.append(key)
-                values.append(self._serialize(value))
-            await self._pool.execute("MSET", *values)
-        if ttl:
-            expire = []
-            for key in mapping:
-                expire.append(self._pool.execute("EXPIRE", key, ttl))
-            await asyncio.gather(*expire)
+            await self._execute_keys_script(
+                "set",
+                list(mapping),
+                ["" if ttl is None else ttl],
+                [self._serialize(value) for value in mapping.values()],
+            )
 
     async def delete(self, key: str):
-        await self._pool.execute("UNLINK", key)
+        self._invalidate([key])
+        await self._execute_keys_script("delete", [key], [])
 
     async def delete_many(self, keys: Iterable[str]):
-        await self._pool.execute("UNLINK", *keys)
+        keys = list(keys)
+        if keys:
+            self._invalidate(keys)
+            await self._execute_keys_script("delete", keys, [])
 
     async def clear(self):
-        await self._pool.execute("FLUSHDB", "async")
+        self._invalidate(None)
+        await self._execute("FLUSHDB", "async")
+
+    async def clear_prefix(self, prefix: str):
+        # Keys are deleted in batches, so Redis isn't blocked like by KEYS command
+        async for keys in self.scan_keys(prefix, "*", SCAN_COUNT):
+            await self.delete_many(keys)
+
+    async def scan_keys(
+        self, prefix: str, pattern: str, batch: int
+    ) -> AsyncIterator[List[str]]:
+        async for keys in self._scan(escape_pattern(prefix) + pattern, batch):
+            yield [key.decode("utf-8") for key in keys]
+
+    async def _scan(self, pattern: str, count: int) -> AsyncIterator[List[bytes]]:
+        """Yields batches of keys matching pattern, found with SCAN command.
+
+        Keys set or deleted during the scan may be returned or not.
+        """
+        cursor = 0
+        while True:
+            cursor, keys = await self._execute(
+                "SCAN", cursor, "MATCH", pattern, "COUNT", count
+            )
+            if keys:
+                yield keys
+            if not int(cursor):
+                break
 
     async def touch(self, key: str, ttl: Optional[int]) -> bool:
-        if ttl is None:
-            return bool(await self._pool.execute("PERSIST", key))
-        return bool(await self._pool.execute("EXPIRE", key, ttl))
+        return (await self.touch_many([key], ttl))[key]
+
+    async def touch_many(
+        self, keys: Iterable[str], ttl: Optional[int]
+    ) -> Dict[str, bool]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        # Set of key's tags expires together with it
+        results = await self._execute_keys_script(
+            "touch", keys, ["" if ttl is None else ttl]
+        )
+        return {key: bool(result) for key, result in zip(keys, results)}
 
     async def incr(self, key: str, delta: Union[float, int]) -> Union[float, int]:
-        if not await self._pool.execute("EXISTS", key):
-            raise ValueError(f"'{key}' is not set in the cache")
-        if isinstance(delta, int):
-            return await self._pool.execute("INCRBY", key, delta)
-        if isinstance(delta, float):
-            return self._deserialize(await self._pool.execute("INCRBYFLOAT", key, delta))
-        raise ValueError(f"incr value must be int or float")
+        if not isinstance(delta, (float, int)):
+            raise ValueError(f"incr value must be int or float")
+        return (await self.incr_many({key: delta}))[key]
 
     async def decr(self, key: str, delta: Union[float, int]) -> Union[float, int]:
-        if not await self._pool.execute("EXISTS", key):
-            raise ValueError(f"'{key}' is not set in the cache")
-        if isinstance(delta, int):
-            return await self._pool.execute("INCRBY", key, delta * -1)
-        if isinstance(delta, float):
-            return self._deserialize(
-                await self._pool.execute("INCRBYFLOAT", key, delta * -1.0)
-            )
-        raise ValueError(f"decr value must be int or float")
+        if not isinstance(delta, (float, int)):
+            raise ValueError(f"decr value must be int or float")
+        return (await self.incr_many({key: delta * -1}))[key]
+
+    async def incr_many(
+        self, mapping: Mapping[str, Union[float, int]]
+    ) -> Dict[str, Union[float, int]]:
+        if not mapping:
+            return {}
+
+        keys = list(mapping)
+        args: List[Any] = []
+        for delta in mapping.values():
+            if isinstance(delta, int):
+                args += [delta, "int"]
+            elif isinstance(delta, float):
+                args += [repr(delta), "float"]
+            else:
+                raise ValueError(f"incr value must be int or float")
+
+        self._invalidate(keys)
+        if not self._native_incr:
+            return await self._incr_many_with_cas(mapping)
+
+        result = await self._execute_script("incr", keys, args)
+        if not result[0]:
+            raise ValueError(f"'{keys[result[1] - 1]}' is not set in the cache")
+        return {
+            key: float(value) if isinstance(mapping[key], float) else value
+            for key, value in zip(keys, result[1:])
+        }
+
+    async def _incr_many_with_cas(
+        self, mapping: Mapping[str, Union[float, int]]
+    ) -> Dict[str, Union[float, int]]:
+        """Increases keys by reading, deserializing and replacing their values,
+        retrying if value was changed by other client in the meantime.
+
+        Unlike INCR script, this is not atomic for many keys: key deleted after
+        all keys were checked is still reported as not set.
+        """
+        current = await self._execute("MGET", *mapping)
+        for key, value in zip(mapping, current):
+            if value is None:
+                raise ValueError(f"'{key}' is not set in the cache")
+
+        results: Dict[str, Union[float, int]] = {}
+        for (key, delta), value in zip(mapping.items(), current):
+            while True:
+                if value is None:
+                    raise ValueError(f"'{key}' is not set in the cache")
+                result = self._deserialize(value) + delta
+                args = [value, self._serialize(result)]
+                if await self._execute_script("replace_if_equal", [key], args):
+                    results[key] = result
+                    break
+                value = await self._execute("GET", key)
+        return results
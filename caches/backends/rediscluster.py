@@ -0,0 +1,427 @@
+import asyncio
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import aioredis
+
+from ..core import CacheURL
+from ..types import Serializable
+from .redis import TAGS_PREFIX, RedisBackend
+
+CLUSTER_SLOTS = 16384
+
+# Commands executed on every master node, instead of node owning key's slot
+KEYLESS_COMMANDS = ("FLUSHDB", "PING", "SCRIPT")
+
+Address = Tuple[str, int]
+
+
+def _make_crc16_table() -> List[int]:
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else crc << 1
+        table.append(crc & 0xFFFF)
+    return table
+
+
+_CRC16_TABLE = _make_crc16_table()
+
+
+def crc16(data: bytes) -> int:
+    """Returns CRC16 (XMODEM) checksum of data, as used by Redis Cluster."""
+    crc = 0
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ _CRC16_TABLE[((crc >> 8) ^ byte) & 0xFF]
+    return crc
+
+
+def key_slot(key: Union[bytes, str]) -> int:
+    """Returns Redis Cluster hash slot of key.
+
+    If key contains hash tag (non-empty part between first "{" and following "}"),
+    only hash tag is hashed, so keys with same hash tag are stored in same slot.
+    """
+    if isinstance(key, str):
+        key = key.encode("utf-8")
+    start = key.find(b"{")
+    if start != -1:
+        end = key.find(b"}", start + 1)
+        if end > start + 1:
+            key = key[start + 1 : end]
+    return crc16(key) % CLUSTER_SLOTS
+
+
+# Hash tags of every slot, found when first needed
+_SLOT_HASH_TAGS: List[str] = []
+
+
+def slot_hash_tag(key: str) -> str:
+    """Returns hash tag which stores other keys in the same slot as key."""
+    start = key.find("{")
+    if start != -1:
+        end = key.find("}", start + 1)
+        if end > start + 1:
+            return key[start + 1 : end]
+    if "}" not in key:
+        return key
+
+    # Key without hash tag can't be used as one if it contains "}"
+    if not _SLOT_HASH_TAGS:
+        hash_tags: Dict[int, str] = {}
+        i = 0
+        while len(hash_tags) < CLUSTER_SLOTS:
+            hash_tags.setdefault(key_slot(str(i)), str(i))
+            i += 1
+        _SLOT_HASH_TAGS.extend(hash_tags[slot] for slot in range(CLUSTER_SLOTS))
+    return _SLOT_HASH_TAGS[key_slot(key)]
+
+
+class RedisClusterBackend(RedisBackend):
+    """Backend for Redis Cluster, sending commands to nodes owning keys' slots.
+
+    Map of slots to master nodes is read with CLUSTER SLOTS on connect, and
+    is read again when node replies with MOVED redirection.
+    """
+
+    # Sets of keys of tags may be in other slots than keys, so scripts can't
+    # update them
+    _tags_flag = ""
+
+    def __init__(self, cache_url: Union[CacheURL, str], **options: Any) -> None:
+        super().__init__(cache_url, **options)
+
+        assert (
+            not self._autopipeline
+        ), "Redis Cluster backend doesn't support 'autopipeline'."
+        assert not self._tracking, "Redis Cluster backend doesn't support 'tracking'."
+
+        self._password = self._cache_url.components.password
+        self._startup_nodes = self._get_startup_nodes()
+        self._max_redirects = int(self._get_option("max_redirects", 5))
+
+        self._nodes: Dict[Address, asyncio.Future] = {}
+        self._slots: List[Optional[Address]] = [None] * CLUSTER_SLOTS
+        self._refresh: Optional[asyncio.Future] = None
+
+    def _get_startup_nodes(self) -> List[Address]:
+        netloc = self._cache_url.netloc or "localhost"
+        hosts = netloc.rsplit("@", 1)[-1]
+
+        nodes = []
+        for host in hosts.split(","):
+            hostname, _, port = host.strip().rpartition(":")
+            if not hostname:
+                hostname, port = port, ""
+            nodes.append((hostname or "localhost", int(port or 6379)))
+        return nodes
+
+    async def connect(self):
+        assert not self._nodes, "Cache backend is already running"
+        await self._refresh_slots()
+        await asyncio.gather(
+            *[
+                self._execute("SCRIPT", "LOAD", script)
+                for script in self._scripts.values()
+            ]
+        )
+
+    async def disconnect(self):
+        assert self._nodes, "Cache backend is not running"
+        if self._refresh:
+            await asyncio.gather(self._refresh, return_exceptions=True)
+
+        nodes, self._nodes = self._nodes, {}
+        self._slots = [None] * CLUSTER_SLOTS
+        pools = await asyncio.gather(*nodes.values(), return_exceptions=True)
+        for pool in pools:
+            if not isinstance(pool, BaseException):
+                pool.close()
+                await pool.wait_closed()
+
+    async def _get_node(self, address: Address) -> aioredis.ConnectionsPool:
+        if address not in self._nodes:
+            self._nodes[address] = asyncio.ensure_future(
+                aioredis.create_pool(
+                    address, password=self._password, **self._get_connection_kwargs()
+                )
+            )
+        try:
+            return await asyncio.shield(self._nodes[address])
+        except (OSError, aioredis.RedisError):
+            self._nodes.pop(address, None)
+            raise
+
+    async def _refresh_slots(self):
+        """Reads slots map from cluster, sharing single read between callers."""
+        refresh = self._refresh
+        if refresh is None:
+            refresh = self._refresh = asyncio.ensure_future(self._read_slots())
+        try:
+            await asyncio.shield(refresh)
+        finally:
+            if self._refresh is refresh:
+                self._refresh = None
+
+    async def _read_slots(self):
+        addresses = list(dict.fromkeys(self._get_masters() + self._startup_nodes))
+        error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                pool = await self._get_node(address)
+                slots = await pool.execute("CLUSTER", "SLOTS")
+                break
+            except (OSError, aioredis.RedisError) as exc:
+                error = exc
+        else:
+            assert error is not None
+            raise error
+
+        slots_map: List[Optional[Address]] = [None] * CLUSTER_SLOTS
+        for start, end, master, *_ in slots:
+            host = master[0].decode("utf-8") if master[0] else address[0]
+            node = (host, int(master[1]))
+            for slot in range(int(start), int(end) + 1):
+                slots_map[slot] = node
+        self._slots = slots_map
+
+    def _get_masters(self) -> List[Address]:
+        return list(dict.fromkeys(node for node in self._slots if node is not None))
+
+    @staticmethod
+    def _get_command_key(command: str, args: Tuple[Any, ...]) -> Optional[Any]:
+        if command in KEYLESS_COMMANDS:
+            return None
+        if command in ("EVAL", "EVALSHA"):
+            return args[2] if int(args[1]) else None
+        return args[0]
+
+    @staticmethod
+    def _get_redirect(error: aioredis.ReplyError) -> Optional[Tuple[str, Address]]:
+        """Returns kind (MOVED or ASK) and address of redirection from error."""
+        kind, *details = str(error).split()
+        if kind not in ("MOVED", "ASK") or len(details) != 2:
+            return None
+        host, _, port = details[1].rpartition(":")
+        return kind, (host, int(port))
+
+    def _execute(self, command: str, *args: Any) -> Awaitable[Any]:
+        """Executes command on node owning its key's slot.
+
+        Commands without key (eg. FLUSHDB) are executed on all master nodes.
+        """
+        key = self._get_command_key(command, args)
+        if key is not None:
+            return self._execute_on_slot(key_slot(key), command, *args)
+        return self._execute_on_masters(command, *args)
+
+    async def _execute_on_masters(self, command: str, *args: Any) -> Any:
+        results = await asyncio.gather(
+            *[
+                (await self._get_node(address)).execute(command, *args)
+                for address in self._get_masters()
+            ]
+        )
+        return results[0] if results else None
+
+    async def _execute_on_slot(self, slot: int, command: str, *args: Any) -> Any:
+        """Executes command on node owning slot, following MOVED and ASK redirects."""
+        address = self._slots[slot]
+        asking = False
+        for _ in range(self._max_redirects + 1):
+            if address is None:
+                await self._refresh_slots()
+                address = self._slots[slot]
+                if address is None:
+                    raise aioredis.RedisError(f"Slot {slot} is not served by any node")
+
+            pool = await self._get_node(address)
+            try:
+                if not asking:
+                    return await pool.execute(command, *args)
+                async with pool.get() as connection:
+                    # ASKING only applies to command sent right after it
+                    _, result = await asyncio.gather(
+                        connection.execute("ASKING"), connection.execute(command, *args)
+                    )
+                return result
+            except aioredis.ReplyError as error:
+                redirect = self._get_redirect(error)
+                if redirect is None:
+                    raise
+                kind, address = redirect
+                asking = kind == "ASK"
+                if not asking:
+                    self._slots[slot] = address
+                    await self._refresh_slots()
+                    address = self._slots[slot]
+
+        raise aioredis.RedisError(f"Too many redirects for slot {slot}")
+
+    async def _execute_in_slots(
+        self, commands: List[Tuple[int, Tuple[Any, ...]]]
+    ) -> List[Any]:
+        """Executes commands in parallel pipelines, one for each node.
+
+        Args:
+            commands (List[Tuple[int, Tuple[Any, ...]]]): List of commands, each
+                with slot of its keys.
+
+        Returns:
+            List[Any]: Results of commands.
+        """
+        nodes: Dict[Optional[Address], List[int]] = {}
+        for i, (slot, _) in enumerate(commands):
+            nodes.setdefault(self._slots[slot], []).append(i)
+
+        async def execute_pipeline(
+            address: Optional[Address], indexes: List[int]
+        ) -> List[Any]:
+            if address is None:
+                return [None] * len(indexes)
+            pool = await self._get_node(address)
+            async with pool.get() as connection:
+                return await asyncio.gather(
+                    *[connection.execute(*commands[i][1]) for i in indexes],
+                    return_exceptions=True,
+                )
+
+        pipelines = await asyncio.gather(
+            *[execute_pipeline(address, indexes) for address, indexes in nodes.items()]
+        )
+
+        results: List[Any] = [None] * len(commands)
+        retries = []
+        for (address, indexes), pipeline in zip(nodes.items(), pipelines):
+            for i, result in zip(indexes, pipeline):
+                if address is None or (
+                    isinstance(result, aioredis.ReplyError)
+                    and self._get_redirect(result)
+                ):
+                    retries.append(i)
+                elif isinstance(result, BaseException):
+                    raise result
+                else:
+                    results[i] = result
+
+        # Commands for slots which have moved are redirected one by one
+        for i in retries:
+            slot, command = commands[i]
+            results[i] = await self._execute_on_slot(slot, *command)
+        return results
+
+    @staticmethod
+    def _group_by_slot(keys: Iterable[str]) -> Dict[int, List[str]]:
+        slots: Dict[int, List[str]] = {}
+        for key in keys:
+            slots.setdefault(key_slot(key), []).append(key)
+        return slots
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        slots = self._group_by_slot(keys)
+        results = await self._execute_in_slots(
+            [(slot, ("MGET", *slot_keys)) for slot, slot_keys in slots.items()]
+        )
+
+        values = {}
+        for slot_keys, slot_values in zip(slots.values(), results):
+            for key, value in zip(slot_keys, slot_values):
+                values[key] = self._deserialize(value) if value is not None else None
+        return values
+
+    async def set_tagged(
+        self, key: str, value: Serializable, *, ttl: Optional[int], tags: Iterable[str]
+    ) -> Any:
+        # Script can't access keys from many slots, so key is added to sets of its
+        # tags after it's set. Tag invalidated in between doesn't delete new value.
+        tags = list(tags)
+        await super().set_tagged(key, value, ttl=ttl, tags=tags)
+        args = [key, "" if ttl is None else ttl]
+        await asyncio.gather(
+            *[self._execute_script("add_tag", [tag], args) for tag in tags]
+        )
+
+    def _get_tags_key(self, key: str) -> str:
+        # Set of key's tags is stored in key's slot, so scripts can access both
+        return "%s{%s}%s" % (TAGS_PREFIX, slot_hash_tag(key), key)
+
+    async def _execute_keys_script(
+        self,
+        name: str,
+        keys: List[str],
+        args: List[Any],
+        key_args: Optional[List[Any]] = None,
+    ) -> List[Any]:
+        # Script is executed for keys from every slot separately
+        execute_keys_script = super()._execute_keys_script
+        slots: Dict[int, List[int]] = {}
+        for i, key in enumerate(keys):
+            slots.setdefault(key_slot(key), []).append(i)
+
+        slots_results = await asyncio.gather(
+            *[
+                execute_keys_script(
+                    name,
+                    [keys[i] for i in indexes],
+                    args,
+                    [key_args[i] for i in indexes] if key_args else None,
+                )
+                for indexes in slots.values()
+            ]
+        )
+
+        results: List[Any] = [None] * len(keys)
+        for indexes, slot_results in zip(slots.values(), slots_results):
+            for i, result in zip(indexes, slot_results):
+                results[i] = result
+        return results
+
+    async def _scan(self, pattern: str, count: int) -> AsyncIterator[List[bytes]]:
+        # Every master node is scanned for keys from its own slots
+        for address in self._get_masters():
+            pool = await self._get_node(address)
+            cursor = 0
+            while True:
+                cursor, keys = await pool.execute(
+                    "SCAN", cursor, "MATCH", pattern, "COUNT", count
+                )
+                if keys:
+                    yield keys
+                if not int(cursor):
+                    break
+
+    async def incr_many(
+        self, mapping: Mapping[str, Union[float, int]]
+    ) -> Dict[str, Union[float, int]]:
+        # Lua script can only access keys from one slot, so keys from many slots
+        # are checked before increasing any of them. Unlike single slot, this is
+        # not atomic: key deleted after check is still reported as not set.
+        incr_many = super().incr_many
+        slots = self._group_by_slot(mapping)
+        if len(slots) > 1:
+            exists = await self._execute_in_slots(
+                [(key_slot(key), ("EXISTS", key)) for key in mapping]
+            )
+            for key, key_exists in zip(mapping, exists):
+                if not key_exists:
+                    raise ValueError(f"'{key}' is not set in the cache")
+
+        results = await asyncio.gather(
+            *[incr_many({key: mapping[key] for key in keys}) for keys in slots.values()]
+        )
+
+        values: Dict[str, Union[float, int]] = {}
+        for result in results:
+            values.update(result)
+        return {key: values[key] for key in mapping}
@@ -0,0 +1,233 @@
+import asyncio
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Union,
+)
+
+from ..core import Cache, CacheURL
+from ..hashring import HashRing
+from ..importer import import_from_string
+from ..types import Serializable
+from .base import BaseBackend
+
+SHARD_OPTIONS = ("shards", "vnodes")
+
+
+class ShardedBackend(BaseBackend):  # pylint: disable=too-many-public-methods
+    """Backend spreading keys over many other caches (shards).
+
+    Keys are assigned to shards with consistent hash ring, so adding or removing
+    a shard moves only about 1/N of keys to other shards.
+    """
+
+    def __init__(self, cache_url: Union[CacheURL, str], **options: Any):
+        super().__init__(cache_url, **options)
+
+        shards = self._get_option("shards")
+        if isinstance(shards, str):
+            shards = [shard.strip() for shard in shards.split(",") if shard.strip()]
+        assert shards, "Sharded cache requires 'shards' option with URLs of caches."
+
+        self._shards = {}
+        for url in shards:
+            shard_url = CacheURL(url)
+            self._shards[str(url)] = self._create_shard(
+                shard_url, **self._get_shard_options(shard_url)
+            )
+        self._ring = HashRing(self._shards, int(self._get_option("vnodes", 160)))
+
+    def _get_shard_options(self, url: CacheURL) -> Dict[str, Any]:
+        """Returns options for shard, passing it options other than SHARD_OPTIONS
+        from sharded cache's URL, unless shard's URL sets them, and kwargs."""
+        options = {
+            k: v
+            for k, v in self._cache_url.options.items()
+            if k not in SHARD_OPTIONS and k not in url.options
+        }
+        options.update(
+            {k: v for k, v in self._options.items() if k not in SHARD_OPTIONS}
+        )
+        return options
+
+    @staticmethod
+    def _create_shard(url: CacheURL, **options: Any) -> BaseBackend:
+        assert url.backend in Cache.SUPPORTED_BACKENDS, "Invalid backend."
+        assert (
+            url.backend != "sharded"
+        ), "Sharded cache can't be a shard of other cache."
+        backend_cls = import_from_string(Cache.SUPPORTED_BACKENDS[url.backend])
+        assert issubclass(backend_cls, BaseBackend)
+        return backend_cls(url, **options)
+
+    def _get_shard(self, key: str) -> BaseBackend:
+        return self._shards[self._ring.get_node(key)]
+
+    def _group_by_shard(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        shards: Dict[str, List[str]] = {}
+        for key in keys:
+            shards.setdefault(self._ring.get_node(key), []).append(key)
+        return shards
+
+    async def connect(self):
+        await asyncio.gather(*[shard.connect() for shard in self._shards.values()])
+
+    async def disconnect(self):
+        await asyncio.gather(*[shard.disconnect() for shard in self._shards.values()])
+
+    async def get(self, key: str, default: Any) -> Any:
+        return await self._get_shard(key).get(key, default)
+
+    async def set(self, key: str, value: Serializable, *, ttl: Optional[int]) -> Any:
+        await self._get_shard(key).set(key, value, ttl=ttl)
+
+    async def add(self, key: str, value: Serializable, *, ttl: Optional[int]) -> bool:
+        return await self._get_shard(key).add(key, value, ttl=ttl)
+
+    async def get_or_set(
+        self,
+        key: str,
+        default: Union[Awaitable[Serializable], Serializable],
+        *,
+        ttl: Optional[int],
+    ) -> Any:
+        return await self._get_shard(key).get_or_set(key, default, ttl=ttl)
+
+    async def compare_and_set(
+        self,
+        key: str,
+        expected: Serializable,
+        value: Serializable,
+        *,
+        ttl: Optional[int],
+    ) -> bool:
+        return await self._get_shard(key).compare_and_set(key, expected, value, ttl=ttl)
+
+    async def get_and_touch(self, key: str, default: Any, *, ttl: Optional[int]) -> Any:
+        return await self._get_shard(key).get_and_touch(key, default, ttl=ttl)
+
+    async def set_tagged(
+        self, key: str, value: Serializable, *, ttl: Optional[int], tags: Iterable[str]
+    ) -> Any:
+        await self._get_shard(key).set_tagged(key, value, ttl=ttl, tags=tags)
+
+    async def invalidate_tags(self, tags: Iterable[str]):
+        # Tagged keys are tracked by shards storing them
+        tags = list(tags)
+        await asyncio.gather(
+            *[shard.invalidate_tags(tags) for shard in self._shards.values()]
+        )
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(keys)
+        shards = self._group_by_shard(keys)
+        results = await asyncio.gather(
+            *[
+                self._shards[shard].get_many(shard_keys)
+                for shard, shard_keys in shards.items()
+            ]
+        )
+
+        values: Dict[str, Any] = {}
+        for result in results:
+            values.update(result)
+        return {key: values[key] for key in keys}
+
+    async def set_many(
+        self, mapping: Mapping[str, Serializable], *, ttl: Optional[int]
+    ):
+        shards = self._group_by_shard(mapping)
+        await asyncio.gather(
+            *[
+                self._shards[shard].set_many(
+                    {key: mapping[key] for key in shard_keys}, ttl=ttl
+                )
+                for shard, shard_keys in shards.items()
+            ]
+        )
+
+    async def delete(self, key: str):
+        await self._get_shard(key).delete(key)
+
+    async def delete_many(self, keys: Iterable[str]):
+        shards = self._group_by_shard(keys)
+        await asyncio.gather(
+            *[
+                self._shards[shard].delete_many(shard_keys)
+                for shard, shard_keys in shards.items()
+            ]
+        )
+
+    async def delete_if_equal(self, key: str, value: Serializable) -> bool:
+        return await self._get_shard(key).delete_if_equal(key, value)
+
+    async def clear(self):
+        await asyncio.gather(*[shard.clear() for shard in self._shards.values()])
+
+    async def clear_prefix(self, prefix: str):
+        await asyncio.gather(
+            *[shard.clear_prefix(prefix) for shard in self._shards.values()]
+        )
+
+    async def scan_keys(
+        self, prefix: str, pattern: str, batch: int
+    ) -> AsyncIterator[List[str]]:
+        # Shards are scanned one after another, so only one batch is read at time
+        for shard in self._shards.values():
+            async for keys in shard.scan_keys(prefix, pattern, batch):
+                yield keys
+
+    async def touch(self, key: str, ttl: Optional[int]) -> bool:
+        return await self._get_shard(key).touch(key, ttl)
+
+    async def touch_many(
+        self, keys: Iterable[str], ttl: Optional[int]
+    ) -> Dict[str, bool]:
+        keys = list(keys)
+        shards = self._group_by_shard(keys)
+        results = await asyncio.gather(
+            *[
+                self._shards[shard].touch_many(shard_keys, ttl)
+                for shard, shard_keys in shards.items()
+            ]
+        )
+
+        touched: Dict[str, bool] = {}
+        for result in results:
+            touched.update(result)
+        return {key: touched[key] for key in keys}
+
+    async def incr(self, key: str, delta: Union[float, int]) -> Union[float, int]:
+        return await self._get_shard(key).incr(key, delta)
+
+    async def decr(self, key: str, delta: Union[float, int]) -> Union[float, int]:
+        return await self._get_shard(key).decr(key, delta)
+
+    async def incr_many(
+        self, mapping: Mapping[str, Union[float, int]]
+    ) -> Dict[str, Union[float, int]]:
+        shards = self._group_by_shard(mapping)
+        if len(shards) > 1:
+            # Check keys before increasing any of them, like when they are in one shard
+            current = await self.get_many(mapping)
+            for key, value in current.items():
+                if value is None:
+                    raise ValueError(f"'{key}' is not set in the cache")
+
+        results = await asyncio.gather(
+            *[
+                self._shards[shard].incr_many({key: mapping[key] for key in shard_keys})
+                for shard, shard_keys in shards.items()
+            ]
+        )
+
+        values: Dict[str, Union[float, int]] = {}
+        for result in results:
+            values.update(result)
+        return {key: values[key] for key in mapping}
@@ -0,0 +1,725 @@
+import errno
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import time
+from typing import (
+    Any,
+    Awaitable,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from ..core import CacheURL
+from ..serializers import NullSerializer
+from ..types import Serializable
+from .base import BaseBackend
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+MAGIC = b"ACSHM001"
+
+# Magic, buckets, stripes, page size, number of pages, pages used, page reassignment hand
+HEADER = struct.Struct("<8sIIIIQQ")
+HEADER_SIZE = 64
+PAGES_USED = struct.Struct("<Q")
+PAGES_USED_OFFSET = 24
+PAGES_HAND_OFFSET = 32
+
+# Every slab class has list of free chunks and eviction hand (offset of next chunk to evict)
+SLAB_CLASS = struct.Struct("<QQ")
+
+# Offset of first entry in bucket's chain
+BUCKET = struct.Struct("<Q")
+
+# Next entry in chain (or next free chunk), expires, key hash, key size, value size, flags, state
+ENTRY = struct.Struct("<QdIIIBB2x")
+EXPIRES = struct.Struct("<d")
+EXPIRES_OFFSET = 8
+
+CHUNK_FREE = 0
+CHUNK_USED = 1
+
+# Flags stored with values, telling if serializer returned str or bytes
+FLAG_STR = 0
+FLAG_BYTES = 1
+
+MIN_CHUNK_SIZE = 64
+CHUNK_GROWTH_FACTOR = 1.25
+
+# File bytes locked with fcntl: first one for allocator, next ones for buckets stripes
+ALLOCATOR_LOCK = 0
+STRIPES_LOCK = 1
+
+
+class SharedMemoryError(Exception):
+    """Raised when there is no room for value in shared memory."""
+
+
+def get_shm_dir() -> str:
+    """Returns directory for shared memory files, preferring tmpfs on Linux."""
+    if os.path.isdir("/dev/shm"):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+def get_chunk_sizes(page_size: int) -> List[int]:
+    """Returns chunk sizes of slab classes, growing by 25% up to page size."""
+    sizes = []
+    size = MIN_CHUNK_SIZE
+    while size < page_size:
+        sizes.append(size)
+        size = align(int(size * CHUNK_GROWTH_FACTOR))
+    sizes.append(page_size)
+    return sizes
+
+
+def align(size: int) -> int:
+    return (size + 7) & ~7
+
+
+class _Layout:
+    """Offsets of cache's structures in shared memory.
+
+    Memory starts with header, followed by slab classes, slab class of every page,
+    hash table buckets and finally pages of memory split into chunks for entries.
+    """
+
+    def __init__(self, buckets: int, stripes: int, page_size: int, pages: int):
+        self.buckets = buckets
+        self.stripes = stripes
+        self.page_size = page_size
+        self.pages = pages
+        self.chunk_sizes = get_chunk_sizes(page_size)
+        self.classes_offset = HEADER_SIZE
+        self.page_classes_offset = (
+            self.classes_offset + len(self.chunk_sizes) * SLAB_CLASS.size
+        )
+        self.buckets_offset = align(self.page_classes_offset + pages)
+        self.pages_offset = align(self.buckets_offset + buckets * BUCKET.size)
+        self.size = self.pages_offset + pages * page_size
+
+    @classmethod
+    def for_size(
+        cls, size: int, buckets: int, stripes: int, page_size: int
+    ) -> "_Layout":
+        layout = cls(buckets, stripes, page_size, 0)
+        # Every page also takes one byte for its slab class, and few bytes for alignment
+        pages = (size - layout.pages_offset - 16) // (page_size + 1)
+        assert pages > 0, "Shared memory cache size is too small for single page."
+        return cls(buckets, stripes, page_size, pages)
+
+
+class SharedMemoryBackend(BaseBackend):
+    """Backend storing values in memory shared by all processes on the host.
+
+    Memory is mapped from file and contains hash table with chained entries.
+    Entries are stored in chunks allocated from pages split into slab classes,
+    like in memcached. Buckets of hash table are divided into stripes, locked
+    with fcntl locks on file's bytes: shared for reads and exclusive for writes.
+    """
+
+    _buffer: Optional[mmap.mmap]
+    _layout: _Layout
+
+    def __init__(self, cache_url: Union[CacheURL, str], **options: Any) -> None:
+        super().__init__(cache_url, **options)
+        assert fcntl is not None, "Shared memory backend requires POSIX system."
+
+        if isinstance(self._serializer, NullSerializer):
+            raise ValueError(
+                "Shared memory backend can't store values without serialization."
+            )
+
+        name = self._cache_url.netloc or "default"
+        self._path = os.path.join(get_shm_dir(), f"async-caches-{name}")
+        self._size = int(self._get_option("size", 64 * 1024 * 1024))
+        self._page_size = int(self._get_option("page_size", 1024 * 1024))
+        self._buckets = int(self._get_option("buckets", 65536))
+        self._stripes = int(self._get_option("stripes", 64))
+        assert (
+            self._page_size >= MIN_CHUNK_SIZE and self._page_size % 8 == 0
+        ), "Page size has to be multiple of 8, at least 64 bytes."
+
+        self._fd = -1
+        self._buffer = None
+
+    @property
+    def _mmap(self) -> mmap.mmap:
+        assert self._buffer is not None, "Cache backend is not running"
+        return self._buffer
+
+    async def connect(self):
+        assert self._buffer is None, "Cache backend is already running"
+        self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            with self._allocator_lock():
+                self._buffer = self._attach()
+        except BaseException:
+            os.close(self._fd)
+            self._fd = -1
+            raise
+
+    async def disconnect(self):
+        assert self._buffer is not None, "Cache backend is not running"
+        self._buffer.close()
+        self._buffer = None
+        os.close(self._fd)
+        self._fd = -1
+
+    def _attach(self) -> mmap.mmap:
+        """Maps file to memory, initializing cache in it if it's new or has old layout."""
+        size = os.fstat(self._fd).st_size
+        if size >= HEADER_SIZE:
+            buffer = mmap.mmap(self._fd, size)
+            magic, buckets, stripes, page_size, pages, _, _ = HEADER.unpack_from(
+                buffer, 0
+            )
+            if magic == MAGIC:
+                self._layout = _Layout(buckets, stripes, page_size, pages)
+                return buffer
+            buffer.close()
+
+        self._layout = _Layout.for_size(
+            self._size, self._buckets, self._stripes, self._page_size
+        )
+        os.ftruncate(self._fd, self._layout.size)
+        buffer = mmap.mmap(self._fd, self._layout.size)
+        self._reset(buffer)
+        # Magic is written last, so other processes never see half initialized cache
+        HEADER.pack_into(
+            buffer,
+            0,
+            MAGIC,
+            self._layout.buckets,
+            self._layout.stripes,
+            self._layout.page_size,
+            self._layout.pages,
+            0,
+            0,
+        )
+        return buffer
+
+    def _reset(self, buffer: mmap.mmap):
+        """Removes all entries and returns all pages to the pool."""
+        layout = self._layout
+        buffer[layout.classes_offset : layout.pages_offset] = bytes(
+            layout.pages_offset - layout.classes_offset
+        )
+        PAGES_USED.pack_into(buffer, PAGES_USED_OFFSET, 0)
+        PAGES_USED.pack_into(buffer, PAGES_HAND_OFFSET, 0)
+
+    def _lock(
+        self, start: int, length: int = 1, exclusive: bool = True, wait: bool = True
+    ) -> bool:
+        command = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+        if not wait:
+            command |= fcntl.LOCK_NB
+        try:
+            fcntl.lockf(self._fd, command, length, start)
+        except OSError as error:
+            if wait or error.errno not in (errno.EACCES, errno.EAGAIN):
+                raise
+            return False
+        return True
+
+    def _unlock(self, start: int, length: int = 1):
+        fcntl.lockf(self._fd, fcntl.LOCK_UN, length, start)
+
+    @contextmanager
+    def _allocator_lock(self) -> Iterator[None]:
+        self._lock(ALLOCATOR_LOCK)
+        try:
+            yield
+        finally:
+            self._unlock(ALLOCATOR_LOCK)
+
+    @contextmanager
+    def _stripes_lock(
+        self, stripes: Iterable[int], exclusive: bool = True
+    ) -> Iterator[None]:
+        """Locks stripes of buckets, always in the same order to avoid deadlocks.
+
+        Allocator lock is taken only after stripes locks. Allocator evicting
+        entries from other stripes doesn't wait for their locks, but skips them.
+        """
+        locked: List[int] = []
+        try:
+            for stripe in sorted(set(stripes)):
+                self._lock(STRIPES_LOCK + stripe, exclusive=exclusive)
+                locked.append(stripe)
+            yield
+        finally:
+            for stripe in locked:
+                self._unlock(STRIPES_LOCK + stripe)
+
+    def _hash(self, key: str) -> Tuple[bytes, int, int]:
+        """Returns key's bytes, their hash and stripe of key's bucket."""
+        key_ = key.encode("utf-8")
+        hash_ = zlib.crc32(key_)
+        return key_, hash_, self._get_stripe(hash_)
+
+    def _get_stripe(self, hash_: int) -> int:
+        return hash_ % self._layout.buckets % self._layout.stripes
+
+    def _get_bucket_offset(self, hash_: int) -> int:
+        return self._layout.buckets_offset + hash_ % self._layout.buckets * BUCKET.size
+
+    def _find(self, key_: bytes, hash_: int) -> Tuple[int, int]:
+        """Returns offsets of key's entry (or 0) and of the entry or bucket before it.
+
+        Stripe of key's bucket has to be locked.
+        """
+        buffer = self._mmap
+        previous = self._get_bucket_offset(hash_)
+        offset = BUCKET.unpack_from(buffer, previous)[0]
+        while offset:
+            next_, _, entry_hash, key_size, _, _, _ = ENTRY.unpack_from(buffer, offset)
+            if entry_hash == hash_ and key_size == len(key_):
+                start = offset + ENTRY.size
+                if buffer[start : start + key_size] == key_:
+                    return offset, previous
+            previous, offset = offset, next_
+        return 0, previous
+
+    def _find_valid(self, key_: bytes, hash_: int) -> Tuple[int, int]:
+        """Returns offsets like _find, but treats expired entry as if it wasn't set."""
+        offset, previous = self._find(key_, hash_)
+        if offset and self._is_expired(offset):
+            return 0, previous
+        return offset, previous
+
+    def _is_expired(self, offset: int) -> bool:
+        expires = EXPIRES.unpack_from(self._mmap, offset + EXPIRES_OFFSET)[0]
+        return bool(expires) and expires <= time()
+
+    def _read(self, offset: int) -> Tuple[bytes, int]:
+        _, _, _, key_size, value_size, flags, _ = ENTRY.unpack_from(self._mmap, offset)
+        start = offset + ENTRY.size + key_size
+        return self._mmap[start : start + value_size], flags
+
+    def _store(
+        self,
+        key_: bytes,
+        hash_: int,
+        data: bytes,
+        flags: int,
+        expires: float,
+        held: Collection[int],
+    ):
+        """Stores entry in new chunk, replacing key's old entry.
+
+        Stripes in held have to be locked, including stripe of key's bucket.
+        """
+        size = ENTRY.size + len(key_) + len(data)
+        slab_class = bisect_left(self._layout.chunk_sizes, size)
+        if slab_class == len(self._layout.chunk_sizes):
+            raise ValueError(
+                "Value is too large to be stored in pages of shared memory."
+            )
+
+        with self._allocator_lock():
+            offset = self._allocate(slab_class, hash_, held)
+
+        buffer = self._mmap
+        old, previous = self._find(key_, hash_)
+        if old:
+            self._unlink(old, previous)
+
+        bucket = self._get_bucket_offset(hash_)
+        next_ = BUCKET.unpack_from(buffer, bucket)[0]
+        ENTRY.pack_into(
+            buffer,
+            offset,
+            next_,
+            expires,
+            hash_,
+            len(key_),
+            len(data),
+            flags,
+            CHUNK_USED,
+        )
+        start = offset + ENTRY.size
+        buffer[start : start + len(key_)] = key_
+        buffer[start + len(key_) : start + len(key_) + len(data)] = data
+        BUCKET.pack_into(buffer, bucket, offset)
+
+        if old:
+            with self._allocator_lock():
+                self._free(old)
+
+    def _unlink(self, offset: int, previous: int):
+        next_ = BUCKET.unpack_from(self._mmap, offset)[0]
+        BUCKET.pack_into(self._mmap, previous, next_)
+
+    def _remove(self, offset: int, previous: int):
+        self._unlink(offset, previous)
+        with self._allocator_lock():
+            self._free(offset)
+
+    def _get_class_offset(self, slab_class: int) -> int:
+        return self._layout.classes_offset + slab_class * SLAB_CLASS.size
+
+    def _get_page_class(self, page: int) -> int:
+        """Returns slab class of page, or -1 if page wasn't used yet."""
+        return self._mmap[self._layout.page_classes_offset + page] - 1
+
+    def _get_class_pages(self, slab_class: int) -> List[int]:
+        start = self._layout.page_classes_offset
+        classes = self._mmap[start : start + self._layout.pages]
+        return [page for page, value in enumerate(classes) if value == slab_class + 1]
+
+    def _get_page_chunks(self, page: int, slab_class: int) -> range:
+        chunk_size = self._layout.chunk_sizes[slab_class]
+        start = self._layout.pages_offset + page * self._layout.page_size
+        return range(start, start + self._layout.page_size - chunk_size + 1, chunk_size)
+
+    def _allocate(self, slab_class: int, hash_: int, held: Collection[int]) -> int:
+        """Returns free chunk from slab class, evicting other entry if there is none.
+
+        Allocator has to be locked. Chunk is marked as used by entry with given hash,
+        so other processes won't evict it before it's linked to bucket's chain.
+        """
+        offset = self._pop_free_chunk(slab_class)
+        if not offset and self._add_page(slab_class):
+            offset = self._pop_free_chunk(slab_class)
+        if not offset:
+            offset = self._evict(slab_class, held)
+        if not offset and self._reassign_page(slab_class, held):
+            offset = self._pop_free_chunk(slab_class)
+        if not offset:
+            raise SharedMemoryError("There is no room for value in shared memory.")
+
+        ENTRY.pack_into(self._mmap, offset, 0, 0.0, hash_, 0, 0, 0, CHUNK_USED)
+        return offset
+
+    def _pop_free_chunk(self, slab_class: int) -> int:
+        class_offset = self._get_class_offset(slab_class)
+        offset, hand = SLAB_CLASS.unpack_from(self._mmap, class_offset)
+        if offset:
+            next_ = BUCKET.unpack_from(self._mmap, offset)[0]
+            SLAB_CLASS.pack_into(self._mmap, class_offset, next_, hand)
+        return offset
+
+    def _free(self, offset: int):
+        page = (offset - self._layout.pages_offset) // self._layout.page_size
+        class_offset = self._get_class_offset(self._get_page_class(page))
+        next_, hand = SLAB_CLASS.unpack_from(self._mmap, class_offset)
+        ENTRY.pack_into(self._mmap, offset, next_, 0.0, 0, 0, 0, 0, CHUNK_FREE)
+        SLAB_CLASS.pack_into(self._mmap, class_offset, offset, hand)
+
+    def _add_page(self, slab_class: int) -> bool:
+        """Assigns next unused page to slab class."""
+        pages_used = PAGES_USED.unpack_from(self._mmap, PAGES_USED_OFFSET)[0]
+        if pages_used == self._layout.pages:
+            return False
+
+        PAGES_USED.pack_into(self._mmap, PAGES_USED_OFFSET, pages_used + 1)
+        self._assign_page(pages_used, slab_class)
+        return True
+
+    def _assign_page(self, page: int, slab_class: int):
+        self._mmap[self._layout.page_classes_offset + page] = slab_class + 1
+        for offset in reversed(self._get_page_chunks(page, slab_class)):
+            self._free(offset)
+
+    def _evict(self, slab_class: int, held: Collection[int]) -> int:
+        """Evicts entry from slab class, starting from chunk after the last evicted one.
+
+        Entries from stripes locked by other processes are skipped.
+
+        Returns:
+            int: Offset of evicted entry's chunk, or 0 if no entry was evicted.
+        """
+        pages = self._get_class_pages(slab_class)
+        if not pages:
+            return 0
+
+        class_offset = self._get_class_offset(slab_class)
+        head, hand = SLAB_CLASS.unpack_from(self._mmap, class_offset)
+        hand_page = (hand - self._layout.pages_offset) // self._layout.page_size
+        first = bisect_left(pages, hand_page) % len(pages)
+        # First page is checked twice, from the hand and then before it
+        for i in range(len(pages) + 1):
+            for offset in self._get_page_chunks(
+                pages[(first + i) % len(pages)], slab_class
+            ):
+                if (i == 0 and offset < hand) or not self._evict_chunk(offset, held):
+                    continue
+                SLAB_CLASS.pack_into(self._mmap, class_offset, head, offset + 1)
+                return offset
+        return 0
+
+    def _evict_chunk(self, offset: int, held: Collection[int]) -> bool:
+        """Unlinks entry in chunk from its bucket's chain, if its stripe can be locked."""
+        _, _, hash_, _, _, _, state = ENTRY.unpack_from(self._mmap, offset)
+        if state != CHUNK_USED:
+            return False
+
+        stripe = self._get_stripe(hash_)
+        if stripe not in held and not self._lock(STRIPES_LOCK + stripe, wait=False):
+            return False
+
+        try:
+            previous = self._get_bucket_offset(hash_)
+            current = BUCKET.unpack_from(self._mmap, previous)[0]
+            while current and current != offset:
+                previous = current
+                current = BUCKET.unpack_from(self._mmap, current)[0]
+            if not current:
+                # Chunk was allocated, but its entry isn't linked yet
+                return False
+            self._unlink(offset, previous)
+            return True
+        finally:
+            if stripe not in held:
+                self._unlock(STRIPES_LOCK + stripe)
+
+    def _reassign_page(self, slab_class: int, held: Collection[int]) -> bool:
+        """Moves page from other slab class to given class, evicting its entries.
+
+        Pages are taken in turns, starting from page after the last reassigned one.
+        """
+        hand = PAGES_USED.unpack_from(self._mmap, PAGES_HAND_OFFSET)[0]
+        for i in range(self._layout.pages):
+            page = (hand + i) % self._layout.pages
+            page_class = self._get_page_class(page)
+            if page_class in (-1, slab_class) or not self._empty_page(
+                page, page_class, held
+            ):
+                continue
+
+            PAGES_USED.pack_into(self._mmap, PAGES_HAND_OFFSET, page + 1)
+            self._assign_page(page, slab_class)
+            return True
+        return False
+
+    def _empty_page(self, page: int, slab_class: int, held: Collection[int]) -> bool:
+        """Evicts all entries from page and removes its chunks from list of free chunks.
+
+        Returns:
+            bool: False if some entries couldn't be evicted, because their stripes
+                are locked by other processes.
+        """
+        chunks = self._get_page_chunks(page, slab_class)
+        stripes = set()
+        for offset in chunks:
+            _, _, hash_, _, _, _, state = ENTRY.unpack_from(self._mmap, offset)
+            if state == CHUNK_USED:
+                stripes.add(self._get_stripe(hash_))
+
+        locked: List[int] = []
+        try:
+            for stripe in stripes.difference(held):
+                if not self._lock(STRIPES_LOCK + stripe, wait=False):
+                    return False
+                locked.append(stripe)
+
+            for offset in chunks:
+                if ENTRY.unpack_from(self._mmap, offset)[6] == CHUNK_USED:
+                    if not self._evict_chunk(offset, stripes):
+                        return False
+                    self._free(offset)
+        finally:
+            for stripe in locked:
+                self._unlock(STRIPES_LOCK + stripe)
+
+        # Drop page's chunks from list of free chunks
+        class_offset = self._get_class_offset(slab_class)
+        previous = class_offset
+        offset = SLAB_CLASS.unpack_from(self._mmap, class_offset)[0]
+        while offset:
+            next_ = BUCKET.unpack_from(self._mmap, offset)[0]
+            if offset in chunks:
+                BUCKET.pack_into(self._mmap, previous, next_)
+            else:
+                previous = offset
+            offset = next_
+        return True
+
+    def _encode(self, value: Serializable) -> Tuple[bytes, int]:
+        value = self._serialize(value)
+        if isinstance(value, str):
+            return value.encode("utf-8"), FLAG_STR
+        return value, FLAG_BYTES
+
+    def _decode(self, data: bytes, flags: int) -> Any:
+        if flags == FLAG_STR:
+            return self._deserialize(data.decode("utf-8"))
+        return self._deserialize(data)
+
+    @staticmethod
+    def _make_expires(ttl: Optional[int]) -> float:
+        if ttl is None:
+            return 0.0
+        return time() + ttl
+
+    def _get(self, key: str) -> Optional[Tuple[bytes, int]]:
+        key_, hash_, stripe = self._hash(key)
+        with self._stripes_lock([stripe], exclusive=False):
+            offset, _ = self._find_valid(key_, hash_)
+            if not offset:
+                return None
+            return self._read(offset)
+
+    async def get(self, key: str, default: Any) -> Any:
+        item = self._get(key)
+        if item is None:
+            return default
+        return self._decode(*item)
+
+    async def set(self, key: str, value: Serializable, *, ttl: Optional[int]) -> Any:
+        data, flags = self._encode(value)
+        key_, hash_, stripe = self._hash(key)
+        with self._stripes_lock([stripe]):
+            self._store(key_, hash_, data, flags, self._make_expires(ttl), [stripe])
+
+    async def add(self, key: str, value: Serializable, *, ttl: Optional[int]) -> bool:
+        data, flags = self._encode(value)
+        key_, hash_, stripe = self._hash(key)
+        with self._stripes_lock([stripe]):
+            if self._find_valid(key_, hash_)[0]:
+                return False
+            self._store(key_, hash_, data, flags, self._make_expires(ttl), [stripe])
+            return True
+
+    async def get_or_set(
+        self,
+        key: str,
+        default: Union[Awaitable[Serializable], Serializable],
+        *,
+        ttl: Optional[int],
+    ) -> Any:
+        value = await self.get(key, None)
+        if value is None:
+            value = await self._get_default_value(default)
+            await self.set(key, value, ttl=ttl)
+        return value
+
+    async def compare_and_set(
+        self,
+        key: str,
+        expected: Serializable,
+        value: Serializable,
+        *,
+        ttl: Optional[int],
+    ) -> bool:
+        data, flags = self._encode(value)
+        key_, hash_, stripe = self._hash(key)
+        with self._stripes_lock([stripe]):
+            offset, _ = self._find_valid(key_, hash_)
+            if not offset or self._decode(*self._read(offset)) != expected:
+                return False
+            self._store(key_, hash_, data, flags, self._make_expires(ttl), [stripe])
+            return True
+
+    async def get_and_touch(self, key: str, default: Any, *, ttl: Optional[int]) -> Any:
+        key_, hash_, stripe = self._hash(key)
+        with self._stripes_lock([stripe]):
+            offset, _ = self._find_valid(key_, hash_)
+            if not offset:
+                return default
+            EXPIRES.pack_into(
+                self._mmap, offset + EXPIRES_OFFSET, self._make_expires(ttl)
+            )
+            item = self._read(offset)
+        return self._decode(*item)
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        return {key: await self.get(key, None) for key in keys}
+
+    async def set_many(
+        self, mapping: Mapping[str, Serializable], *, ttl: Optional[int]
+    ):
+        for key, value in mapping.items():
+            await self.set(key, value, ttl=ttl)
+
+    async def delete(self, key: str):
+        key_, hash_, stripe = self._hash(key)
+        with self._stripes_lock([stripe]):
+            offset, previous = self._find(key_, hash_)
+            if offset:
+                self._remove(offset, previous)
+
+    async def delete_many(self, keys: Iterable[str]):
+        for key in keys:
+            await self.delete(key)
+
+    async def delete_if_equal(self, key: str, value: Serializable) -> bool:
+        key_, hash_, stripe = self._hash(key)
+        with self._stripes_lock([stripe]):
+            offset, previous = self._find_valid(key_, hash_)
+            if not offset or self._decode(*self._read(offset)) != value:
+                return False
+            self._remove(offset, previous)
+            return True
+
+    async def clear(self):
+        self._lock(STRIPES_LOCK, self._layout.stripes)
+        try:
+            with self._allocator_lock():
+                self._reset(self._mmap)
+        finally:
+            self._unlock(STRIPES_LOCK, self._layout.stripes)
+
+    async def touch(self, key: str, ttl: Optional[int]) -> bool:
+        key_, hash_, stripe = self._hash(key)
+        with self._stripes_lock([stripe]):
+            offset, _ = self._find_valid(key_, hash_)
+            if not offset:
+                return False
+            EXPIRES.pack_into(
+                self._mmap, offset + EXPIRES_OFFSET, self._make_expires(ttl)
+            )
+            return True
+
+    async def incr(self, key: str, delta: Union[float, int]) -> Union[float, int]:
+        if not isinstance(delta, (float, int)):
+            raise ValueError(f"incr value must be int or float")
+        return (await self.incr_many({key: delta}))[key]
+
+    async def decr(self, key: str, delta: Union[float, int]) -> Union[float, int]:
+        if not isinstance(delta, (float, int)):
+            raise ValueError(f"decr value must be int or float")
+        return (await self.incr_many({key: delta * -1}))[key]
+
+    async def incr_many(
+        self, mapping: Mapping[str, Union[float, int]]
+    ) -> Dict[str, Union[float, int]]:
+        for delta in mapping.values():
+            if not isinstance(delta, (float, int)):
+                raise ValueError(f"incr value must be int or float")
+
+        keys = {key: self._hash(key) for key in mapping}
+        stripes = {stripe for _, _, stripe in keys.values()}
+        with self._stripes_lock(stripes):
+            # New values are computed before storing any of them, because
+            # storing value may evict other keys from locked stripes
+            values = {}
+            entries = []
+            for key, (key_, hash_, _) in keys.items():
+                offset = self._find_valid(key_, hash_)[0]
+                if not offset:
+                    raise ValueError(f"'{key}' is not set in the cache")
+
+                expires = EXPIRES.unpack_from(self._mmap, offset + EXPIRES_OFFSET)[0]
+                values[key] = self._decode(*self._read(offset)) + mapping[key]
+                entries.append((key_, hash_, *self._encode(values[key]), expires))
+
+            for entry in entries:
+                self._store(*entry, stripes)
+            return values
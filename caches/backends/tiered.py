@@ -0,0 +1,226 @@
+import asyncio
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Union,
+)
+from uuid import uuid4
+
+from ..core import Cache, CacheURL
+from ..importer import import_from_string
+from ..types import Serializable
+from .base import BaseBackend
+
+TIER_OPTIONS = ("l1", "l2", "l1_ttl", "l1_max_entries")
+
+
+class TieredBackend(BaseBackend):  # pylint: disable=too-many-public-methods
+    """Backend reading keys from fast local cache (L1), falling back to shared
+    cache (L2) and storing keys read from it in L1 for short time."""
+
+    def __init__(self, cache_url: Union[CacheURL, str], **options: Any):
+        super().__init__(cache_url, **options)
+
+        l2_url = self._get_option("l2")
+        assert l2_url, "Tiered cache requires 'l2' option with URL of shared cache."
+
+        l1_url = CacheURL(self._get_tier_url(self._get_option("l1", "locmem")))
+        if l1_url.backend == "locmem" and not l1_url.netloc:
+            # Give L1 its own namespace so it doesn't share keys with other caches
+            l1_url = CacheURL(f"locmem://{uuid4().hex}?{l1_url.components.query}")
+
+        l1_options = self._get_tier_options(l1_url)
+        if not {"max_entries", "max_bytes"} & (set(l1_url.options) | set(l1_options)):
+            l1_options["max_entries"] = int(self._get_option("l1_max_entries", 10000))
+
+        l2_url_ = CacheURL(self._get_tier_url(l2_url))
+        self._l1 = self._create_tier(l1_url, **l1_options)
+        self._l2 = self._create_tier(l2_url_, **self._get_tier_options(l2_url_))
+        self._l1_ttl = int(self._get_option("l1_ttl", 5))
+
+    def _get_tier_options(self, url: CacheURL) -> Dict[str, Any]:
+        """Returns options for tier, passing it options other than TIER_OPTIONS
+        from tiered cache's URL, unless tier's URL sets them, and kwargs."""
+        options = {
+            k: v
+            for k, v in self._cache_url.options.items()
+            if k not in TIER_OPTIONS and k not in url.options
+        }
+        options.update(
+            {k: v for k, v in self._options.items() if k not in TIER_OPTIONS}
+        )
+        return options
+
+    @staticmethod
+    def _get_tier_url(url: str) -> str:
+        if "://" not in url:
+            return f"{url}://"
+        return url
+
+    @staticmethod
+    def _create_tier(url: CacheURL, **options: Any) -> BaseBackend:
+        assert url.backend in Cache.SUPPORTED_BACKENDS, "Invalid backend."
+        assert url.backend != "tiered", "Tiered cache can't be a tier of other cache."
+        backend_cls = import_from_string(Cache.SUPPORTED_BACKENDS[url.backend])
+        assert issubclass(backend_cls, BaseBackend)
+        return backend_cls(url, **options)
+
+    def _get_l1_ttl(self, ttl: Optional[int]) -> int:
+        if ttl:
+            return min(ttl, self._l1_ttl)
+        return self._l1_ttl
+
+    async def connect(self):
+        await self._l1.connect()
+        await self._l2.connect()
+
+    async def disconnect(self):
+        await self._l2.disconnect()
+        await self._l1.disconnect()
+
+    async def get(self, key: str, default: Any) -> Any:
+        value = await self._l1.get(key, None)
+        if value is not None:
+            return value
+
+        value = await self._l2.get(key, None)
+        if value is None:
+            return default
+
+        await self._l1.set(key, value, ttl=self._l1_ttl)
+        return value
+
+    async def set(self, key: str, value: Serializable, *, ttl: Optional[int]) -> Any:
+        await self._l2.set(key, value, ttl=ttl)
+        await self._l1.set(key, value, ttl=self._get_l1_ttl(ttl))
+
+    async def add(self, key: str, value: Serializable, *, ttl: Optional[int]) -> bool:
+        if await self._l2.add(key, value, ttl=ttl):
+            await self._l1.set(key, value, ttl=self._get_l1_ttl(ttl))
+            return True
+        return False
+
+    async def get_or_set(
+        self,
+        key: str,
+        default: Union[Awaitable[Serializable], Serializable],
+        *,
+        ttl: Optional[int],
+    ) -> Any:
+        value = await self._l1.get(key, None)
+        if value is not None:
+            return value
+
+        value = await self._l2.get_or_set(key, default, ttl=ttl)
+        await self._l1.set(key, value, ttl=self._get_l1_ttl(ttl))
+        return value
+
+    async def compare_and_set(
+        self,
+        key: str,
+        expected: Serializable,
+        value: Serializable,
+        *,
+        ttl: Optional[int],
+    ) -> bool:
+        await self._l1.delete(key)
+        return await self._l2.compare_and_set(key, expected, value, ttl=ttl)
+
+    async def get_and_touch(self, key: str, default: Any, *, ttl: Optional[int]) -> Any:
+        await self._l1.delete(key)
+        return await self._l2.get_and_touch(key, default, ttl=ttl)
+
+    async def set_tagged(
+        self, key: str, value: Serializable, *, ttl: Optional[int], tags: Iterable[str]
+    ) -> Any:
+        tags = list(tags)
+        await self._l2.set_tagged(key, value, ttl=ttl, tags=tags)
+        await self._l1.set(key, value, ttl=self._get_l1_ttl(ttl))
+
+    async def invalidate_tags(self, tags: Iterable[str]):
+        # Only L2 knows keys set with tags, including ones set by other clients
+        await self._l2.invalidate_tags(tags)
+        await self._l1.clear()
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(keys)
+        values = await self._l1.get_many(keys)
+
+        missing = [key for key in keys if values[key] is None]
+        if missing:
+            l2_values = await self._l2.get_many(missing)
+            values.update(l2_values)
+            found = {
+                key: value for key, value in l2_values.items() if value is not None
+            }
+            if found:
+                await self._l1.set_many(found, ttl=self._l1_ttl)
+
+        return values
+
+    async def set_many(
+        self, mapping: Mapping[str, Serializable], *, ttl: Optional[int]
+    ):
+        await self._l2.set_many(mapping, ttl=ttl)
+        await self._l1.set_many(mapping, ttl=self._get_l1_ttl(ttl))
+
+    async def delete(self, key: str):
+        await asyncio.gather(self._l1.delete(key), self._l2.delete(key))
+
+    async def delete_many(self, keys: Iterable[str]):
+        keys = list(keys)
+        await asyncio.gather(self._l1.delete_many(keys), self._l2.delete_many(keys))
+
+    async def delete_if_equal(self, key: str, value: Serializable) -> bool:
+        await self._l1.delete(key)
+        return await self._l2.delete_if_equal(key, value)
+
+    async def clear(self):
+        await asyncio.gather(self._l1.clear(), self._l2.clear())
+
+    async def clear_prefix(self, prefix: str):
+        await asyncio.gather(
+            self._l1.clear_prefix(prefix), self._l2.clear_prefix(prefix)
+        )
+
+    async def scan_keys(
+        self, prefix: str, pattern: str, batch: int
+    ) -> AsyncIterator[List[str]]:
+        # L1 only has copies of keys from L2
+        async for keys in self._l2.scan_keys(prefix, pattern, batch):
+            yield keys
+
+    async def touch(self, key: str, ttl: Optional[int]) -> bool:
+        # Key will be read again from L2, where it has up to date expiration time
+        await self._l1.delete(key)
+        return await self._l2.touch(key, ttl)
+
+    async def touch_many(
+        self, keys: Iterable[str], ttl: Optional[int]
+    ) -> Dict[str, bool]:
+        keys = list(keys)
+        await self._l1.delete_many(keys)
+        return await self._l2.touch_many(keys, ttl)
+
+    async def incr(self, key: str, delta: Union[float, int]) -> Union[float, int]:
+        value = await self._l2.incr(key, delta)
+        await self._l1.delete(key)
+        return value
+
+    async def decr(self, key: str, delta: Union[float, int]) -> Union[float, int]:
+        value = await self._l2.decr(key, delta)
+        await self._l1.delete(key)
+        return value
+
+    async def incr_many(
+        self, mapping: Mapping[str, Union[float, int]]
+    ) -> Dict[str, Union[float, int]]:
+        values = await self._l2.incr_many(mapping)
+        await self._l1.delete_many(list(mapping))
+        return values
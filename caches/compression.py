@@ -0,0 +1,140 @@
+import lzma
+import zlib
+from abc import ABCMeta, abstractmethod
+from typing import Any, Dict, Optional, Type, Union
+
+
+class BaseCompressor(metaclass=ABCMeta):
+    # Byte prepended to compressed values, identifying compressor used.
+    # Its never a first byte of value serialized by one of supported serializers.
+    header: bytes
+
+    def __init__(self, level: Optional[int] = None):
+        self.level = level
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes:
+        raise NotImplementedError()
+
+
+class ZlibCompressor(BaseCompressor):
+    header = b"\x01"
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, -1 if self.level is None else self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class LZMACompressor(BaseCompressor):
+    header = b"\x02"
+
+    def compress(self, data: bytes) -> bytes:
+        return lzma.compress(data, preset=self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lzma.decompress(data)
+
+
+class ZstdCompressor(BaseCompressor):
+    header = b"\x03"
+
+    def __init__(self, level: Optional[int] = None):
+        import zstandard  # pylint: disable=import-outside-toplevel
+
+        super().__init__(level)
+        self._compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._decompressor.decompress(data)
+
+
+class LZ4Compressor(BaseCompressor):
+    header = b"\x04"
+
+    def __init__(self, level: Optional[int] = None):
+        import lz4.frame  # pylint: disable=import-outside-toplevel
+
+        super().__init__(level)
+        self._lz4 = lz4.frame
+
+    def compress(self, data: bytes) -> bytes:
+        return self._lz4.compress(data, compression_level=self.level or 0)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._lz4.decompress(data)
+
+
+COMPRESSORS: Dict[str, Type[BaseCompressor]] = {
+    "lz4": LZ4Compressor,
+    "lzma": LZMACompressor,
+    "zlib": ZlibCompressor,
+    "zstd": ZstdCompressor,
+}
+
+_HEADERS = {compressor.header: compressor for compressor in COMPRESSORS.values()}
+_decompressors: Dict[bytes, BaseCompressor] = {}
+
+
+def get_compressor(name: str, level: Optional[int] = None) -> BaseCompressor:
+    """Returns new instance of compressor registered under given name."""
+    if name not in COMPRESSORS:
+        raise ValueError(
+            f"'{name}' is not a supported compression. "
+            f"Supported compressions are: {', '.join(sorted(COMPRESSORS))}"
+        )
+    return COMPRESSORS[name](level)
+
+
+def compress(
+    value: Union[bytes, str], compressor: BaseCompressor, threshold: int
+) -> Union[bytes, str]:
+    """Compresses serialized value if its longer than threshold.
+
+    Args:
+        value (Union[bytes, str]): Serialized value.
+        compressor (BaseCompressor): Compressor to use.
+        threshold (int): Minimum length of value to compress, in bytes.
+
+    Returns:
+        Union[bytes, str]: Compressed value prefixed with compressor's header byte,
+        or original value if it was too short or compression didn't make it smaller.
+    """
+    data = value.encode("utf-8") if isinstance(value, str) else value
+    if len(data) < threshold:
+        return value
+
+    compressed = compressor.header + compressor.compress(data)
+    if len(compressed) >= len(data):
+        return value
+    return compressed
+
+
+def decompress(value: Any) -> Any:
+    """Decompresses value if it starts with compressor's header byte.
+
+    Values that weren't compressed are returned unchanged, so compression can be
+    enabled or disabled for cache that already has values stored in it.
+
+    Args:
+        value (Any): Value read from cache.
+
+    Returns:
+        Any: Decompressed value.
+    """
+    if not isinstance(value, bytes) or len(value) < 2 or value[:1] not in _HEADERS:
+        return value
+
+    header = value[:1]
+    if header not in _decompressors:
+        _decompressors[header] = _HEADERS[header]()
+    return _decompressors[header].decompress(value[1:])
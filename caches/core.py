@@ -1,17 +1,64 @@
+import asyncio
 import json
+import logging
+from inspect import isawaitable, iscoroutine
+from math import log
+from random import random
+from time import time
 from types import TracebackType
-from typing import Any, Awaitable, Coroutine, Dict, Iterable, Mapping, Optional, Type, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 from urllib.parse import SplitResult, parse_qsl, urlsplit
 
 from .importer import import_from_string
 from .types import Serializable, Version
 
+logger = logging.getLogger(__name__)
 
-class Cache:
+# Reserved key marking values stored by get_or_set with early_recompute or grace
+ENTRY_KEY = "__caches_entry__"
+
+
+def _unpack_entry(value: Any) -> Optional[list]:
+    """Returns [value, delta, expires] list if value is an entry stored by
+    get_or_set with early_recompute or grace, or None if its not."""
+    if isinstance(value, dict) and len(value) == 1:
+        entry = value.get(ENTRY_KEY)
+        if isinstance(entry, (list, tuple)) and len(entry) == 3:
+            return list(entry)
+    return None
+
+
+def _unwrap(value: Any) -> Any:
+    entry = _unpack_entry(value)
+    return value if entry is None else entry[0]
+
+
+class Cache:  # pylint: disable=too-many-public-methods
     SUPPORTED_BACKENDS = {
+        "disk": "caches.backends.disk:DiskBackend",
         "dummy": "caches.backends.dummy:DummyBackend",
         "locmem": "caches.backends.locmem:LocMemBackend",
+        "memcached": "caches.backends.memcached:MemcachedBackend",
         "redis": "caches.backends.redis:RedisBackend",
+        "rediscluster": "caches.backends.rediscluster:RedisClusterBackend",
+        "sharded": "caches.backends.sharded:ShardedBackend",
+        "shm": "caches.backends.shm:SharedMemoryBackend",
+        "tiered": "caches.backends.tiered:TieredBackend",
     }
 
     def __init__(
@@ -21,6 +68,9 @@ class Cache:
         ttl: Optional[int] = None,
         version: Optional[Version] = None,
         key_prefix: str = "",
+        max_refreshes: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        batch_wait: Optional[int] = None,
         **options: Any,
     ):
         self.url = CacheURL(url)
@@ -29,6 +79,15 @@ class Cache:
         self.ttl = ttl
         self.version = version or url_options.get("version", "")
         self.key_prefix = key_prefix or url_options.get("key_prefix", "")
+        if max_refreshes is None:
+            max_refreshes = int(url_options.get("max_refreshes", 100))
+        self.max_refreshes = max_refreshes
+        if batch_size is None:
+            batch_size = int(url_options.get("batch_size", 0))
+        self.batch_size = batch_size
+        if batch_wait is None:
+            batch_wait = int(url_options.get("batch_wait", 0))
+        self.batch_wait = batch_wait
 
         if self.ttl is None and url_options.get("ttl") is not None:
             self.ttl = int(url_options["ttl"])
@@ -41,6 +100,11 @@ class Cache:
 
         self.options = options
         self.is_connected = False
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._refreshes: Dict[str, asyncio.Future] = {}
+        self._batch: Dict[str, List[asyncio.Future]] = {}
+        self._batch_handle: Optional[asyncio.Handle] = None
+        self._batch_tasks: Set[asyncio.Future] = set()
 
         assert self.url.backend in self.SUPPORTED_BACKENDS, "Invalid backend."
         backend_str = self.SUPPORTED_BACKENDS[self.url.backend]
@@ -64,6 +128,14 @@ class Cache:
 
     async def disconnect(self) -> None:
         assert self.is_connected, "Already disconnected."
+        if self._batch:
+            if self._batch_handle:
+                self._batch_handle.cancel()
+            self._dispatch_batch()
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+        if self._refreshes:
+            await asyncio.gather(*self._refreshes.values(), return_exceptions=True)
         await self._backend.disconnect()
         self.is_connected = False
 
@@ -103,6 +175,9 @@ class Cache:
     def make_key(self, key: str, version: Optional[Version] = None) -> str:
         return "%s:%s:%s" % (self.key_prefix, version or self.version, key)
 
+    def make_tag_key(self, tag: str) -> str:
+        return "%s:tag:%s" % (self.key_prefix, tag)
+
     def make_ttl(self, ttl: Optional[int] = None) -> Optional[int]:
         if ttl == 0:
             raise ValueError(
@@ -118,9 +193,16 @@ class Cache:
     async def get(
         self, key: str, default: Any = None, *, version: Optional[Version] = None
     ) -> Any:
-        """Gets key value from cache, or default if key was not found or expired."""
+        """Gets key value from cache, or default if key was not found or expired.
+
+        If batch_size is set for cache, keys read by concurrent calls are read from
+        backend together by single get_many call."""
         key_ = self.make_key(key, version)
-        return await self._backend.get(key_, default)
+        if not self.batch_size:
+            return _unwrap(await self._backend.get(key_, default))
+
+        value = await self._get_batched(key_)
+        return default if value is None else _unwrap(value)
 
     async def set(
         self,
@@ -129,11 +211,19 @@ class Cache:
         *,
         ttl: Optional[int] = None,
         version: Optional[Version] = None,
+        tags: Optional[Iterable[str]] = None,
     ) -> Any:
-        """Sets value for key in cache."""
+        """Sets value for key in cache.
+
+        Key set with tags is deleted when any of them is invalidated.
+        """
         key_ = self.make_key(key, version)
         ttl_ = self.make_ttl(ttl)
-        await self._backend.set(key_, value, ttl=ttl_)
+        tags_ = [self.make_tag_key(tag) for tag in tags or ()]
+        if tags_:
+            await self._backend.set_tagged(key_, value, ttl=ttl_, tags=tags_)
+        else:
+            await self._backend.set(key_, value, ttl=ttl_)
 
     async def add(
         self,
@@ -155,12 +245,39 @@ class Cache:
         *,
         ttl: Optional[int] = None,
         version: Optional[Version] = None,
+        early_recompute: Union[bool, float] = False,
+        grace: Optional[int] = None,
     ) -> Any:
         """Gets key value from cache, or default if key was not found or expired.
-        If key was not found in the cache, it will be set with default value."""
+        If key was not found in the cache, it will be set with default value.
+
+        Concurrent calls for the same key share single backend call, so default
+        is evaluated only once and its result or exception is returned to all
+        callers.
+
+        If early_recompute is set, default is evaluated before key expires, with
+        probability growing as expiration time gets closer. Its value is used as
+        a beta parameter of XFetch algorithm, True meaning 1.0. Values larger than
+        1.0 favor earlier recomputation.
+
+        If grace is set, key is kept in cache for additional number of seconds
+        after its ttl passes. During this time its stale value is returned
+        while default is evaluated in background to refresh it.
+
+        Backend's get_or_set is not used when early_recompute or grace is set, so
+        Redis backend's lock option doesn't apply to these calls."""
         key_ = self.make_key(key, version)
         ttl_ = self.make_ttl(ttl)
-        return await self._backend.get_or_set(key_, default, ttl=ttl_)
+        if early_recompute or grace:
+            if early_recompute is True:
+                early_recompute = 1.0
+            return await self._get_or_set_entry(
+                key_, default, ttl_, float(early_recompute), grace
+            )
+        value = await self._single_flight(
+            key_, lambda: self._backend.get_or_set(key_, default, ttl=ttl_), default
+        )
+        return _unwrap(value)
 
     async def get_many(
         self, keys: Iterable[str], version: Optional[Version] = None
@@ -169,7 +286,7 @@ class Cache:
         expired, its value will be None."""
         keys_ = {key: self.make_key(key, version) for key in keys}
         values = await self._backend.get_many(list(keys_.values()))
-        return {key: values[keys_[key]] for key in keys}
+        return {key: _unwrap(values[keys_[key]]) for key in keys}
 
     async def set_many(
         self, mapping: Mapping[str, Serializable], *, ttl: Optional[int] = None
@@ -189,9 +306,49 @@ class Cache:
         keys_ = [self.make_key(key, version) for key in keys]
         await self._backend.delete_many(keys_)
 
+    async def iter_keys(
+        self,
+        pattern: Optional[str] = None,
+        batch: int = 1000,
+        *,
+        version: Optional[Version] = None,
+    ) -> AsyncIterator[str]:
+        """Yields keys set in cache, without key prefix and version.
+
+        Keys are read from backend in batches, next batch being read only after
+        keys from previous one were consumed.
+        """
+        prefix = self.make_key("", version)
+        async for keys in self._backend.scan_keys(prefix, pattern or "*", batch):
+            for key in keys:
+                yield key[len(prefix) :]
+
+    async def iter_items(
+        self,
+        pattern: Optional[str] = None,
+        batch: int = 1000,
+        *,
+        version: Optional[Version] = None,
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Yields keys set in cache with their values, reading values for each
+        batch of keys with single get_many call."""
+        prefix = self.make_key("", version)
+        async for keys in self._backend.scan_keys(prefix, pattern or "*", batch):
+            values = await self._backend.get_many(keys)
+            for key in keys:
+                # Key could be deleted after it was found
+                if values[key] is not None:
+                    yield key[len(prefix) :], _unwrap(values[key])
+
+    async def invalidate_tags(self, tags: Iterable[str]):
+        """Deletes keys set with any of specified tags from cache."""
+        tags_ = [self.make_tag_key(tag) for tag in tags]
+        if tags_:
+            await self._backend.invalidate_tags(tags_)
+
     async def clear(self):
-        """Deletes all keys from cache."""
-        await self._backend.clear()
+        """Deletes all keys with cache's key prefix from cache."""
+        await self._backend.clear_prefix("%s:" % self.key_prefix)
 
     async def touch(
         self, key: str, ttl: Optional[int] = None, *, version: Optional[Version] = None
@@ -201,6 +358,19 @@ class Cache:
         ttl_ = self.make_ttl(ttl)
         return await self._backend.touch(key_, ttl_)
 
+    async def touch_many(
+        self,
+        keys: Iterable[str],
+        ttl: Optional[int] = None,
+        *,
+        version: Optional[Version] = None,
+    ) -> Dict[str, bool]:
+        """Updates expiration time of specified keys in cache."""
+        keys_ = {key: self.make_key(key, version) for key in keys}
+        ttl_ = self.make_ttl(ttl)
+        results = await self._backend.touch_many(list(keys_.values()), ttl_)
+        return {key: results[keys_[key]] for key in keys_}
+
     async def incr(
         self,
         key: str,
@@ -210,7 +380,11 @@ class Cache:
     ) -> Union[float, int]:
         """Increases key value in cache by delta. Defaults to '1'."""
         key_ = self.make_key(key, version)
-        return await self._backend.incr(key_, delta)
+        try:
+            return await self._backend.incr(key_, delta)
+        except Exception as error:
+            await self._raise_if_entry({key: key_}, error)
+            raise
 
     async def decr(
         self,
@@ -221,7 +395,253 @@ class Cache:
     ) -> Union[float, int]:
         """Decreases key value in cache by delta. Defaults to '1'."""
         key_ = self.make_key(key, version)
-        return await self._backend.decr(key_, delta)
+        try:
+            return await self._backend.decr(key_, delta)
+        except Exception as error:
+            await self._raise_if_entry({key: key_}, error)
+            raise
+
+    async def incr_many(
+        self,
+        mapping: Mapping[str, Union[float, int]],
+        *,
+        version: Optional[Version] = None,
+    ) -> Dict[str, Union[float, int]]:
+        """Increases values of many keys in cache by deltas."""
+        keys_ = {key: self.make_key(key, version) for key in mapping}
+        try:
+            values = await self._backend.incr_many(
+                {keys_[key]: delta for key, delta in mapping.items()}
+            )
+        except Exception as error:
+            await self._raise_if_entry(keys_, error)
+            raise
+        return {key: values[keys_[key]] for key in keys_}
+
+    async def compare_and_set(
+        self,
+        key: str,
+        expected: Serializable,
+        value: Serializable,
+        *,
+        ttl: Optional[int] = None,
+        version: Optional[Version] = None,
+    ) -> bool:
+        """Sets value for key in cache only if its current value equals expected."""
+        key_ = self.make_key(key, version)
+        ttl_ = self.make_ttl(ttl)
+        if await self._backend.compare_and_set(key_, expected, value, ttl=ttl_):
+            return True
+
+        # Value could be stored by get_or_set with early_recompute or grace
+        current = await self._backend.get(key_, None)
+        entry = _unpack_entry(current)
+        if entry is None or entry[0] != expected:
+            return False
+        return await self._backend.compare_and_set(key_, current, value, ttl=ttl_)
+
+    async def get_and_touch(
+        self,
+        key: str,
+        default: Any = None,
+        *,
+        ttl: Optional[int] = None,
+        version: Optional[Version] = None,
+    ) -> Any:
+        """Gets key value from cache, updating its expiration time."""
+        key_ = self.make_key(key, version)
+        ttl_ = self.make_ttl(ttl)
+        return _unwrap(await self._backend.get_and_touch(key_, default, ttl=ttl_))
+
+    async def delete_if_equal(
+        self, key: str, value: Serializable, *, version: Optional[Version] = None
+    ) -> bool:
+        """Deletes key from cache only if its current value equals value."""
+        key_ = self.make_key(key, version)
+        if await self._backend.delete_if_equal(key_, value):
+            return True
+
+        # Value could be stored by get_or_set with early_recompute or grace
+        current = await self._backend.get(key_, None)
+        entry = _unpack_entry(current)
+        if entry is None or entry[0] != value:
+            return False
+        return await self._backend.delete_if_equal(key_, current)
+
+    async def _raise_if_entry(self, keys: Mapping[str, str], error: Exception):
+        """Raises ValueError if any of keys, mapped to their cache keys, stores
+        value set by get_or_set with early_recompute or grace."""
+        values = await self._backend.get_many(list(keys.values()))
+        for key, key_ in keys.items():
+            if _unpack_entry(values.get(key_)) is not None:
+                raise ValueError(
+                    f"'{key}' was set by get_or_set with early_recompute or grace "
+                    "and can't be increased or decreased"
+                ) from error
+
+    async def _get_or_set_entry(
+        self,
+        key: str,
+        default: Union[Awaitable[Serializable], Serializable],
+        ttl: Optional[int],
+        beta: float,
+        grace: Optional[int],
+    ) -> Any:
+        """Gets key value from cache, evaluating default if key was not found or
+        is due for recomputation.
+
+        Value is stored in cache together with time it took to evaluate default
+        and its expiration time, as a [value, delta, expires] list under ENTRY_KEY
+        of a dict. Key's ttl in cache is extended by grace, during which value is
+        refreshed in background. Values not stored this way are recomputed.
+        """
+        entry = _unpack_entry(await self._backend.get(key, None))
+        if entry is not None:
+            value, delta, expires = entry
+            # 1.0 - random() is never 0, so its logarithm is defined
+            if expires is None or time() - delta * beta * log(1.0 - random()) < expires:
+                if iscoroutine(default):
+                    default.close()
+                return value
+            if grace:
+                self._refresh(key, default, ttl, grace)
+                return value
+
+        return await self._single_flight(
+            key, lambda: self._recompute(key, default, ttl, grace), default
+        )
+
+    async def _recompute(
+        self,
+        key: str,
+        default: Union[Awaitable[Serializable], Serializable],
+        ttl: Optional[int],
+        grace: Optional[int] = None,
+    ) -> Any:
+        """Evaluates default and stores it in cache with time it took to evaluate
+        and its expiration time."""
+        start = time()
+        if callable(default):
+            default = default()
+        if isawaitable(default):
+            default = await default
+        now = time()
+
+        expires = now + ttl if ttl else None
+        if ttl and grace:
+            ttl += grace
+        entry = {ENTRY_KEY: [default, now - start, expires]}
+        await self._backend.set(key, entry, ttl=ttl)
+        return default
+
+    def _refresh(
+        self,
+        key: str,
+        default: Union[Awaitable[Serializable], Serializable],
+        ttl: Optional[int],
+        grace: Optional[int],
+    ):
+        """Starts background task recomputing key's value, unless its already
+        being recomputed or limit of concurrent refreshes was reached."""
+        if (
+            key in self._refreshes
+            or key in self._in_flight
+            or len(self._refreshes) >= self.max_refreshes
+        ):
+            if iscoroutine(default):
+                default.close()
+            return
+
+        task = asyncio.ensure_future(self._recompute(key, default, ttl, grace))
+        self._refreshes[key] = task
+        task.add_done_callback(lambda t: self._end_refresh(key, t))
+
+    def _end_refresh(self, key: str, task: asyncio.Future):
+        del self._refreshes[key]
+        if not task.cancelled() and task.exception():
+            logger.error(
+                "Refreshing cache key '%s' failed", key, exc_info=task.exception()
+            )
+
+    async def _single_flight(
+        self, key: str, factory: Callable[[], Awaitable[Any]], default: Any
+    ) -> Any:
+        """Runs awaitable returned by factory, unless other call for same key is
+        already in progress, in which case its result is awaited instead.
+
+        Args:
+            key (str): Cache key.
+            factory (Callable): Callable returning awaitable to run.
+            default (Any): Default value of the call. If its a coroutine that won't
+                be awaited because other call is in progress, it will be closed.
+
+        Returns:
+            Any: Result of the awaitable.
+        """
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda f: self._end_flight(key, f))
+        elif iscoroutine(default):
+            default.close()
+
+        # Shield the call so cancelling one caller doesn't cancel it for the others
+        return await asyncio.shield(future)
+
+    def _end_flight(self, key: str, future: asyncio.Future):
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        if not future.cancelled():
+            # Mark exception as retrieved, its re-raised for callers awaiting it
+            future.exception()
+
+    def _get_batched(self, key: str) -> asyncio.Future:
+        """Adds key to batch of keys to read from backend.
+
+        Batch is read when it reaches batch_size keys, or when batch_wait
+        microseconds pass since first key was added to it. If batch_wait is not
+        set, batch is read after current event loop iteration.
+
+        Returns:
+            asyncio.Future: Future resolved with key's value, or None.
+        """
+        loop = asyncio.get_event_loop()
+        if not self._batch:
+            if self.batch_wait:
+                self._batch_handle = loop.call_later(
+                    self.batch_wait / 1000000, self._dispatch_batch
+                )
+            else:
+                self._batch_handle = loop.call_soon(self._dispatch_batch)
+
+        future = loop.create_future()
+        self._batch.setdefault(key, []).append(future)
+        if len(self._batch) >= self.batch_size:
+            if self._batch_handle:
+                self._batch_handle.cancel()
+            self._dispatch_batch()
+        return future
+
+    def _dispatch_batch(self):
+        batch, self._batch = self._batch, {}
+        task = asyncio.ensure_future(self._read_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _read_batch(self, batch: Dict[str, List[asyncio.Future]]):
+        try:
+            values = await self._backend.get_many(list(batch))
+        except Exception as error:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
+        else:
+            for key, futures in batch.items():
+                for future in futures:
+                    if not future.done():
+                        future.set_result(values.get(key))
 
     async def _get_key_from_coroutine(self, coroutine: Coroutine) -> str:
         """Gets key from coroutine name and its arguments.
@@ -237,8 +657,8 @@ class Cache:
         coroutine_name = coroutine.__qualname__
         coroutine_arguments = frame.f_locals
 
-        args = [arg for arg in coroutine_arguments.get('args', [])]
-        kwargs = coroutine_arguments.get('kwds')
+        args = [arg for arg in coroutine_arguments.get("args", [])]
+        kwargs = coroutine_arguments.get("kwds")
 
         return self.make_key(json.dumps([coroutine_name, args, kwargs]))
 
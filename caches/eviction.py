@@ -0,0 +1,186 @@
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class EvictionPolicy(metaclass=ABCMeta):
+    """Tracks keys and their sizes, deciding which key should be evicted next."""
+
+    def __init__(self):
+        self.size = 0
+        self.evictions = 0
+        self._sizes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._sizes
+
+    def get_size(self, key: str) -> int:
+        """Returns recorded size of key, or 0 if key is not tracked."""
+        return self._sizes.get(key, 0)
+
+    def add(self, key: str, size: int):
+        """Records key being set in cache with value of given size."""
+        if key in self._sizes:
+            self.size -= self._sizes[key]
+            self._access(key)
+        else:
+            self._insert(key)
+        self._sizes[key] = size
+        self.size += size
+
+    def touch(self, key: str):
+        """Records key being read from cache."""
+        if key in self._sizes:
+            self._access(key)
+
+    def remove(self, key: str):
+        """Stops tracking key that was deleted from cache."""
+        size = self._sizes.pop(key, None)
+        if size is not None:
+            self.size -= size
+            self._discard(key)
+
+    def evict(self) -> str:
+        """Stops tracking next key to evict and returns it."""
+        key = self._pop()
+        self.size -= self._sizes.pop(key)
+        self.evictions += 1
+        return key
+
+    def clear(self):
+        self.size = 0
+        self._sizes = {}
+        self._clear()
+
+    @abstractmethod
+    def _insert(self, key: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _access(self, key: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _discard(self, key: str):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _pop(self) -> str:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _clear(self):
+        raise NotImplementedError()
+
+
+class LRUPolicy(EvictionPolicy):
+    """Evicts least recently used key first."""
+
+    def __init__(self):
+        super().__init__()
+        self._order: "OrderedDict[str, None]" = OrderedDict()
+
+    def _insert(self, key: str):
+        self._order[key] = None
+
+    def _access(self, key: str):
+        self._order.move_to_end(key)
+
+    def _discard(self, key: str):
+        del self._order[key]
+
+    def _pop(self) -> str:
+        key, _ = self._order.popitem(last=False)
+        return key
+
+    def _clear(self):
+        self._order.clear()
+
+
+class _FrequencyNode:
+    __slots__ = ("count", "keys", "prev", "next")
+
+    def __init__(self, count: int):
+        self.count = count
+        self.keys: "OrderedDict[str, None]" = OrderedDict()
+        self.prev: "_FrequencyNode" = self
+        self.next: "_FrequencyNode" = self
+
+    def insert_after(self, count: int) -> "_FrequencyNode":
+        node = _FrequencyNode(count)
+        node.prev = self
+        node.next = self.next
+        self.next.prev = node
+        self.next = node
+        return node
+
+    def unlink(self):
+        self.prev.next = self.next
+        self.next.prev = self.prev
+
+
+class LFUPolicy(EvictionPolicy):
+    """Evicts least frequently used key first, least recently used on ties.
+
+    Keys are kept in a linked list of frequency buckets, so every operation
+    runs in constant time.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._head = _FrequencyNode(0)
+        self._nodes: Dict[str, _FrequencyNode] = {}
+
+    def _insert(self, key: str):
+        node = self._head.next
+        if node is self._head or node.count != 1:
+            node = self._head.insert_after(1)
+        node.keys[key] = None
+        self._nodes[key] = node
+
+    def _access(self, key: str):
+        node = self._nodes[key]
+        next_node = node.next
+        if next_node is self._head or next_node.count != node.count + 1:
+            next_node = node.insert_after(node.count + 1)
+        next_node.keys[key] = None
+        self._nodes[key] = next_node
+        self._remove_from_node(node, key)
+
+    def _discard(self, key: str):
+        self._remove_from_node(self._nodes.pop(key), key)
+
+    def _pop(self) -> str:
+        node = self._head.next
+        key, _ = node.keys.popitem(last=False)
+        del self._nodes[key]
+        if not node.keys:
+            node.unlink()
+        return key
+
+    def _clear(self):
+        self._head = _FrequencyNode(0)
+        self._nodes = {}
+
+    @staticmethod
+    def _remove_from_node(node: _FrequencyNode, key: str):
+        del node.keys[key]
+        if not node.keys:
+            node.unlink()
+
+
+EVICTION_POLICIES = {"lru": LRUPolicy, "lfu": LFUPolicy}
+
+
+def get_eviction_policy(name: Optional[str]) -> EvictionPolicy:
+    """Returns new instance of eviction policy registered under given name."""
+    name = (name or "lru").lower()
+    if name not in EVICTION_POLICIES:
+        raise ValueError(
+            f"'{name}' is not a supported eviction policy. "
+            f"Supported policies are: {', '.join(sorted(EVICTION_POLICIES))}"
+        )
+    return EVICTION_POLICIES[name]()
@@ -0,0 +1,64 @@
+from bisect import bisect
+from hashlib import md5
+from typing import Iterable, List, Tuple
+
+
+class HashRing:
+    """Consistent hash ring, mapping keys to nodes like ketama.
+
+    Every node is placed on the ring in many points (virtual nodes), and key
+    belongs to node owning first point after key's hash. Adding or removing
+    a node moves only keys between it and its neighbours, about 1/N of all keys.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 160):
+        assert vnodes > 0, "Hash ring requires at least one virtual node per node."
+        self.vnodes = vnodes
+        self._nodes: List[str] = []
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        for node in nodes:
+            self.add(node)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._nodes
+
+    @property
+    def nodes(self) -> List[str]:
+        return list(self._nodes)
+
+    def add(self, node: str):
+        assert node not in self._nodes, f"'{node}' is already in hash ring."
+        self._nodes.append(node)
+        self._build()
+
+    def remove(self, node: str):
+        self._nodes.remove(node)
+        self._build()
+
+    def get_node(self, key: str) -> str:
+        assert self._nodes, "Hash ring has no nodes."
+        index = bisect(self._points, self._hash(key.encode("utf-8")))
+        return self._owners[index % len(self._owners)]
+
+    def _build(self):
+        points: List[Tuple[int, str]] = []
+        for node in self._nodes:
+            # Every md5 digest of node's name gives four points on the ring
+            for i in range((self.vnodes + 3) // 4):
+                digest = md5(f"{node}-{i}".encode("utf-8")).digest()
+                for j in range(min(4, self.vnodes - i * 4)):
+                    points.append(
+                        (int.from_bytes(digest[j * 4 : j * 4 + 4], "little"), node)
+                    )
+
+        points.sort()
+        self._points = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    @staticmethod
+    def _hash(key: bytes) -> int:
+        return int.from_bytes(md5(key).digest()[:4], "little")
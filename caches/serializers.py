@@ -0,0 +1,117 @@
+import json
+import pickle
+from abc import ABCMeta, abstractmethod
+from typing import Any, Union
+
+from .importer import import_from_string
+
+
+class BaseSerializer(metaclass=ABCMeta):
+    @abstractmethod
+    def dumps(self, value: Any) -> Union[bytes, str]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def loads(self, value: Union[bytes, str]) -> Any:
+        raise NotImplementedError()
+
+
+class JSONSerializer(BaseSerializer):
+    def dumps(self, value: Any) -> str:
+        return json.dumps(value)
+
+    def loads(self, value: Union[bytes, str]) -> Any:
+        return json.loads(value)
+
+
+class PickleSerializer(BaseSerializer):
+    def dumps(self, value: Any) -> bytes:
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, value: Union[bytes, str]) -> Any:
+        return pickle.loads(value)  # type: ignore
+
+
+class MsgPackSerializer(BaseSerializer):
+    def __init__(self):
+        import msgpack  # pylint: disable=import-outside-toplevel
+
+        self._msgpack = msgpack
+
+    def dumps(self, value: Any) -> bytes:
+        return self._msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, value: Union[bytes, str]) -> Any:
+        return self._msgpack.unpackb(value, raw=False)
+
+
+class OrJSONSerializer(BaseSerializer):
+    def __init__(self):
+        import orjson  # pylint: disable=import-outside-toplevel
+
+        self._orjson = orjson
+
+    def dumps(self, value: Any) -> bytes:
+        return self._orjson.dumps(value)
+
+    def loads(self, value: Union[bytes, str]) -> Any:
+        return self._orjson.loads(value)
+
+
+class NullSerializer(BaseSerializer):
+    """Serializer that returns values unchanged.
+
+    Usable only by backends that keep values in process memory.
+    """
+
+    def dumps(self, value: Any) -> Any:
+        return value
+
+    def loads(self, value: Any) -> Any:
+        return value
+
+
+SERIALIZERS = {
+    "json": "caches.serializers:JSONSerializer",
+    "msgpack": "caches.serializers:MsgPackSerializer",
+    "none": "caches.serializers:NullSerializer",
+    "orjson": "caches.serializers:OrJSONSerializer",
+    "pickle": "caches.serializers:PickleSerializer",
+}
+
+
+def get_serializer(serializer: Any = None) -> Any:
+    """Returns serializer instance for given option value.
+
+    Args:
+        serializer (Any): Name of one of supported serializers, import string
+            of serializer class, serializer class or its instance. Serializer
+            is any object implementing `dumps` and `loads` methods.
+            Defaults to "json".
+
+    Returns:
+        Any: Serializer instance.
+    """
+    if serializer is None:
+        serializer = "json"
+
+    if isinstance(serializer, str):
+        if serializer in SERIALIZERS:
+            serializer = import_from_string(SERIALIZERS[serializer])
+        elif ":" in serializer:
+            serializer = import_from_string(serializer)
+        else:
+            raise ValueError(
+                f"'{serializer}' is not a supported serializer. "
+                f"Supported serializers are: {', '.join(sorted(SERIALIZERS))}"
+            )
+
+    if isinstance(serializer, type):
+        serializer = serializer()
+
+    if not callable(getattr(serializer, "dumps", None)) or not callable(
+        getattr(serializer, "loads", None)
+    ):
+        raise ValueError("Serializer must implement 'dumps' and 'loads' methods.")
+
+    return serializer
@@ -0,0 +1,17 @@
+import pytest
+
+from caches import Cache
+
+
+@pytest.fixture
+def url(tmp_path):
+    return f"disk://{tmp_path}"
+
+
+@pytest.fixture
+async def cache(url):
+    obj = Cache(url)
+    await obj.connect()
+    yield obj
+    await obj.clear()
+    await obj.disconnect()
@@ -0,0 +1,57 @@
+# pylint: disable=protected-access
+import os
+
+import pytest
+
+from caches import Cache
+from caches.backends.disk import DiskBackend
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_if_more_than_one_connection_is_opened(url):
+    cache = Cache(url)
+    await cache.connect()
+    with pytest.raises(AssertionError):
+        await cache.connect()
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_if_nonexistant_connection_is_closed(url):
+    cache = Cache(url)
+    with pytest.raises(AssertionError):
+        await cache.disconnect()
+
+
+def test_backend_reads_absolute_path_from_url():
+    backend = DiskBackend("disk:///var/cache/app")
+    assert backend._path == os.path.join("/var/cache/app", "cache.log")
+
+
+def test_backend_reads_relative_path_from_url():
+    backend = DiskBackend("disk://cache/app")
+    assert backend._path == os.path.join("cache/app", "cache.log")
+
+
+def test_backend_errors_if_path_is_not_set():
+    with pytest.raises(AssertionError):
+        DiskBackend("disk://")
+
+
+def test_max_size_can_be_set_in_url():
+    backend = DiskBackend("disk:///var/cache/app?max_size=1024")
+    assert backend._max_size == 1024
+
+
+def test_backend_errors_if_null_serializer_is_set():
+    with pytest.raises(ValueError):
+        DiskBackend("disk:///var/cache/app?serializer=none")
+
+
+@pytest.mark.asyncio
+async def test_backend_creates_directory(tmp_path):
+    cache = Cache(f"disk://{tmp_path}/cache/app")
+    await cache.connect()
+    await cache.set("test", "Ok!")
+    await cache.disconnect()
+    assert os.path.isfile(tmp_path / "cache" / "app" / "cache.log")
@@ -0,0 +1,190 @@
+# pylint: disable=protected-access
+import asyncio
+import os
+import time
+
+import pytest
+
+from caches import Cache
+from caches.backends import disk
+
+
+@pytest.fixture
+def min_compaction_size(monkeypatch):
+    monkeypatch.setattr(disk, "MIN_COMPACTION_SIZE", 1024)
+
+
+@pytest.fixture
+def slow_compaction(monkeypatch):
+    copy_records = disk.copy_records
+
+    def slow_copy_records(*args):
+        time.sleep(0.2)
+        return copy_records(*args)
+
+    monkeypatch.setattr(disk, "copy_records", slow_copy_records)
+
+
+@pytest.mark.asyncio
+async def test_values_are_read_back_after_restart(url):
+    cache = Cache(url)
+    await cache.connect()
+    await cache.set_many({"a": 1, "b": "text", "c": [1, 2]})
+    await cache.set("a", 2)
+    await cache.delete("b")
+    await cache.disconnect()
+
+    await cache.connect()
+    assert await cache.get_many(["a", "b", "c"]) == {"a": 2, "b": None, "c": [1, 2]}
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_expired_values_are_not_read_back_after_restart(url):
+    cache = Cache(url)
+    await cache.connect()
+    await cache.set("test", "Ok!", ttl=1)
+    await cache.set("other", "Ok!", ttl=60)
+    await cache.disconnect()
+
+    await asyncio.sleep(2)
+    await cache.connect()
+    assert await cache.get("test") is None
+    assert await cache.get("other") == "Ok!"
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_incomplete_record_at_end_of_log_is_removed(url, tmp_path):
+    cache = Cache(url)
+    await cache.connect()
+    await cache.set("test", "Ok!")
+    await cache.disconnect()
+
+    size = os.path.getsize(tmp_path / "cache.log")
+    with open(tmp_path / "cache.log", "ab") as log:
+        log.write(b"\x01\x02\x03\x04\x01\x00")
+
+    await cache.connect()
+    assert os.path.getsize(tmp_path / "cache.log") == size
+    assert await cache.get("test") == "Ok!"
+    await cache.set("other", "Ok!")
+    await cache.disconnect()
+
+    await cache.connect()
+    assert await cache.get_many(["test", "other"]) == {"test": "Ok!", "other": "Ok!"}
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_value_is_visible_before_its_record_is_written(cache):
+    task = asyncio.ensure_future(cache.set("test", "Ok!"))
+    await asyncio.sleep(0)
+    assert await cache.get("test") == "Ok!"
+    await task
+
+
+@pytest.mark.asyncio
+async def test_concurrent_increases_are_not_lost(cache):
+    await cache.set("test", 0)
+    await asyncio.gather(*[cache.incr("test") for _ in range(100)])
+    assert await cache.get("test") == 100
+
+
+@pytest.mark.asyncio
+async def test_clear_truncates_log(cache, tmp_path):
+    await cache.set("test", "Ok!")
+    await cache.clear()
+    assert os.path.getsize(tmp_path / "cache.log") == 0
+    await cache.set("other", "Ok!")
+    assert await cache.get("other") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_least_recently_written_keys_are_evicted_over_size_limit(url):
+    cache = Cache(url, max_size=2000)
+    await cache.connect()
+    for i in range(100):
+        await cache.set(str(i), "a" * 100)
+
+    assert await cache.get("0") is None
+    assert await cache.get("99") == "a" * 100
+    assert cache._backend._live <= 2000
+    await cache.disconnect()
+
+    await cache.connect()
+    assert await cache.get("0") is None
+    assert await cache.get("99") == "a" * 100
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_value_larger_than_size_limit_is_not_set(url):
+    cache = Cache(url, max_size=100)
+    await cache.connect()
+    await cache.set("test", "Ok!")
+    await cache.set("test", "a" * 200)
+    assert await cache.get("test") is None
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("min_compaction_size")
+async def test_log_is_compacted_when_most_of_it_are_old_records(cache, tmp_path):
+    await cache.set("other", "Ok!")
+    for i in range(100):
+        await cache.set("test", i)
+
+    await asyncio.sleep(0.1)
+    assert cache._backend._compaction is None
+    # Log would take over 3000 bytes without compaction
+    assert os.path.getsize(tmp_path / "cache.log") < 1500
+    assert os.path.getsize(tmp_path / "cache.log") == cache._backend._size
+    assert await cache.get_many(["test", "other"]) == {"test": 99, "other": "Ok!"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("min_compaction_size", "slow_compaction")
+async def test_values_written_during_compaction_are_kept(url):
+    cache = Cache(url)
+    await cache.connect()
+    for i in range(20):
+        await cache.set_many({f"key-{j}": i for j in range(10)})
+
+    compaction = cache._backend._compaction
+    assert compaction is not None
+    await cache.set_many({f"new-{i}": i for i in range(10)})
+    await cache.delete("key-0")
+    assert not compaction.done()
+    await compaction
+
+    expected = {f"key-{i}": 19 if i else None for i in range(10)}
+    expected.update({f"new-{i}": i for i in range(10)})
+    assert await cache.get_many(expected) == expected
+    await cache.disconnect()
+
+    await cache.connect()
+    assert await cache.get_many(expected) == expected
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("min_compaction_size", "slow_compaction")
+async def test_cache_cleared_during_compaction_stays_empty(url):
+    cache = Cache(url)
+    await cache.connect()
+    for i in range(20):
+        await cache.set_many({f"key-{j}": i for j in range(10)})
+
+    compaction = cache._backend._compaction
+    assert compaction is not None
+    await cache.clear()
+    await cache.set("test", "Ok!")
+    await compaction
+
+    assert await cache.get_many(["key-0", "test"]) == {"key-0": None, "test": "Ok!"}
+    await cache.disconnect()
+
+    await cache.connect()
+    assert await cache.get_many(["key-0", "test"]) == {"key-0": None, "test": "Ok!"}
+    await cache.disconnect()
@@ -1,5 +1,7 @@
 import pytest
 
+from caches import Cache
+
 
 @pytest.mark.asyncio
 async def test_setting_key_is_noop(cache):
@@ -123,3 +125,55 @@ async def test_decreasing_set_key_raises_value_error(cache):
 async def test_decreasing_key_raises_value_error(cache):
     with pytest.raises(ValueError):
         await cache.decr("test")
+
+
+@pytest.mark.asyncio
+async def test_setting_value_checks_if_its_serializable_with_cache_serializer():
+    cache = Cache("dummy://null?serializer=pickle")
+    await cache.set("test", ("hello", {1, 2}))
+
+
+@pytest.mark.asyncio
+async def test_setting_value_not_serializable_with_cache_serializer_raises_error(cache):
+    with pytest.raises(TypeError):
+        await cache.set("test", {1, 2})
+
+
+@pytest.mark.asyncio
+async def test_touching_many_keys_is_noop(cache):
+    await cache.set("test", "Ok!")
+    assert await cache.touch_many(["test"]) == {"test": False}
+
+
+@pytest.mark.asyncio
+async def test_increasing_many_keys_raises_value_error(cache):
+    with pytest.raises(ValueError):
+        await cache.incr_many({"test": 1})
+
+
+@pytest.mark.asyncio
+async def test_compare_and_set_doesnt_set_key(cache):
+    assert not await cache.compare_and_set("test", "Ok!", "Updated")
+
+
+@pytest.mark.asyncio
+async def test_get_and_touch_returns_default(cache):
+    assert await cache.get_and_touch("test", "default") == "default"
+
+
+@pytest.mark.asyncio
+async def test_delete_if_equal_doesnt_delete_key(cache):
+    assert not await cache.delete_if_equal("test", "Ok!")
+
+
+@pytest.mark.asyncio
+async def test_set_with_tags_doesnt_set_key(cache):
+    await cache.set("test", "Ok!", tags=["users"])
+    await cache.invalidate_tags(["users"])
+    assert await cache.get("test") is None
+
+
+@pytest.mark.asyncio
+async def test_iter_keys_yields_nothing(cache):
+    await cache.set("test", "Ok!")
+    assert [key async for key in cache.iter_keys()] == []
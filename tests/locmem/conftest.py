@@ -7,4 +7,5 @@ from caches import Cache
 async def cache():
     obj = Cache("locmem://0")
     await obj.connect()
-    return obj
+    yield obj
+    await obj.disconnect()
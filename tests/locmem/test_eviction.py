@@ -0,0 +1,74 @@
+# pylint: disable=protected-access
+import pytest
+
+from caches import Cache
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used_key_when_max_entries_is_reached():
+    async with Cache("locmem://evict?max_entries=2") as cache:
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        await cache.get("a")
+        await cache.set("c", 3)
+        assert await cache.get("a") == 1
+        assert await cache.get("b") is None
+        assert await cache.get("c") == 3
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_frequently_used_key_when_max_entries_is_reached():
+    async with Cache("locmem://evict?max_entries=2&eviction=lfu") as cache:
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        await cache.get("b")
+        await cache.get("b")
+        await cache.get("a")
+        await cache.set("c", 3)
+        assert await cache.get("a") is None
+        assert await cache.get("b") == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_keys_when_max_bytes_is_exceeded():
+    async with Cache("locmem://evict", max_bytes=100) as cache:
+        await cache.set("a", "x" * 40)
+        await cache.set("b", "x" * 40)
+        await cache.set("c", "x" * 40)
+        assert await cache.get("a") is None
+        assert await cache.get("b") is not None
+        assert await cache.get("c") is not None
+
+
+@pytest.mark.asyncio
+async def test_cache_counts_evicted_keys():
+    async with Cache("locmem://evict", max_entries=1) as cache:
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        await cache.set("c", 3)
+        assert cache._backend.evictions == 2
+
+
+@pytest.mark.asyncio
+async def test_deleted_keys_are_not_counted_towards_limit():
+    async with Cache("locmem://evict", max_entries=2) as cache:
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        await cache.delete("a")
+        await cache.set("c", 3)
+        assert await cache.get("b") == 2
+        assert cache._backend.evictions == 0
+
+
+@pytest.mark.asyncio
+async def test_unbounded_cache_has_no_evictions():
+    async with Cache("locmem://evict") as cache:
+        await cache.set("a", 1)
+        assert cache._backend.evictions == 0
+
+
+@pytest.mark.asyncio
+async def test_connecting_cache_with_unsupported_eviction_policy_raises_value_error():
+    cache = Cache("locmem://evict?max_entries=2&eviction=fifo")
+    with pytest.raises(ValueError):
+        await cache.connect()
@@ -0,0 +1,84 @@
+# pylint: disable=protected-access
+import asyncio
+
+import pytest
+
+from caches import Cache
+from caches.backends.locmem import DEADLINES_SLACK
+
+
+@pytest.mark.asyncio
+async def test_expired_keys_are_removed_from_cache_without_being_read():
+    async with Cache("locmem://expiry?expiry_interval=0.1") as cache:
+        await cache.set("test", "Ok!", ttl=1)
+        await cache.set("other", "Ok!")
+        await asyncio.sleep(2.5)
+        assert list(cache._backend._caches["expiry"]) == [cache.make_key("other")]
+
+
+@pytest.mark.asyncio
+async def test_touched_key_is_not_removed_at_its_old_expiration_time():
+    async with Cache("locmem://expiry?expiry_interval=0.1") as cache:
+        await cache.set("test", "Ok!", ttl=1)
+        await cache.touch("test", 10)
+        await asyncio.sleep(2.5)
+        assert await cache.get("test") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_key_set_again_without_ttl_is_not_removed():
+    async with Cache("locmem://expiry?expiry_interval=0.1") as cache:
+        await cache.set("test", "Ok!", ttl=1)
+        await cache.set("test", "Ok!")
+        await asyncio.sleep(2.5)
+        assert await cache.get("test") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_expired_keys_are_removed_in_batches():
+    async with Cache("locmem://expiry", expiry_interval=0) as cache:
+        for i in range(5):
+            await cache.set(str(i), i, ttl=1)
+        await asyncio.sleep(2)
+        assert cache._backend._remove_expired(3) == 3
+        assert len(cache._backend._caches["expiry"]) == 2
+        assert cache._backend._remove_expired(3) == 2
+        assert not cache._backend._caches["expiry"]
+
+
+@pytest.mark.asyncio
+async def test_expired_keys_are_removed_from_eviction_policy():
+    async with Cache("locmem://expiry?max_entries=10", expiry_interval=0) as cache:
+        await cache.set("test", "Ok!", ttl=1)
+        await asyncio.sleep(2)
+        cache._backend._remove_expired(10)
+        assert not cache._backend._policies["expiry"]
+
+
+@pytest.mark.asyncio
+async def test_expiry_task_is_stopped_on_disconnect():
+    cache = Cache("locmem://expiry")
+    await cache.connect()
+    task = cache._backend._expiry_task
+    await cache.disconnect()
+    assert task.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_increasing_key_doesnt_add_its_deadline_again():
+    async with Cache("locmem://expiry?max_entries=10", expiry_interval=0) as cache:
+        await cache.set("test", 0, ttl=3600)
+        for _ in range(10000):
+            await cache.incr("test")
+        assert len(cache._backend._deadlines["expiry"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_deadlines_heap_is_rebuilt_when_outdated_deadlines_outnumber_keys():
+    async with Cache("locmem://expiry?max_entries=10", expiry_interval=0) as cache:
+        for i in range(10000):
+            await cache.set(str(i), i, ttl=3600)
+        deadlines = cache._backend._deadlines["expiry"]
+        assert len(deadlines) <= 10 * 2 + DEADLINES_SLACK + 1
+        cached_keys = set(cache._backend._caches["expiry"])
+        assert cached_keys <= {key for _, key in deadlines}
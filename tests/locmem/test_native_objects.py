@@ -0,0 +1,55 @@
+import pytest
+
+from caches import Cache
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+@pytest.mark.asyncio
+async def test_cache_without_serializer_stores_object_itself():
+    async with Cache("locmem://native?serializer=none") as cache:
+        value = {"hello": ("world", 1)}
+        await cache.set("test", value)
+        assert await cache.get("test") is value
+
+
+@pytest.mark.asyncio
+async def test_cache_without_serializer_stores_non_json_serializable_objects():
+    async with Cache("locmem://native", serializer="none") as cache:
+        await cache.set("test", Point(1, 2))
+        point = await cache.get("test")
+        assert (point.x, point.y) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_cache_without_serializer_increases_and_decreases_values():
+    async with Cache("locmem://native?serializer=none") as cache:
+        await cache.set("test", 10)
+        assert await cache.incr("test", 5) == 15
+        assert await cache.decr("test", 2) == 13
+
+
+@pytest.mark.asyncio
+async def test_cache_without_serializer_evicts_keys_when_max_bytes_is_exceeded():
+    async with Cache("locmem://native?serializer=none&max_bytes=200") as cache:
+        await cache.set("a", "x" * 80)
+        await cache.set("b", "x" * 80)
+        await cache.set("c", "x" * 80)
+        assert await cache.get("a") is None
+        assert await cache.get("c") is not None
+
+
+def test_cache_with_unsupported_serializer_raises_value_error():
+    with pytest.raises(ValueError):
+        Cache("locmem://native?serializer=invalid")
+
+
+@pytest.mark.asyncio
+async def test_cache_with_pickle_serializer_preserves_value_types():
+    async with Cache("locmem://native?serializer=pickle") as cache:
+        await cache.set("test", {"hello": ("world", 1)})
+        assert await cache.get("test") == {"hello": ("world", 1)}
@@ -0,0 +1,154 @@
+# pylint: disable=protected-access
+import asyncio
+import threading
+
+import pytest
+
+from caches import Cache
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "cache.snapshot")
+
+
+@pytest.mark.asyncio
+async def test_keys_are_restored_from_snapshot(path):
+    async with Cache("locmem://snapshot") as cache:
+        await cache.set_many({"str": "Ok!", "list": [1, 2], "dict": {"a": 1}})
+        await cache._backend.snapshot(path)
+
+    async with Cache("locmem://snapshot") as cache:
+        await cache._backend.restore(path)
+        assert await cache.get_many(["str", "list", "dict"]) == {
+            "str": "Ok!",
+            "list": [1, 2],
+            "dict": {"a": 1},
+        }
+
+
+@pytest.mark.asyncio
+async def test_bytes_values_are_restored_from_snapshot(path):
+    async with Cache("locmem://snapshot", serializer="pickle") as cache:
+        await cache.set("test", ("hello", {1, 2}))
+        await cache._backend.snapshot(path)
+
+    async with Cache("locmem://snapshot", serializer="pickle") as cache:
+        await cache._backend.restore(path)
+        assert await cache.get("test") == ("hello", {1, 2})
+
+
+@pytest.mark.asyncio
+async def test_objects_stored_without_serialization_are_restored_from_snapshot(path):
+    async with Cache("locmem://snapshot", serializer="none") as cache:
+        await cache.set_many(
+            {"point": Point(1, 2), "text": "Ok!", "lock": threading.Lock()}
+        )
+        await cache._backend.snapshot(path)
+
+    async with Cache("locmem://snapshot", serializer="none") as cache:
+        await cache._backend.restore(path)
+        point = await cache.get("point")
+        assert (point.x, point.y) == (1, 2)
+        assert await cache.get("text") == "Ok!"
+        # Objects that can't be pickled are skipped
+        assert await cache.get("lock") is None
+
+
+@pytest.mark.asyncio
+async def test_keys_keep_their_ttl_after_restore(path):
+    async with Cache("locmem://snapshot") as cache:
+        await cache.set("test", "Ok!", ttl=2)
+        await cache._backend.snapshot(path)
+
+    async with Cache("locmem://snapshot") as cache:
+        await cache._backend.restore(path)
+        assert await cache.get("test") == "Ok!"
+        await asyncio.sleep(3)
+        assert await cache.get("test") is None
+
+
+@pytest.mark.asyncio
+async def test_expired_keys_are_not_restored(path):
+    async with Cache("locmem://snapshot") as cache:
+        await cache.set("test", "Ok!", ttl=1)
+        await cache.set("other", "Ok!")
+        await cache._backend.snapshot(path)
+
+    await asyncio.sleep(2)
+    async with Cache("locmem://snapshot") as cache:
+        await cache._backend.restore(path)
+        assert await cache.get("test") is None
+        assert await cache.get("other") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_restore_doesnt_overwrite_keys_set_in_cache(path):
+    async with Cache("locmem://snapshot") as cache:
+        await cache.set_many({"test": "Old", "other": "Ok!"})
+        await cache._backend.snapshot(path)
+
+    async with Cache("locmem://snapshot") as cache:
+        await cache.set("test", "New")
+        await cache._backend.restore(path)
+        assert await cache.get_many(["test", "other"]) == {
+            "test": "New",
+            "other": "Ok!",
+        }
+
+
+@pytest.mark.asyncio
+async def test_restore_respects_cache_size_limits(path):
+    async with Cache("locmem://snapshot") as cache:
+        await cache.set_many({str(i): i for i in range(10)})
+        await cache._backend.snapshot(path)
+
+    async with Cache("locmem://snapshot", max_entries=5) as cache:
+        await cache._backend.restore(path)
+        assert len(cache._backend._caches["snapshot"]) == 5
+        assert await cache.get("9") == 9
+
+
+@pytest.mark.asyncio
+async def test_incomplete_record_at_end_of_snapshot_is_ignored(path):
+    async with Cache("locmem://snapshot") as cache:
+        await cache.set_many({"test": "Ok!", "other": "a" * 100})
+        await cache._backend.snapshot(path)
+
+    with open(path, "rb+") as snapshot:
+        snapshot.truncate(len(snapshot.read()) - 10)
+
+    async with Cache("locmem://snapshot") as cache:
+        await cache._backend.restore(path)
+        assert await cache.get_many(["test", "other"]) == {"test": "Ok!", "other": None}
+
+
+@pytest.mark.asyncio
+async def test_restore_errors_for_file_that_is_not_snapshot(path):
+    with open(path, "wb") as snapshot:
+        snapshot.write(b"hello world")
+
+    async with Cache("locmem://snapshot") as cache:
+        with pytest.raises(ValueError):
+            await cache._backend.restore(path)
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_written_on_disconnect_and_restored_on_connect(path):
+    async with Cache("locmem://snapshot", snapshot=path) as cache:
+        await cache.set("test", "Ok!")
+
+    async with Cache("locmem://snapshot", snapshot=path) as cache:
+        assert await cache.get("test") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_cache_connects_if_snapshot_file_doesnt_exist(path):
+    async with Cache("locmem://snapshot", snapshot=path) as cache:
+        assert await cache.get("test") is None
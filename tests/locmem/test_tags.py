@@ -0,0 +1,116 @@
+# pylint: disable=protected-access
+import asyncio
+
+import pytest
+
+from caches import Cache
+
+
+@pytest.mark.asyncio
+async def test_key_set_with_tag_is_deleted_when_tag_is_invalidated(cache):
+    await cache.set("test", "Ok!", tags=["users"])
+    await cache.invalidate_tags(["users"])
+    assert await cache.get("test") is None
+
+
+@pytest.mark.asyncio
+async def test_key_set_with_many_tags_is_deleted_when_any_tag_is_invalidated(cache):
+    await cache.set("test", "Ok!", tags=["users", "posts"])
+    await cache.invalidate_tags(["posts"])
+    assert await cache.get("test") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidating_tag_deletes_all_keys_set_with_it(cache):
+    await cache.set("test", "Ok!", tags=["users"])
+    await cache.set("test2", "Ok!", tags=["users"], version=2)
+    await cache.invalidate_tags(["users"])
+    assert await cache.get("test") is None
+    assert await cache.get("test2", version=2) is None
+
+
+@pytest.mark.asyncio
+async def test_invalidating_tag_keeps_keys_set_with_other_tags(cache):
+    await cache.set("test", "Ok!", tags=["users"])
+    await cache.set("test2", "Ok!", tags=["posts"])
+    await cache.set("test3", "Ok!")
+    await cache.invalidate_tags(["users"])
+    assert await cache.get("test2") == "Ok!"
+    assert await cache.get("test3") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_key_set_with_tag_after_invalidation_is_kept(cache):
+    await cache.set("test", "Ok!", tags=["users"])
+    await cache.invalidate_tags(["users"])
+    await cache.set("test", "Ok!", tags=["users"])
+    assert await cache.get("test") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_key_set_with_tag_expires_after_ttl(cache):
+    await cache.set("test", "Ok!", ttl=1, tags=["users"])
+    await asyncio.sleep(2)
+    assert await cache.get("test") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidating_unknown_tag_does_nothing(cache):
+    await cache.set("test", "Ok!", tags=["users"])
+    await cache.invalidate_tags(["posts"])
+    assert await cache.get("test") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_tags_are_removed_when_cache_is_cleared(cache):
+    await cache.set("test", "Ok!", tags=["users"])
+    await cache.clear()
+    await cache.set("test", "Ok!")
+    await cache.invalidate_tags(["users"])
+    assert await cache.get("test") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_key_set_again_without_tags_is_kept_when_tag_is_invalidated(cache):
+    await cache.set("test", "Ok!", tags=["users"])
+    await cache.set("test", "Updated")
+    await cache.invalidate_tags(["users"])
+    assert await cache.get("test") == "Updated"
+
+
+@pytest.mark.asyncio
+async def test_key_set_again_with_other_tags_is_kept_when_old_tag_is_invalidated(cache):
+    await cache.set("test", "Ok!", tags=["users"])
+    await cache.set("test", "Updated", tags=["posts"])
+    await cache.invalidate_tags(["users"])
+    assert await cache.get("test") == "Updated"
+    await cache.invalidate_tags(["posts"])
+    assert await cache.get("test") is None
+
+
+@pytest.mark.asyncio
+async def test_deleted_key_is_removed_from_its_tags(cache):
+    await cache.set("test", "Ok!", tags=["users", "posts"])
+    await cache.delete("test")
+    assert not cache._backend._tags["0"]
+    assert not cache._backend._key_tags["0"]
+
+
+@pytest.mark.asyncio
+async def test_expired_key_is_removed_from_its_tags():
+    async with Cache("locmem://tags", expiry_interval=0) as cache:
+        await cache.set("test", "Ok!", ttl=1, tags=["users"])
+        await asyncio.sleep(2)
+        cache._backend._remove_expired(10)
+        assert not cache._backend._tags["tags"]
+        assert not cache._backend._key_tags["tags"]
+
+
+@pytest.mark.asyncio
+async def test_evicted_keys_are_removed_from_their_tags():
+    async with Cache("locmem://tags?max_entries=10") as cache:
+        for i in range(1000):
+            await cache.set(str(i), i, tags=["numbers", f"number:{i}"])
+        assert len(cache._backend._key_tags["tags"]) == 10
+        assert len(cache._backend._tags["tags"]) == 11
+        assert len(cache._backend._tags["tags"][cache.make_tag_key("numbers")]) == 10
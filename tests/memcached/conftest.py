@@ -0,0 +1,23 @@
+import pytest
+
+from caches import Cache
+
+from .fakememcached import FakeMemcached
+
+
+@pytest.fixture
+async def server():
+    obj = FakeMemcached()
+    await obj.start()
+    yield obj
+    await obj.stop()
+
+
+@pytest.fixture
+async def cache(server):
+    obj = Cache(server.url)
+    await obj.connect()
+    await obj.clear()
+    yield obj
+    await obj.clear()
+    await obj.disconnect()
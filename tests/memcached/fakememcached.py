@@ -0,0 +1,158 @@
+"""Memcached stand-in for tests, implementing subset of text protocol used by
+memcached backend."""
+import asyncio
+from itertools import count
+from time import time
+from typing import Dict, List, Optional
+
+MAX_RELATIVE_TTL = 60 * 60 * 24 * 30
+
+
+class Item:
+    def __init__(self, data: bytes, flags: int, exptime: int, cas: int):
+        self.data = data
+        self.flags = flags
+        self.expires = self.get_expires(exptime)
+        self.cas = cas
+
+    @staticmethod
+    def get_expires(exptime: int) -> Optional[float]:
+        if exptime == 0:
+            return None
+        if exptime > MAX_RELATIVE_TTL:
+            return float(exptime)
+        return time() + exptime
+
+
+class FakeMemcached:
+    def __init__(self):
+        self.items: Dict[bytes, Item] = {}
+        self.commands: List[bytes] = []
+        self.port = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._cas = count(1)
+
+    @property
+    def url(self) -> str:
+        return f"memcached://127.0.0.1:{self.port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    def get_item(self, key: bytes) -> Optional[Item]:
+        item = self.items.get(key)
+        if item and item.expires is not None and item.expires <= time():
+            del self.items[key]
+            return None
+        return item
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self.commands.append(line.split()[0])
+                writer.write(await self._execute(line.split(), reader))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _execute(self, args: List[bytes], reader: asyncio.StreamReader) -> bytes:
+        # pylint: disable=too-many-return-statements
+        command = args[0]
+        if command in (b"get", b"gets"):
+            return self._get(args[1:], command == b"gets")
+        if command == b"gat":
+            item = self.get_item(args[2])
+            if item:
+                item.expires = Item.get_expires(int(args[1]))
+            return self._get(args[2:], False)
+        if command in (b"set", b"add", b"cas"):
+            data = (await reader.readexactly(int(args[4]) + 2))[:-2]
+            return self._store(command, args, data)
+        if command == b"delete":
+            return b"DELETED\r\n" if self.items.pop(args[1], None) else b"NOT_FOUND\r\n"
+        if command in (b"incr", b"decr"):
+            return self._incr(command, args[1], int(args[2]))
+        if command == b"touch":
+            item = self.get_item(args[1])
+            if not item:
+                return b"NOT_FOUND\r\n"
+            item.expires = Item.get_expires(int(args[2]))
+            return b"TOUCHED\r\n"
+        if command == b"flush_all":
+            self.items.clear()
+            return b"OK\r\n"
+        if command == b"mg":
+            return self._meta_get(args[1])
+        if command == b"ms":
+            data = (await reader.readexactly(int(args[2]) + 2))[:-2]
+            return self._meta_set(args, data)
+        return b"ERROR\r\n"
+
+    def _get(self, keys: List[bytes], with_cas: bool) -> bytes:
+        reply = b""
+        for key in keys:
+            item = self.get_item(key)
+            if item:
+                reply += b"VALUE %s %d %d" % (key, item.flags, len(item.data))
+                if with_cas:
+                    reply += b" %d" % item.cas
+                reply += b"\r\n" + item.data + b"\r\n"
+        return reply + b"END\r\n"
+
+    def _store(self, command: bytes, args: List[bytes], data: bytes) -> bytes:
+        key = args[1]
+        item = self.get_item(key)
+        if command == b"add" and item:
+            return b"NOT_STORED\r\n"
+        if command == b"cas":
+            if not item:
+                return b"NOT_FOUND\r\n"
+            if item.cas != int(args[5]):
+                return b"EXISTS\r\n"
+        self.items[key] = Item(data, int(args[2]), int(args[3]), next(self._cas))
+        return b"STORED\r\n"
+
+    def _incr(self, command: bytes, key: bytes, delta: int) -> bytes:
+        item = self.get_item(key)
+        if not item:
+            return b"NOT_FOUND\r\n"
+        if not item.data.strip().isdigit():
+            return b"CLIENT_ERROR cannot increment or decrement non-numeric value\r\n"
+
+        value = int(item.data)
+        value = value + delta if command == b"incr" else max(value - delta, 0)
+        item.data = b"%d" % value
+        item.cas = next(self._cas)
+        return item.data + b"\r\n"
+
+    def _meta_get(self, key: bytes) -> bytes:
+        item = self.get_item(key)
+        if not item:
+            return b"EN\r\n"
+        ttl = -1 if item.expires is None else max(int(item.expires - time()), 1)
+        header = b"VA %d f%d c%d t%d" % (len(item.data), item.flags, item.cas, ttl)
+        return header + b"\r\n" + item.data + b"\r\n"
+
+    def _meta_set(self, args: List[bytes], data: bytes) -> bytes:
+        key = args[1]
+        flags = {arg[:1]: int(arg[1:]) for arg in args[3:]}
+        item = self.get_item(key)
+        if b"C" in flags:
+            if not item:
+                return b"NF\r\n"
+            if item.cas != flags[b"C"]:
+                return b"EX\r\n"
+        self.items[key] = Item(
+            data, flags.get(b"F", 0), flags.get(b"T", 0), next(self._cas)
+        )
+        return b"HD\r\n"
@@ -0,0 +1,50 @@
+# pylint: disable=protected-access
+import pytest
+
+from caches import Cache
+from caches.backends.memcached import MemcachedBackend
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_if_more_than_one_connection_is_opened(server):
+    cache = Cache(server.url)
+    await cache.connect()
+    with pytest.raises(AssertionError):
+        await cache.connect()
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_if_nonexistant_connection_is_closed(server):
+    cache = Cache(server.url)
+    with pytest.raises(AssertionError):
+        await cache.disconnect()
+
+
+def test_backend_reads_server_address_from_url():
+    backend = MemcachedBackend("memcached://10.0.0.1:11222")
+    assert backend._host == "10.0.0.1"
+    assert backend._port == 11222
+
+
+def test_backend_uses_default_server_address():
+    backend = MemcachedBackend("memcached://")
+    assert backend._host == "localhost"
+    assert backend._port == 11211
+
+
+def test_connections_pool_size_can_be_set_in_url():
+    backend = MemcachedBackend("memcached://localhost?minsize=2&maxsize=5")
+    assert backend._minsize == 2
+    assert backend._maxsize == 5
+
+
+def test_connections_pool_size_kwarg_overrides_value_from_url():
+    backend = MemcachedBackend("memcached://localhost?minsize=2&maxsize=5", maxsize=20)
+    assert backend._minsize == 2
+    assert backend._maxsize == 20
+
+
+def test_backend_errors_if_null_serializer_is_set():
+    with pytest.raises(ValueError):
+        MemcachedBackend("memcached://localhost?serializer=none")
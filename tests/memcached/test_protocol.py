@@ -0,0 +1,190 @@
+# pylint: disable=protected-access
+import asyncio
+
+import pytest
+
+from caches import Cache
+from caches.backends.memcached import MemcachedBackend, MemcachedError
+
+
+def test_key_with_whitespace_is_replaced_with_its_hash():
+    key = MemcachedBackend._make_key("hello world")
+    assert key.startswith("sha1:")
+    assert " " not in key
+
+
+def test_too_long_key_is_replaced_with_its_hash():
+    assert len(MemcachedBackend._make_key("a" * 300)) < 250
+
+
+def test_valid_key_is_not_changed():
+    assert MemcachedBackend._make_key(":1:test") == ":1:test"
+
+
+def test_ttl_longer_than_30_days_is_converted_to_timestamp():
+    ttl = 60 * 60 * 24 * 60
+    assert MemcachedBackend._make_exptime(ttl) > ttl
+    assert MemcachedBackend._make_exptime(60) == 60
+    assert MemcachedBackend._make_exptime(None) == 0
+
+
+@pytest.mark.asyncio
+async def test_keys_with_invalid_characters_can_be_set_and_get(cache):
+    await cache.set("hello world", "Ok!")
+    await cache.set_many({"a" * 300: 1, "new\nline": 2})
+    assert await cache.get("hello world") == "Ok!"
+    assert await cache.get_many(["a" * 300, "new\nline"]) == {
+        "a" * 300: 1,
+        "new\nline": 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_key_with_long_ttl_is_set(cache):
+    await cache.set("test", "Ok!", ttl=60 * 60 * 24 * 60)
+    assert await cache.get("test") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_many_keys_are_read_with_get_command_for_every_100_keys(cache, server):
+    keys = [str(i) for i in range(250)]
+    await cache.set_many({key: key for key in keys})
+
+    server.commands.clear()
+    assert await cache.get_many(keys) == {key: key for key in keys}
+    assert server.commands == [b"get", b"get", b"get"]
+
+
+@pytest.mark.asyncio
+async def test_int_value_is_increased_with_incr_command(cache, server):
+    await cache.set("test", 10)
+    server.commands.clear()
+    assert await cache.incr("test", 5) == 15
+    assert server.commands == [b"incr"]
+
+
+@pytest.mark.asyncio
+async def test_int_value_is_decreased_with_cas(cache, server):
+    await cache.set("test", 10)
+    server.commands.clear()
+    assert await cache.decr("test", 2) == 8
+    assert server.commands == [b"mg", b"ms"]
+
+
+@pytest.mark.asyncio
+async def test_float_value_is_increased_with_cas_keeping_its_ttl(cache, server):
+    await cache.set("test", 10.0, ttl=1)
+    server.commands.clear()
+    assert await cache.incr("test", 2.5) == 12.5
+    assert server.commands == [b"mg", b"ms"]
+    await asyncio.sleep(2)
+    assert await cache.get("test") is None
+
+
+@pytest.mark.asyncio
+async def test_value_is_decreased_with_cas_below_zero(cache):
+    await cache.set("test", 1)
+    assert await cache.decr("test", 2.0) == -1.0
+
+
+@pytest.mark.asyncio
+async def test_int_value_is_decreased_below_zero(cache):
+    await cache.set("test", 3)
+    assert await cache.decr("test", 5) == -2
+    assert await cache.get("test") == -2
+    assert await cache.incr("test", 5) == 3
+
+
+@pytest.mark.asyncio
+async def test_value_stored_by_msgpack_as_digit_is_increased_with_cas(server):
+    cache = Cache(server.url, serializer="msgpack")
+    await cache.connect()
+    await cache.set("test", 48)
+    server.commands.clear()
+    assert await cache.incr("test") == 49
+    assert await cache.get("test") == 49
+    assert b"incr" not in server.commands
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_value_stored_as_bytes_can_be_increased(server):
+    cache = Cache(server.url, serializer="pickle")
+    await cache.connect()
+    await cache.set("test", 10)
+    assert await cache.incr("test") == 11
+    assert await cache.get("test") == 11
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_value_stored_as_bytes_is_returned_as_bytes_to_serializer(server):
+    cache = Cache(server.url, serializer="pickle")
+    await cache.connect()
+    await cache.set("test", ("hello", {1, 2}))
+    assert await cache.get("test") == ("hello", {1, 2})
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_compare_and_set_fails_if_key_changed_after_it_was_read(cache, server):
+    await cache.set("test", "Ok!")
+    _, _, cas = await cache._backend._get_item("gets", cache.make_key("test"))
+    await cache.set("test", "Changed")
+
+    request = cache._backend._storage_command(
+        "cas", cache.make_key("test"), "Updated", None, cas
+    )
+    assert await cache._backend._execute(request, cache._backend._read_lines(1)) == [
+        b"EXISTS"
+    ]
+    assert await cache.get("test") == "Changed"
+    assert server.items
+
+
+@pytest.mark.asyncio
+async def test_concurrent_commands_share_limited_pool_of_connections(server):
+    cache = Cache(server.url, maxsize=2)
+    await cache.connect()
+    await asyncio.gather(*[cache.set(str(i), i) for i in range(50)])
+    results = await asyncio.gather(*[cache.get(str(i)) for i in range(50)])
+    assert results == list(range(50))
+    assert cache._backend._pool._size <= 2
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_connection_is_discarded_after_error_reply(cache):
+    pool = cache._backend._pool
+    with pytest.raises(MemcachedError):
+        await cache._backend._execute(b"unknown\r\n", cache._backend._read_lines(1))
+    assert pool._size == 0
+    await cache.set("test", "Ok!")
+    assert await cache.get("test") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_value_is_increased_with_cas_again_if_it_changed_after_read(
+    cache, server, monkeypatch
+):
+    await cache.set("test", 1.0)
+    meta_set = server._meta_set
+    replies = [b"EX\r\n"]
+
+    def fake_meta_set(args, data):
+        return replies.pop() if replies else meta_set(args, data)
+
+    monkeypatch.setattr(server, "_meta_set", fake_meta_set)
+    server.commands.clear()
+    assert await cache.incr("test", 0.5) == 1.5
+    assert server.commands == [b"mg", b"ms", b"mg", b"ms"]
+
+
+@pytest.mark.asyncio
+async def test_increasing_with_cas_raises_error_if_value_is_not_stored(
+    cache, server, monkeypatch
+):
+    await cache.set("test", 1.0)
+    monkeypatch.setattr(server, "_meta_set", lambda args, data: b"NS\r\n")
+    with pytest.raises(MemcachedError):
+        await cache.incr("test", 0.5)
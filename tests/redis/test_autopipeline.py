@@ -0,0 +1,76 @@
+# pylint: disable=protected-access
+import asyncio
+
+import pytest
+
+from caches import Cache
+
+
+@pytest.fixture
+async def cache():
+    obj = Cache("redis://localhost:6379/1?autopipeline=true")
+    await obj.connect()
+    await obj.clear()
+    yield obj
+    await obj.clear()
+    await obj.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_set_key_can_be_get(cache):
+    await cache.set("test", "Ok!")
+    assert await cache.get("test") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_many_concurrent_commands_return_their_results(cache):
+    await asyncio.gather(*[cache.set(str(i), i) for i in range(100)])
+    results = await asyncio.gather(*[cache.get(str(i)) for i in range(100)])
+    assert results == list(range(100))
+
+
+@pytest.mark.asyncio
+async def test_commands_executed_in_same_loop_iteration_share_pipeline(cache):
+    backend = cache._backend
+    first = backend._execute("PING")
+    pipeline = backend._pipeline
+    second = backend._execute("PING")
+    assert backend._pipeline is pipeline
+    assert await asyncio.gather(first, second) == [b"PONG", b"PONG"]
+    assert backend._pipeline is None
+
+
+@pytest.mark.asyncio
+async def test_failed_command_raises_error_only_for_its_caller(cache):
+    await cache.set("test", "Ok!")
+    results = await asyncio.gather(
+        cache.incr("test"), cache.get("test"), return_exceptions=True
+    )
+    assert isinstance(results[0], Exception)
+    assert results[1] == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_disconnect_waits_for_pending_commands():
+    cache = Cache("redis://localhost:6379/1?autopipeline=true")
+    await cache.connect()
+    command = asyncio.ensure_future(cache.set("test", "Ok!"))
+    await asyncio.sleep(0)
+    await cache.disconnect()
+    await command
+
+    async with Cache("redis://localhost:6379/1") as other_cache:
+        assert await other_cache.get("test") == "Ok!"
+        await other_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_scripts_are_executed_in_pipeline(cache):
+    await cache.set_many({"test": 1, "hello": "world"})
+    await cache._backend._pool.execute("SCRIPT", "FLUSH")
+    results = await asyncio.gather(
+        cache.incr("test"),
+        cache.compare_and_set("hello", "world", "Ok!"),
+        cache.get_and_touch("hello", ttl=10),
+    )
+    assert results == [2, True, "Ok!"]
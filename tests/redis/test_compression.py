@@ -0,0 +1,53 @@
+import pytest
+
+from caches import Cache
+
+VALUE = {"html": "<p>Hello world!</p>" * 200}
+
+
+@pytest.fixture
+async def cache():
+    obj = Cache("redis://localhost:6379/1?compression=zlib&compression_threshold=500")
+    await obj.connect()
+    await obj.clear()
+    yield obj
+    await obj.clear()
+    await obj.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_large_value_is_stored_compressed(cache):
+    await cache.set("test", VALUE)
+    # pylint: disable=protected-access
+    stored = await cache._backend._pool.execute("GET", cache.make_key("test"))
+    assert stored.startswith(b"\x01")
+    assert len(stored) < len(str(VALUE))
+    assert await cache.get("test") == VALUE
+
+
+@pytest.mark.asyncio
+async def test_small_value_is_stored_uncompressed(cache):
+    await cache.set("test", "Ok!")
+    # pylint: disable=protected-access
+    assert await cache._backend._pool.execute("GET", cache.make_key("test")) == b'"Ok!"'
+    assert await cache.get("test") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_many_large_values_are_compressed(cache):
+    await cache.set_many({"test": VALUE, "other": "Ok!"})
+    assert await cache.get_many(["test", "other"]) == {"test": VALUE, "other": "Ok!"}
+
+
+@pytest.mark.asyncio
+async def test_compressed_value_is_read_by_cache_without_compression(cache):
+    await cache.set("test", VALUE)
+    async with Cache("redis://localhost:6379/1") as other_cache:
+        assert await other_cache.get("test") == VALUE
+
+
+@pytest.mark.asyncio
+async def test_uncompressed_value_is_read_by_cache_with_compression(cache):
+    async with Cache("redis://localhost:6379/1") as other_cache:
+        await other_cache.set("test", VALUE)
+    assert await cache.get("test") == VALUE
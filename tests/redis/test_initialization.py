@@ -61,3 +61,8 @@ async def test_connections_pool_maxsize_kwarg_overrides_value_from_url():
     cache = RedisBackend("redis://localhost/1?maxsize=2", maxsize=3)
     kwargs = cache._get_connection_kwargs()
     assert kwargs["maxsize"] == 3
+
+
+def test_backend_errors_if_values_are_not_serialized():
+    with pytest.raises(ValueError):
+        RedisBackend("redis://localhost/1?serializer=none")
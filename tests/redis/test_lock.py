@@ -0,0 +1,123 @@
+# pylint: disable=protected-access
+import asyncio
+
+import pytest
+
+from caches import Cache
+from caches.backends.redis import LOCK_PREFIX
+
+URL = "redis://localhost:6379/1?lock=true&lock_poll_interval=0.01"
+
+
+@pytest.fixture
+async def cache():
+    obj = Cache(URL)
+    await obj.connect()
+    await obj.clear()
+    yield obj
+    await obj.clear()
+    await obj.disconnect()
+
+
+@pytest.fixture
+async def other_cache():
+    obj = Cache(URL)
+    await obj.connect()
+    yield obj
+    await obj.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_lock_sets_default_value(cache):
+    assert await cache.get_or_set("test", "Ok!") == "Ok!"
+    assert await cache.get("test") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_lock_releases_lock(cache):
+    await cache.get_or_set("test", "Ok!")
+    lock_key = LOCK_PREFIX + cache.make_key("test")
+    assert not await cache._backend._pool.execute("EXISTS", lock_key)
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_lock_evaluates_default_once_for_many_clients(
+    cache, other_cache
+):
+    calls = []
+
+    async def default():
+        calls.append(1)
+        await asyncio.sleep(0.2)
+        return "Ok!"
+
+    results = await asyncio.gather(
+        cache.get_or_set("test", default), other_cache.get_or_set("test", default)
+    )
+    assert results == ["Ok!", "Ok!"]
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_lock_releases_lock_if_default_raises_error(cache):
+    async def default():
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        await cache.get_or_set("test", default)
+
+    lock_key = LOCK_PREFIX + cache.make_key("test")
+    assert not await cache._backend._pool.execute("EXISTS", lock_key)
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_lock_evaluates_default_if_lock_is_not_released():
+    async with Cache(URL + "&lock_timeout=0.2") as cache:
+        lock_key = LOCK_PREFIX + cache.make_key("test")
+        await cache._backend._pool.execute("SET", lock_key, "other", "PX", 10000)
+        assert await cache.get_or_set("test", "Ok!") == "Ok!"
+        assert await cache._backend._pool.execute("GET", lock_key) == b"other"
+        await cache._backend._pool.execute("DEL", lock_key)
+        await cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_lock_takes_over_expired_lock():
+    async with Cache(URL + "&lock_timeout=5") as cache:
+        lock_key = LOCK_PREFIX + cache.make_key("test")
+        await cache._backend._pool.execute("SET", lock_key, "other", "PX", 100)
+        assert await cache.get_or_set("test", "Ok!") == "Ok!"
+        assert not await cache._backend._pool.execute("EXISTS", lock_key)
+        await cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_lock_key_is_not_iterated_as_cache_key():
+    async with Cache(URL + "&lock_timeout=5") as cache:
+        lock_key = LOCK_PREFIX + cache.make_key("test")
+        await cache._backend._pool.execute("SET", lock_key, "other", "PX", 10000)
+        await cache.set("other", "Ok!")
+        assert [key async for key in cache.iter_keys()] == ["other"]
+        assert [item async for item in cache.iter_items()] == [("other", "Ok!")]
+        await cache._backend._pool.execute("DEL", lock_key)
+        await cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_lock_closes_coroutine_default_of_waiting_client(
+    cache, other_cache
+):
+    async def slow_default():
+        await asyncio.sleep(0.2)
+        return "Ok!"
+
+    async def default():
+        return "New"
+
+    coroutine = default()
+    results = await asyncio.gather(
+        cache.get_or_set("test", slow_default),
+        other_cache.get_or_set("test", coroutine),
+    )
+    assert results == ["Ok!", "Ok!"]
+    assert coroutine.cr_frame is None
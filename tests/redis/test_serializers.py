@@ -0,0 +1,82 @@
+# pylint: disable=protected-access
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from caches import Cache
+
+
+@pytest.fixture
+async def cache():
+    obj = Cache("redis://localhost:6379/1", serializer="pickle")
+    await obj.connect()
+    await obj.clear()
+    yield obj
+    await obj.clear()
+    await obj.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_set_key_can_be_tuple(cache):
+    await cache.set("test", ("hello", "world"))
+    assert await cache.get("test") == ("hello", "world")
+
+
+@pytest.mark.asyncio
+async def test_set_key_can_be_datetime(cache):
+    value = datetime(2020, 1, 1, 12, 30)
+    await cache.set("test", value)
+    assert await cache.get("test") == value
+
+
+@pytest.mark.asyncio
+async def test_many_keys_can_be_set_and_get(cache):
+    await cache.set_many({"test": b"bytes", "other": {1, 2}})
+    assert await cache.get_many(["test", "other"]) == {
+        "test": b"bytes",
+        "other": {1, 2},
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("serializer", ["msgpack", "pickle"])
+async def test_key_can_be_increased_and_decreased_with_binary_serializer(serializer):
+    async with Cache("redis://localhost:6379/1", serializer=serializer) as cache:
+        try:
+            await cache.set("test", 1)
+            assert await cache.incr("test", 2) == 3
+            assert await cache.decr("test", 5) == -2
+            assert await cache.get("test") == -2
+            assert await cache.incr("test", 0.5) == -1.5
+            assert await cache.get("test") == -1.5
+        finally:
+            await cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_increasing_key_with_binary_serializer_keeps_its_ttl(cache):
+    await cache.set("test", 1, ttl=100)
+    await cache.incr("test")
+    assert 0 < await cache._backend._pool.execute("TTL", cache.make_key("test")) <= 100
+
+
+@pytest.mark.asyncio
+async def test_many_keys_can_be_increased_with_binary_serializer(cache):
+    await cache.set_many({"test": 1, "other": 10})
+    assert await cache.incr_many({"test": 1, "other": -2}) == {"test": 2, "other": 8}
+
+
+@pytest.mark.asyncio
+async def test_increasing_missing_key_with_binary_serializer_raises_value_error(cache):
+    await cache.set("test", 1)
+    with pytest.raises(ValueError):
+        await cache.incr_many({"test": 1, "other": 1})
+    assert await cache.get("test") == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_increases_with_binary_serializer_are_not_lost(cache):
+    await cache.set("test", 0)
+    await asyncio.gather(*[cache.incr("test") for _ in range(20)])
+    assert await cache.get("test") == 20
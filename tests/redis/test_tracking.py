@@ -0,0 +1,132 @@
+# pylint: disable=protected-access
+import asyncio
+
+import aioredis
+import pytest
+
+from caches import Cache
+from caches.backends.redis import RedisBackend
+
+
+async def _server_supports_tracking():
+    connection = await aioredis.create_connection("redis://localhost/1")
+    try:
+        await connection.execute("CLIENT", "TRACKING", "OFF")
+        return True
+    except aioredis.ReplyError:
+        return False
+    finally:
+        connection.close()
+        await connection.wait_closed()
+
+
+@pytest.fixture
+async def cache():
+    if not await _server_supports_tracking():
+        pytest.skip("Redis server doesn't support client side caching")
+
+    obj = Cache("redis://localhost:6379/1?tracking=default")
+    await obj.connect()
+    await obj.clear()
+    yield obj
+    await obj.clear()
+    await obj.disconnect()
+
+
+@pytest.fixture
+async def other_cache():
+    obj = Cache("redis://localhost:6379/1")
+    await obj.connect()
+    yield obj
+    await obj.disconnect()
+
+
+def test_tracking_mode_can_be_set_in_url():
+    assert RedisBackend("redis://localhost/1?tracking=bcast")._tracking == "broadcast"
+    assert RedisBackend("redis://localhost/1?tracking=true")._tracking == "default"
+
+
+def test_tracking_is_disabled_by_default():
+    assert RedisBackend("redis://localhost/1")._tracking is None
+
+
+def test_backend_errors_for_unsupported_tracking_mode():
+    with pytest.raises(ValueError):
+        RedisBackend("redis://localhost/1?tracking=invalid")
+
+
+def test_invalidation_message_drops_local_values():
+    backend = RedisBackend("redis://localhost/1", tracking="default")
+    backend._remember("test", b'"Ok!"')
+    backend._remember("other", b'"Ok!"')
+    backend._invalidate([b"test"])
+    assert list(backend._local) == ["other"]
+
+
+def test_empty_invalidation_message_drops_all_local_values():
+    backend = RedisBackend("redis://localhost/1", tracking="default")
+    backend._remember("test", b'"Ok!"')
+    backend._pending["other"] = object()
+    backend._invalidate(None)
+    assert not backend._local
+    assert not backend._pending
+
+
+def test_number_of_local_values_is_limited():
+    backend = RedisBackend(
+        "redis://localhost/1", tracking="default", tracking_max_entries=1
+    )
+    backend._remember("test", b'"Ok!"')
+    backend._remember("other", b'"Ok!"')
+    assert list(backend._local) == ["other"]
+
+
+@pytest.mark.asyncio
+async def test_read_value_is_stored_locally(cache, other_cache):
+    await other_cache.set("test", "Ok!")
+    assert await cache.get("test") == "Ok!"
+    assert cache.make_key("test") in cache._backend._local
+
+
+@pytest.mark.asyncio
+async def test_local_value_is_invalidated_when_key_is_changed_by_other_client(
+    cache, other_cache
+):
+    await other_cache.set("test", "Ok!")
+    assert await cache.get("test") == "Ok!"
+    await other_cache.set("test", "Changed")
+    await asyncio.sleep(0.1)
+    assert await cache.get("test") == "Changed"
+
+
+@pytest.mark.asyncio
+async def test_local_value_is_dropped_when_key_is_set(cache):
+    await cache.set("test", "Ok!")
+    assert await cache.get("test") == "Ok!"
+    await cache.set("test", "Changed")
+    assert await cache.get("test") == "Changed"
+
+
+@pytest.mark.asyncio
+async def test_many_read_values_are_stored_locally(cache, other_cache):
+    await other_cache.set_many({"test": "Ok!", "other": "Hello"})
+    assert await cache.get_many(["test", "other", "undefined"]) == {
+        "test": "Ok!",
+        "other": "Hello",
+        "undefined": None,
+    }
+    assert len(cache._backend._local) == 2
+
+
+@pytest.mark.asyncio
+async def test_value_invalidated_while_being_read_is_not_stored_locally():
+    backend = RedisBackend("redis://localhost/1", tracking="default")
+
+    class TrackedConnection:
+        async def execute(self, *_):
+            backend._invalidate([b"test"])
+            return [b'"Ok!"', b'"Hello"']
+
+    backend._tracked = TrackedConnection()
+    assert await backend._get_tracked(["test", "other"]) == [b'"Ok!"', b'"Hello"']
+    assert list(backend._local) == ["other"]
@@ -0,0 +1,23 @@
+import pytest
+
+from caches import Cache
+
+from .fakecluster import FakeCluster
+
+
+@pytest.fixture
+async def cluster():
+    obj = FakeCluster()
+    await obj.start()
+    yield obj
+    await obj.stop()
+
+
+@pytest.fixture
+async def cache(cluster):
+    obj = Cache(cluster.url)
+    await obj.connect()
+    await obj.clear()
+    yield obj
+    await obj.clear()
+    await obj.disconnect()
@@ -0,0 +1,169 @@
+"""Redis Cluster stand-in for tests.
+
+Each node listens on its own port and owns range of hash slots, replying with
+MOVED or ASK redirections to commands for keys from other slots, like Redis
+Cluster does. Commands are executed on single Redis server shared by all nodes,
+so slots can be moved between nodes without migrating keys.
+"""
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import aioredis
+from aioredis.parser import Reader
+
+from caches.backends.rediscluster import CLUSTER_SLOTS, key_slot
+
+KEYLESS_COMMANDS = (b"FLUSHDB", b"PING", b"SCAN", b"SCRIPT")
+MULTI_KEY_COMMANDS = (b"DEL", b"EXISTS", b"MGET", b"UNLINK")
+
+
+def encode_reply(value: Any) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, Exception):
+        return b"-%s\r\n" % str(value).encode("utf-8")
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    return b"*%d\r\n%s" % (len(value), b"".join(encode_reply(item) for item in value))
+
+
+def get_command_keys(command: List[bytes]) -> List[bytes]:
+    name = command[0].upper()
+    if name in KEYLESS_COMMANDS:
+        return []
+    if name in (b"EVAL", b"EVALSHA"):
+        return command[3 : 3 + int(command[2])]
+    if name in MULTI_KEY_COMMANDS:
+        return command[1:]
+    if name == b"MSET":
+        return command[1::2]
+    return command[1:2]
+
+
+class FakeCluster:
+    def __init__(self, nodes: int = 3, upstream: str = "redis://localhost:6379/1"):
+        self.upstream = upstream
+        self.ports: List[int] = []
+        self.servers: List[asyncio.AbstractServer] = []
+        self.slots: List[int] = [
+            i * nodes // CLUSTER_SLOTS for i in range(CLUSTER_SLOTS)
+        ]
+        # Slots being migrated, mapped to node they are migrated to
+        self.migrating: Dict[int, int] = {}
+        self.commands: List[List[bytes]] = []
+        self._nodes = nodes
+
+    @property
+    def url(self) -> str:
+        return "rediscluster://" + ",".join(f"127.0.0.1:{port}" for port in self.ports)
+
+    async def start(self):
+        for node in range(self._nodes):
+            server = await asyncio.start_server(
+                lambda r, w, node=node: self._handle(node, r, w), "127.0.0.1", 0
+            )
+            self.servers.append(server)
+            self.ports.append(server.sockets[0].getsockname()[1])
+
+    async def stop(self):
+        for server in self.servers:
+            server.close()
+            await server.wait_closed()
+
+    def move_slot(self, slot: int, node: int):
+        self.slots[slot] = node
+
+    def get_node(self, key: str) -> int:
+        return self.slots[key_slot(key)]
+
+    def _get_redirect(
+        self, node: int, command: List[bytes], asking: bool
+    ) -> Optional[str]:
+        slots = {key_slot(key) for key in get_command_keys(command)}
+        if len(slots) > 1:
+            return "CROSSSLOT Keys in request don't hash to the same slot"
+        if not slots:
+            return None
+
+        slot = slots.pop()
+        owner = self.slots[slot]
+        if slot in self.migrating:
+            target = self.migrating[slot]
+            if node == owner:
+                return f"ASK {slot} 127.0.0.1:{self.ports[target]}"
+            if node == target and asking:
+                return None
+        if node != owner:
+            return f"MOVED {slot} 127.0.0.1:{self.ports[owner]}"
+        return None
+
+    def _get_cluster_slots(self) -> List[Any]:
+        ranges = []
+        start = 0
+        for slot in range(1, CLUSTER_SLOTS + 1):
+            if slot == CLUSTER_SLOTS or self.slots[slot] != self.slots[start]:
+                node = self.slots[start]
+                ranges.append(
+                    [
+                        start,
+                        slot - 1,
+                        [b"127.0.0.1", self.ports[node], b"node%d" % node],
+                    ]
+                )
+                start = slot
+        return ranges
+
+    async def _handle(
+        self, node: int, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        upstream = await aioredis.create_connection(self.upstream)
+        parser = Reader()
+        asking = False
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                parser.feed(data)
+                command = parser.gets()
+                while command is not False:
+                    reply, asking = await self._execute(node, upstream, command, asking)
+                    writer.write(encode_reply(reply))
+                    command = parser.gets()
+                await writer.drain()
+        finally:
+            upstream.close()
+            await upstream.wait_closed()
+            writer.close()
+
+    async def _execute(
+        self,
+        node: int,
+        upstream: aioredis.RedisConnection,
+        command: List[bytes],
+        asking: bool,
+    ) -> Any:
+        name = command[0].upper()
+        if name == b"ASKING":
+            return b"OK", True
+        if name == b"CLUSTER" and command[1].upper() == b"SLOTS":
+            return self._get_cluster_slots(), False
+
+        redirect = self._get_redirect(node, command, asking)
+        if redirect:
+            return aioredis.ReplyError(redirect), False
+
+        self.commands.append(command)
+        try:
+            reply = await upstream.execute(*command)
+        except aioredis.ReplyError as error:
+            return error, False
+        if name == b"SCAN":
+            # Nodes share upstream server, so each returns only keys from its slots
+            cursor, keys = reply
+            reply = [cursor, [key for key in keys if self.slots[key_slot(key)] == node]]
+        return reply, False
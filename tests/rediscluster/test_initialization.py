@@ -0,0 +1,68 @@
+# pylint: disable=protected-access
+import pytest
+
+from caches import Cache
+from caches.backends.rediscluster import RedisClusterBackend
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_if_more_than_one_connection_is_opened(cluster):
+    cache = Cache(cluster.url)
+    await cache.connect()
+    with pytest.raises(AssertionError):
+        await cache.connect()
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_if_nonexistant_connection_is_closed(cluster):
+    cache = Cache(cluster.url)
+    with pytest.raises(AssertionError):
+        await cache.disconnect()
+
+
+def test_backend_reads_startup_nodes_from_url():
+    backend = RedisClusterBackend(
+        "rediscluster://:secret@node1:7000,node2,10.0.0.3:7002"
+    )
+    assert backend._startup_nodes == [
+        ("node1", 7000),
+        ("node2", 6379),
+        ("10.0.0.3", 7002),
+    ]
+    assert backend._password == "secret"
+
+
+def test_backend_defaults_to_localhost_startup_node():
+    backend = RedisClusterBackend("rediscluster://")
+    assert backend._startup_nodes == [("localhost", 6379)]
+
+
+def test_backend_errors_if_autopipeline_is_enabled():
+    with pytest.raises(AssertionError):
+        RedisClusterBackend("rediscluster://localhost?autopipeline=true")
+
+
+def test_backend_errors_if_tracking_is_enabled():
+    with pytest.raises(AssertionError):
+        RedisClusterBackend("rediscluster://localhost?tracking=true")
+
+
+@pytest.mark.asyncio
+async def test_backend_reads_slots_map_on_connect(cluster):
+    cache = Cache(cluster.url)
+    await cache.connect()
+    backend = cache._backend
+    assert backend._slots[0] == ("127.0.0.1", cluster.ports[0])
+    assert backend._slots[-1] == ("127.0.0.1", cluster.ports[-1])
+    assert len(backend._get_masters()) == 3
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_backend_connects_using_any_available_startup_node(cluster):
+    cache = Cache(f"rediscluster://127.0.0.1:1,127.0.0.1:{cluster.ports[1]}")
+    await cache.connect()
+    await cache.set("test", "Ok!")
+    assert await cache.get("test") == "Ok!"
+    await cache.disconnect()
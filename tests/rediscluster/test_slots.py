@@ -0,0 +1,81 @@
+# pylint: disable=protected-access
+import pytest
+
+from caches.backends.rediscluster import crc16, key_slot, slot_hash_tag
+
+
+def test_crc16_returns_xmodem_checksum():
+    assert crc16(b"123456789") == 0x31C3
+
+
+def test_key_slot_is_calculated_from_key():
+    assert key_slot("foo") == 12182
+    assert key_slot(b"foo") == 12182
+
+
+def test_key_slot_is_calculated_from_hash_tag():
+    assert key_slot("{user1000}.following") == key_slot("user1000")
+    assert key_slot("{user1000}.followers") == key_slot("{user1000}.following")
+
+
+def test_key_slot_is_calculated_from_whole_key_if_hash_tag_is_empty():
+    assert key_slot("foo{}{bar}") == crc16(b"foo{}{bar}") % 16384
+
+
+@pytest.mark.parametrize(
+    "key", ["foo", "{user1000}.following", "foo{}{bar}", "a}b", '["f", [], {}]']
+)
+def test_slot_hash_tag_stores_other_key_in_same_slot_as_key(key):
+    assert key_slot("other{%s}" % slot_hash_tag(key)) == key_slot(key)
+
+
+@pytest.mark.asyncio
+async def test_slots_map_is_updated_when_node_replies_with_moved(cache, cluster):
+    await cache.set("test", "Ok!")
+    slot = key_slot(cache.make_key("test"))
+    node = (cluster.slots[slot] + 1) % 3
+    cluster.move_slot(slot, node)
+
+    assert await cache.get("test") == "Ok!"
+    assert cache._backend._slots[slot] == ("127.0.0.1", cluster.ports[node])
+
+
+@pytest.mark.asyncio
+async def test_command_is_sent_to_other_node_when_node_replies_with_ask(cache, cluster):
+    await cache.set("test", "Ok!")
+    slot = key_slot(cache.make_key("test"))
+    owner = cluster.slots[slot]
+    cluster.migrating[slot] = (owner + 1) % 3
+
+    assert await cache.get("test") == "Ok!"
+    assert cache._backend._slots[slot] == ("127.0.0.1", cluster.ports[owner])
+
+
+@pytest.mark.asyncio
+async def test_many_keys_are_read_with_single_command_for_each_slot(cache, cluster):
+    keys = [f"{{tag}}:{i}" for i in range(5)] + ["other"]
+    await cache.set_many({key: key for key in keys})
+
+    cluster.commands.clear()
+    assert await cache.get_many(keys) == {key: key for key in keys}
+    assert [command[0] for command in cluster.commands] == [b"MGET", b"MGET"]
+
+
+@pytest.mark.asyncio
+async def test_many_keys_are_set_after_their_slots_have_moved(cache, cluster):
+    keys = [str(i) for i in range(20)]
+    for key in keys:
+        slot = key_slot(cache.make_key(key))
+        cluster.move_slot(slot, (cluster.slots[slot] + 1) % 3)
+
+    await cache.set_many({key: key for key in keys}, ttl=10)
+    assert await cache.get_many(keys) == {key: key for key in keys}
+    await cache.delete_many(keys)
+    assert await cache.get_many(keys) == {key: None for key in keys}
+
+
+@pytest.mark.asyncio
+async def test_script_is_loaded_again_after_script_flush(cache):
+    await cache.set("test", 10)
+    await cache._backend._execute("SCRIPT", "FLUSH")
+    assert await cache.incr("test") == 11
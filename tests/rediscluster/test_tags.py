@@ -0,0 +1,153 @@
+# pylint: disable=protected-access
+import asyncio
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_key_set_with_tag_is_deleted_when_tag_is_invalidated(cache):
+    await cache.set("test", "Ok!", tags=["users"])
+    await cache.invalidate_tags(["users"])
+    assert await cache.get("test") is None
+
+
+@pytest.mark.asyncio
+async def test_key_set_with_many_tags_is_deleted_when_any_tag_is_invalidated(cache):
+    await cache.set("test", "Ok!", tags=["users", "posts"])
+    await cache.invalidate_tags(["posts"])
+    assert await cache.get("test") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidating_tag_deletes_all_keys_set_with_it(cache):
+    await cache.set("test", "Ok!", tags=["users"])
+    await cache.set("test2", "Ok!", tags=["users"], version=2)
+    await cache.invalidate_tags(["users"])
+    assert await cache.get("test") is None
+    assert await cache.get("test2", version=2) is None
+
+
+@pytest.mark.asyncio
+async def test_invalidating_tag_keeps_keys_set_with_other_tags(cache):
+    await cache.set("test", "Ok!", tags=["users"])
+    await cache.set("test2", "Ok!", tags=["posts"])
+    await cache.set("test3", "Ok!")
+    await cache.invalidate_tags(["users"])
+    assert await cache.get("test2") == "Ok!"
+    assert await cache.get("test3") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_key_set_with_tag_after_invalidation_is_kept(cache):
+    await cache.set("test", "Ok!", tags=["users"])
+    await cache.invalidate_tags(["users"])
+    await cache.set("test", "Ok!", tags=["users"])
+    assert await cache.get("test") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_key_set_with_tag_expires_after_ttl(cache):
+    await cache.set("test", "Ok!", ttl=1, tags=["users"])
+    await asyncio.sleep(2)
+    assert await cache.get("test") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidating_unknown_tag_does_nothing(cache):
+    await cache.set("test", "Ok!", tags=["users"])
+    await cache.invalidate_tags(["posts"])
+    assert await cache.get("test") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_tags_are_removed_when_cache_is_cleared(cache):
+    await cache.set("test", "Ok!", tags=["users"])
+    await cache.clear()
+    await cache.set("test", "Ok!")
+    await cache.invalidate_tags(["users"])
+    assert await cache.get("test") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_keys_from_many_slots_are_deleted_when_tag_is_invalidated(cache):
+    keys = [f"test{i}" for i in range(20)]
+    for key in keys:
+        await cache.set(key, "Ok!", tags=["users"])
+    await cache.invalidate_tags(["users"])
+    assert await cache.get_many(keys) == {key: None for key in keys}
+
+
+@pytest.mark.asyncio
+async def test_tag_expires_with_its_key(cache):
+    await cache.set("test", "Ok!", ttl=100, tags=["users"])
+    assert 90 < await cache._backend._execute("TTL", cache.make_tag_key("users")) <= 100
+
+
+@pytest.mark.asyncio
+async def test_tag_expires_with_its_longest_living_key(cache):
+    await cache.set("test", "Ok!", ttl=100, tags=["users"])
+    await cache.set("test2", "Ok!", ttl=10, tags=["users"])
+    assert 90 < await cache._backend._execute("TTL", cache.make_tag_key("users")) <= 100
+    await cache.set("test3", "Ok!", ttl=1000, tags=["users"])
+    assert (
+        900 < await cache._backend._execute("TTL", cache.make_tag_key("users")) <= 1000
+    )
+
+
+@pytest.mark.asyncio
+async def test_tag_of_key_without_ttl_never_expires(cache):
+    await cache.set("test", "Ok!", ttl=100, tags=["users"])
+    await cache.set("test2", "Ok!", tags=["users"])
+    assert await cache._backend._execute("TTL", cache.make_tag_key("users")) == -1
+    await cache.set("test3", "Ok!", ttl=100, tags=["users"])
+    assert await cache._backend._execute("TTL", cache.make_tag_key("users")) == -1
+
+
+@pytest.mark.asyncio
+async def test_key_set_again_without_tags_is_kept_when_tag_is_invalidated(cache):
+    await cache.set("test", "Ok!", tags=["users"])
+    await cache.set("test", "Updated")
+    await cache.invalidate_tags(["users"])
+    assert await cache.get("test") == "Updated"
+
+
+@pytest.mark.asyncio
+async def test_key_set_again_with_other_tags_is_kept_when_old_tag_is_invalidated(cache):
+    await cache.set("test", "Ok!", tags=["users"])
+    await cache.set("test", "Updated", tags=["posts"])
+    await cache.invalidate_tags(["users"])
+    assert await cache.get("test") == "Updated"
+    await cache.invalidate_tags(["posts"])
+    assert await cache.get("test") is None
+
+
+@pytest.mark.asyncio
+async def test_keys_from_many_slots_set_again_are_kept_when_tag_is_invalidated(cache):
+    keys = [f"test{i}" for i in range(20)]
+    for key in keys:
+        await cache.set(key, "Ok!", tags=["users"])
+    await cache.set_many({key: "Updated" for key in keys[:10]})
+    await cache.delete_many(keys[10:])
+    await cache.set_many({key: "Added" for key in keys[10:]}, ttl=100)
+    await cache.invalidate_tags(["users"])
+    assert await cache.get_many(keys) == {
+        key: "Updated" if i < 10 else "Added" for i, key in enumerate(keys)
+    }
+
+
+@pytest.mark.asyncio
+async def test_key_without_hash_tag_and_with_brace_can_be_tagged(cache):
+    await cache.set("{}", "Ok!", tags=["users"])
+    await cache.touch("{}", 100)
+    await cache.invalidate_tags(["users"])
+    assert await cache.get("{}") is None
+
+
+@pytest.mark.asyncio
+async def test_key_tags_expire_with_key(cache):
+    backend = cache._backend
+    tags_key = backend._get_tags_key(cache.make_key("test"))
+    await cache.set("test", "Ok!", ttl=100, tags=["users"])
+    assert 90 < await backend._execute("TTL", tags_key) <= 100
+    await cache.touch_many(["test"], 1000)
+    assert 900 < await backend._execute("TTL", tags_key) <= 1000
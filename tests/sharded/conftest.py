@@ -0,0 +1,13 @@
+import pytest
+
+from caches import Cache
+
+
+@pytest.fixture
+async def cache():
+    obj = Cache("sharded://?shards=redis://localhost:6379/1,redis://localhost:6379/2")
+    await obj.connect()
+    await obj.clear()
+    yield obj
+    await obj.clear()
+    await obj.disconnect()
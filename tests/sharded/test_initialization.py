@@ -0,0 +1,93 @@
+# pylint: disable=protected-access
+import pytest
+
+from caches import Cache
+from caches.backends.locmem import LocMemBackend
+from caches.backends.redis import RedisBackend
+from caches.backends.sharded import ShardedBackend
+
+
+def test_backend_requires_shards_option():
+    with pytest.raises(AssertionError):
+        ShardedBackend("sharded://")
+
+
+def test_backend_creates_shards_from_urls_in_option():
+    backend = ShardedBackend("sharded://?shards=locmem://a, redis://localhost/1")
+    assert list(backend._shards) == ["locmem://a", "redis://localhost/1"]
+    assert isinstance(backend._shards["locmem://a"], LocMemBackend)
+    assert isinstance(backend._shards["redis://localhost/1"], RedisBackend)
+
+
+def test_backend_creates_shards_from_list_in_kwarg():
+    backend = ShardedBackend(
+        "sharded://", shards=["locmem://a?max_entries=10", "locmem://b?max_entries=10"]
+    )
+    assert list(backend._shards) == [
+        "locmem://a?max_entries=10",
+        "locmem://b?max_entries=10",
+    ]
+
+
+def test_backend_passes_its_options_to_shards():
+    backend = ShardedBackend(
+        "sharded://?shards=locmem://a", serializer="pickle", vnodes=40
+    )
+    shard = backend._shards["locmem://a"]
+    assert shard._get_option("serializer") == "pickle"
+    assert shard._get_option("vnodes") is None
+    assert backend._ring.vnodes == 40
+
+
+def test_backend_passes_its_url_options_to_shards():
+    backend = ShardedBackend(
+        "sharded://?shards=locmem://a,locmem://b&serializer=msgpack&vnodes=40"
+    )
+    for shard in backend._shards.values():
+        assert shard._get_option("serializer") == "msgpack"
+        assert shard._get_option("shards") is None
+        assert shard._get_option("vnodes") is None
+
+
+def test_backend_url_options_dont_override_shard_url_options():
+    backend = ShardedBackend(
+        "sharded://?serializer=msgpack",
+        shards=["locmem://a?serializer=pickle", "locmem://b"],
+    )
+    shards = list(backend._shards.values())
+    assert shards[0]._get_option("serializer") == "pickle"
+    assert shards[1]._get_option("serializer") == "msgpack"
+
+
+def test_sharded_backend_cant_be_shard():
+    with pytest.raises(AssertionError):
+        ShardedBackend("sharded://", shards=["sharded://?shards=locmem://a"])
+
+
+@pytest.mark.asyncio
+async def test_keys_are_spread_over_shards():
+    cache = Cache("sharded://?shards=locmem://shard1,locmem://shard2")
+    await cache.connect()
+    await cache.set_many({str(i): i for i in range(100)})
+
+    backend = cache._backend
+    for shard in backend._shards.values():
+        assert 20 < len(shard._caches[shard._id]) < 80
+
+    assert await cache.get_many([str(i) for i in range(100)]) == {
+        str(i): i for i in range(100)
+    }
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_key_is_stored_in_shard_selected_by_hash_ring():
+    cache = Cache("sharded://?shards=locmem://shard1,locmem://shard2")
+    await cache.connect()
+    await cache.set("test", "Ok!")
+
+    backend = cache._backend
+    key = cache.make_key("test")
+    shard = backend._shards[backend._ring.get_node(key)]
+    assert await shard.get(key, None) == "Ok!"
+    await cache.disconnect()
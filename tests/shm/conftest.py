@@ -0,0 +1,25 @@
+import os
+from uuid import uuid4
+
+import pytest
+
+from caches import Cache
+from caches.backends.shm import get_shm_dir
+
+
+@pytest.fixture
+def url():
+    name = uuid4().hex
+    yield f"shm://{name}?size=1048576&page_size=65536&buckets=1024"
+    path = os.path.join(get_shm_dir(), f"async-caches-{name}")
+    if os.path.exists(path):
+        os.remove(path)
+
+
+@pytest.fixture
+async def cache(url):
+    obj = Cache(url)
+    await obj.connect()
+    yield obj
+    await obj.clear()
+    await obj.disconnect()
@@ -0,0 +1,86 @@
+# pylint: disable=protected-access
+import os
+
+import pytest
+
+from caches import Cache
+from caches.backends.shm import SharedMemoryBackend, get_shm_dir
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_if_more_than_one_connection_is_opened(url):
+    cache = Cache(url)
+    await cache.connect()
+    with pytest.raises(AssertionError):
+        await cache.connect()
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_if_nonexistant_connection_is_closed(url):
+    cache = Cache(url)
+    with pytest.raises(AssertionError):
+        await cache.disconnect()
+
+
+def test_backend_file_name_is_read_from_url():
+    backend = SharedMemoryBackend("shm://sessions")
+    assert backend._path == os.path.join(get_shm_dir(), "async-caches-sessions")
+
+
+def test_backend_uses_default_file_name():
+    backend = SharedMemoryBackend("shm://")
+    assert backend._path == os.path.join(get_shm_dir(), "async-caches-default")
+
+
+def test_backend_options_can_be_set_in_url():
+    backend = SharedMemoryBackend(
+        "shm://test?size=1024&page_size=128&buckets=16&stripes=4"
+    )
+    assert backend._size == 1024
+    assert backend._page_size == 128
+    assert backend._buckets == 16
+    assert backend._stripes == 4
+
+
+def test_backend_errors_if_page_size_is_invalid():
+    with pytest.raises(AssertionError):
+        SharedMemoryBackend("shm://test?page_size=100")
+
+
+def test_backend_errors_if_null_serializer_is_set():
+    with pytest.raises(ValueError):
+        SharedMemoryBackend("shm://test?serializer=none")
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_if_size_is_too_small_for_single_page(url):
+    cache = Cache(url, size=65536)
+    with pytest.raises(AssertionError):
+        await cache.connect()
+
+
+@pytest.mark.asyncio
+async def test_backend_uses_layout_of_existing_cache(url):
+    cache = Cache(url)
+    await cache.connect()
+    await cache.set("test", "Ok!")
+
+    other = Cache(url, size=4 * 1048576, page_size=4096)
+    await other.connect()
+    assert other._backend._layout.page_size == 65536
+    assert await other.get("test") == "Ok!"
+    await other.disconnect()
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_cache_is_kept_after_disconnect(url):
+    cache = Cache(url)
+    await cache.connect()
+    await cache.set("test", "Ok!")
+    await cache.disconnect()
+
+    await cache.connect()
+    assert await cache.get("test") == "Ok!"
+    await cache.disconnect()
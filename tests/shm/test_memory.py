@@ -0,0 +1,116 @@
+# pylint: disable=protected-access
+import asyncio
+
+import pytest
+
+from caches import Cache
+from caches.backends.shm import get_chunk_sizes
+
+
+def test_chunk_sizes_grow_up_to_page_size():
+    sizes = get_chunk_sizes(4096)
+    assert sizes[0] == 64
+    assert sizes[-1] == 4096
+    assert sizes == sorted(sizes)
+    assert all(size % 8 == 0 for size in sizes)
+
+
+@pytest.mark.asyncio
+async def test_values_of_different_sizes_are_stored_in_different_slab_classes(cache):
+    await cache.set("small", "a")
+    await cache.set("large", "a" * 10000)
+    assert await cache.get("small") == "a"
+    assert await cache.get("large") == "a" * 10000
+
+    backend = cache._backend
+    small_class = backend._get_page_class(0)
+    large_class = backend._get_page_class(1)
+    assert small_class < large_class
+
+
+@pytest.mark.asyncio
+async def test_deleted_value_chunk_is_reused(cache):
+    await cache.set("test", "Ok!")
+    offset = cache._backend._find(*cache._backend._hash(cache.make_key("test"))[:2])[0]
+    await cache.delete("test")
+    await cache.set("other", "Ok!")
+    assert (
+        cache._backend._find(*cache._backend._hash(cache.make_key("other"))[:2])[0]
+        == offset
+    )
+
+
+@pytest.mark.asyncio
+async def test_oldest_values_are_evicted_when_memory_is_full(cache):
+    for i in range(20000):
+        await cache.set(str(i), i)
+
+    assert await cache.get("0") is None
+    assert await cache.get("19999") == 19999
+
+
+@pytest.mark.asyncio
+async def test_page_is_moved_to_other_slab_class_when_memory_is_full(cache):
+    for i in range(20000):
+        await cache.set(str(i), i)
+
+    await cache.set("large", "a" * 30000)
+    assert await cache.get("large") == "a" * 30000
+    assert await cache.get("19999") == 19999
+
+
+@pytest.mark.asyncio
+async def test_value_larger_than_page_cant_be_set(cache):
+    with pytest.raises(ValueError):
+        await cache.set("test", "a" * 70000)
+
+
+@pytest.mark.asyncio
+async def test_clear_returns_all_pages_to_pool(cache):
+    for i in range(100):
+        await cache.set(str(i), i)
+    await cache.clear()
+
+    assert await cache.get("0") is None
+    assert cache._backend._get_page_class(0) == -1
+
+
+@pytest.mark.asyncio
+async def test_expired_value_is_removed_when_key_is_set(cache):
+    await cache.set("test", "Ok!", ttl=1)
+    await asyncio.sleep(2)
+    assert await cache.get("test") is None
+    assert not await cache.touch("test", 10)
+    assert await cache.add("test", "New")
+    assert await cache.get("test") == "New"
+
+
+@pytest.mark.asyncio
+async def test_keys_with_the_same_bucket_are_stored_in_chain(url):
+    cache = Cache(url, buckets=1)
+    await cache.connect()
+    await cache.clear()
+    await cache.set_many({str(i): i for i in range(100)})
+    await cache.delete("50")
+    assert await cache.get_many([str(i) for i in range(100)]) == {
+        str(i): (i if i != 50 else None) for i in range(100)
+    }
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_increased_value_keeps_its_ttl(cache):
+    await cache.set("test", 1, ttl=1)
+    assert await cache.incr("test") == 2
+    await asyncio.sleep(2)
+    assert await cache.get("test") is None
+
+
+@pytest.mark.asyncio
+async def test_value_stored_as_bytes_can_be_increased(url):
+    cache = Cache(url, serializer="pickle")
+    await cache.connect()
+    await cache.set("test", 10)
+    assert await cache.incr("test") == 11
+    assert await cache.get("test") == 11
+    await cache.disconnect()
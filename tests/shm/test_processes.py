@@ -0,0 +1,47 @@
+import asyncio
+import multiprocessing
+
+import pytest
+
+from caches import Cache
+
+
+async def increase(url: str, times: int):
+    cache = Cache(url)
+    await cache.connect()
+    for i in range(times):
+        await cache.incr("counter")
+        await cache.set(f"key-{i}", "a" * (i % 500))
+    await cache.disconnect()
+
+
+def run_process(url: str, times: int):
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(increase(url, times))
+    loop.close()
+
+
+@pytest.mark.asyncio
+async def test_value_set_by_other_process_can_be_get(cache, url):
+    await cache.set("counter", 0)
+    process = multiprocessing.get_context("spawn").Process(
+        target=run_process, args=(url, 1)
+    )
+    process.start()
+    process.join()
+    assert await cache.get("counter") == 1
+    assert await cache.get("key-0") == ""
+
+
+@pytest.mark.asyncio
+async def test_concurrent_processes_dont_lose_writes(cache, url):
+    await cache.set("counter", 0)
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=run_process, args=(url, 500)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert all(process.exitcode == 0 for process in processes)
+    assert await cache.get("counter") == 2000
@@ -1,6 +1,10 @@
+import asyncio
+import time
+
 import pytest
 
 from caches import Cache
+from caches.core import ENTRY_KEY
 
 
 @pytest.fixture
@@ -8,8 +12,8 @@ def cache():
     return Cache("dummy://null")
 
 
-async def _testing_coroutine(test, test1='test'):
-    return 'Ok!'
+async def _testing_coroutine(test, test1="test"):
+    return "Ok!"
 
 
 def test_cache_created_key_includes_app_key(cache):
@@ -47,6 +51,31 @@ def test_cache_created_key_includes_prefix_and_version():
     assert "test" in key
 
 
+def test_cache_created_tag_key_includes_prefix_and_tag():
+    cache = Cache("dummy://null", key_prefix="prod", version="beta")
+    key = cache.make_tag_key("users")
+    assert key.startswith("prod")
+    assert "users" in key
+    assert "beta" not in key
+
+
+@pytest.mark.asyncio
+async def test_setting_key_with_tags_raises_error_if_backend_doesnt_support_tags(
+    tmp_path
+):
+    async with Cache(f"disk://{tmp_path}") as cache:
+        with pytest.raises(NotImplementedError):
+            await cache.set("test", "Ok!", tags=["users"])
+
+
+@pytest.mark.asyncio
+async def test_iterating_keys_raises_error_if_backend_doesnt_support_it():
+    cache = Cache("memcached://localhost")
+    with pytest.raises(NotImplementedError):
+        async for _ in cache.iter_keys():
+            pass
+
+
 def test_cache_key_prefix_can_be_set_in_url():
     cache = Cache("dummy://null?key_prefix=prod")
     key = cache.make_key("test")
@@ -122,6 +151,448 @@ async def test_cache_can_be_used_as_context_manager():
         await cache.set("test", "Ok!")
         assert await cache.get("test") == "Ok!"
 
-        assert await cache.get_or_set('test2', _testing_coroutine('arg', test1='kwarg')) == "Ok!"
+        assert (
+            await cache.get_or_set("test2", _testing_coroutine("arg", test1="kwarg"))
+            == "Ok!"
+        )
+
+        assert await cache(_testing_coroutine("arg", test1="kwarg")) == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_get_or_set_calls_for_same_key_evaluate_default_once():
+    calls = []
+
+    async def default():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "Ok!"
+
+    async with Cache("locmem://") as cache:
+        results = await asyncio.gather(
+            *[cache.get_or_set("test", default) for _ in range(10)]
+        )
+        assert results == ["Ok!"] * 10
+        assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_get_or_set_calls_for_different_keys_are_not_coalesced():
+    calls = []
+
+    async def default():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "Ok!"
+
+    async with Cache("locmem://") as cache:
+        await asyncio.gather(
+            cache.get_or_set("test", default), cache.get_or_set("other", default)
+        )
+        assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_get_or_set_calls_receive_default_exception():
+    async def default():
+        await asyncio.sleep(0.1)
+        raise ValueError("Failed!")
+
+    async with Cache("locmem://") as cache:
+        results = await asyncio.gather(
+            *[cache.get_or_set("test", default) for _ in range(3)],
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+        assert results[0] is results[1] is results[2]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cached_coroutine_calls_are_coalesced():
+    calls = []
+
+    async def coroutine(arg):
+        calls.append(arg)
+        await asyncio.sleep(0.1)
+        return arg
+
+    async with Cache("locmem://") as cache:
+        results = await asyncio.gather(cache(coroutine("a")), cache(coroutine("a")))
+        assert results == ["a", "a"]
+        assert calls == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_cancelling_get_or_set_caller_does_not_cancel_other_callers():
+    async def default():
+        await asyncio.sleep(0.1)
+        return "Ok!"
+
+    async with Cache("locmem://") as cache:
+        first = asyncio.ensure_future(cache.get_or_set("test", default))
+        second = asyncio.ensure_future(cache.get_or_set("test", default))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_early_recompute_sets_default_value():
+    async with Cache("locmem://") as cache:
+        assert (
+            await cache.get_or_set("test", "Ok!", ttl=10, early_recompute=True) == "Ok!"
+        )
+        assert (
+            await cache.get_or_set("test", "New", ttl=10, early_recompute=True) == "Ok!"
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_early_recompute_stores_delta_and_expiration_time():
+    async def default():
+        await asyncio.sleep(0.1)
+        return "Ok!"
+
+    async with Cache("locmem://") as cache:
+        await cache.get_or_set("test", default, ttl=10, early_recompute=True)
+        backend = cache._backend  # pylint: disable=protected-access
+        entry = await backend.get(cache.make_key("test"), None)
+        value, delta, expires = entry[ENTRY_KEY]
+        assert value == "Ok!"
+        assert delta >= 0.1
+        assert expires == pytest.approx(time.time() + 10, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_get_returns_value_set_by_get_or_set_with_early_recompute():
+    async with Cache("locmem://") as cache:
+        await cache.get_or_set("test", "Ok!", ttl=10, early_recompute=True)
+        assert await cache.get("test") == "Ok!"
+        assert await cache.get_many(["test"]) == {"test": "Ok!"}
+
+
+@pytest.mark.asyncio
+async def test_get_with_batch_size_returns_value_set_by_get_or_set_with_grace():
+    async with Cache("locmem://", batch_size=10) as cache:
+        await cache.get_or_set("test", "Ok!", ttl=10, grace=10)
+        assert await cache.get("test") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_returns_value_set_by_get_or_set_with_early_recompute():
+    async with Cache("locmem://") as cache:
+        await cache.get_or_set("test", "Ok!", ttl=10, early_recompute=True)
+        assert await cache.get_or_set("test", "New", ttl=10) == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_get_and_touch_returns_value_set_by_get_or_set_with_grace():
+    async with Cache("locmem://") as cache:
+        await cache.get_or_set("test", "Ok!", ttl=10, grace=10)
+        assert await cache.get_and_touch("test", ttl=10) == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_incr_raises_value_error_for_value_set_by_get_or_set_with_grace():
+    async with Cache("locmem://") as cache:
+        await cache.get_or_set("test", 1, ttl=10, grace=10)
+        with pytest.raises(ValueError):
+            await cache.incr("test")
+
+
+@pytest.mark.asyncio
+async def test_decr_raises_value_error_for_value_set_by_get_or_set_with_grace():
+    async with Cache("locmem://") as cache:
+        await cache.get_or_set("test", 1, ttl=10, grace=10)
+        with pytest.raises(ValueError):
+            await cache.decr("test")
+
+
+@pytest.mark.asyncio
+async def test_incr_many_raises_value_error_for_value_set_by_get_or_set_with_grace():
+    async with Cache("locmem://") as cache:
+        await cache.set("other", 1)
+        await cache.get_or_set("test", 1, ttl=10, grace=10)
+        with pytest.raises(ValueError):
+            await cache.incr_many({"other": 1, "test": 1})
+
+
+@pytest.mark.asyncio
+async def test_compare_and_set_compares_value_set_by_get_or_set_with_grace():
+    async with Cache("locmem://") as cache:
+        await cache.get_or_set("test", "Ok!", ttl=10, grace=10)
+        assert not await cache.compare_and_set("test", "Other", "New")
+        assert await cache.get("test") == "Ok!"
+        assert await cache.compare_and_set("test", "Ok!", "New")
+        assert await cache.get("test") == "New"
+
+
+@pytest.mark.asyncio
+async def test_delete_if_equal_compares_value_set_by_get_or_set_with_grace():
+    async with Cache("locmem://") as cache:
+        await cache.get_or_set("test", "Ok!", ttl=10, grace=10)
+        assert not await cache.delete_if_equal("test", "Other")
+        assert await cache.get("test") == "Ok!"
+        assert await cache.delete_if_equal("test", "Ok!")
+        assert await cache.get("test") is None
 
-        assert await cache(_testing_coroutine('arg', test1='kwarg')) == 'Ok!'
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_early_recompute_recomputes_value_set_without_it():
+    async with Cache("locmem://") as cache:
+        await cache.set("test", 1)
+        assert (
+            await cache.get_or_set("test", "New", ttl=10, early_recompute=True) == "New"
+        )
+        assert await cache.get("test") == "New"
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_early_recompute_doesnt_unpack_stored_list():
+    async with Cache("locmem://") as cache:
+        await cache.set("test", [1, 2, 3])
+        assert (
+            await cache.get_or_set("test", "New", ttl=10, early_recompute=True) == "New"
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_early_recompute_returns_stored_list():
+    async with Cache("locmem://") as cache:
+        await cache.get_or_set("test", [1, 2, 3], ttl=10, early_recompute=True)
+        assert await cache.get_or_set("test", "New", ttl=10, early_recompute=True) == [
+            1,
+            2,
+            3,
+        ]
+        assert await cache.get("test") == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_early_recompute_recomputes_value_before_expiration(
+    monkeypatch,
+):
+    async with Cache("locmem://") as cache:
+        await cache.get_or_set("test", "Ok!", ttl=10, early_recompute=True)
+        monkeypatch.setattr("caches.core.random", lambda: 0.5)
+        assert (
+            await cache.get_or_set("test", "New", ttl=10, early_recompute=1e9) == "New"
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_early_recompute_keeps_value_far_from_expiration(
+    monkeypatch,
+):
+    async with Cache("locmem://") as cache:
+        await cache.get_or_set("test", "Ok!", ttl=10, early_recompute=True)
+        monkeypatch.setattr("caches.core.random", lambda: 0.5)
+        assert (
+            await cache.get_or_set("test", "New", ttl=10, early_recompute=True) == "Ok!"
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_early_recompute_closes_unused_coroutine_default():
+    async def default():
+        return "New"
+
+    async with Cache("locmem://") as cache:
+        await cache.get_or_set("test", "Ok!", ttl=10, early_recompute=True)
+        coroutine = default()
+        assert (
+            await cache.get_or_set("test", coroutine, ttl=10, early_recompute=2.0)
+            == "Ok!"
+        )
+        assert coroutine.cr_frame is None
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_grace_returns_stale_value_and_refreshes_it():
+    async with Cache("locmem://") as cache:
+        await cache.get_or_set("test", "Ok!", ttl=1, grace=10)
+        await asyncio.sleep(1.5)
+        assert await cache.get_or_set("test", "New", ttl=1, grace=10) == "Ok!"
+        await asyncio.sleep(0)
+        assert await cache.get_or_set("test", "Newer", ttl=1, grace=10) == "New"
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_grace_sets_default_after_grace_period():
+    async with Cache("locmem://") as cache:
+        await cache.get_or_set("test", "Ok!", ttl=1, grace=1)
+        await asyncio.sleep(2.5)
+        assert await cache.get_or_set("test", "New", ttl=1, grace=1) == "New"
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_grace_refreshes_key_once():
+    calls = []
+
+    async def default():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "New"
+
+    async with Cache("locmem://") as cache:
+        await cache.get_or_set("test", "Ok!", ttl=1, grace=10)
+        await asyncio.sleep(1.5)
+        results = await asyncio.gather(
+            *[cache.get_or_set("test", default, ttl=1, grace=10) for _ in range(5)]
+        )
+        assert results == ["Ok!"] * 5
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_grace_limits_number_of_concurrent_refreshes():
+    async def default():
+        await asyncio.sleep(0.1)
+        return "New"
+
+    async with Cache("locmem://", max_refreshes=1) as cache:
+        entry = {ENTRY_KEY: ["Ok!", 0, 0]}
+        await cache.set_many({"a": entry, "b": entry}, ttl=10)
+        assert await cache.get_or_set("a", default, ttl=1, grace=10) == "Ok!"
+        assert await cache.get_or_set("b", default, ttl=1, grace=10) == "Ok!"
+        assert len(cache._refreshes) == 1  # pylint: disable=protected-access
+
+
+def test_max_refreshes_can_be_set_in_url():
+    cache = Cache("locmem://?max_refreshes=5")
+    assert cache.max_refreshes == 5
+
+
+def test_max_refreshes_set_to_zero_overrides_url():
+    cache = Cache("locmem://?max_refreshes=5", max_refreshes=0)
+    assert cache.max_refreshes == 0
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_with_grace_doesnt_refresh_if_max_refreshes_is_zero():
+    async with Cache("locmem://", max_refreshes=0) as cache:
+        await cache.get_or_set("test", "Ok!", ttl=1, grace=10)
+        await asyncio.sleep(1.5)
+        assert await cache.get_or_set("test", "New", ttl=1, grace=10) == "Ok!"
+        assert not cache._refreshes  # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+async def test_disconnect_waits_for_pending_refreshes():
+    async def default():
+        await asyncio.sleep(0.1)
+        return "New"
+
+    cache = Cache("locmem://")
+    await cache.connect()
+    await cache.get_or_set("test", "Ok!", ttl=1, grace=10)
+    await asyncio.sleep(1.5)
+    await cache.get_or_set("test", default, ttl=1, grace=10)
+    refreshes = cache._refreshes  # pylint: disable=protected-access
+    refresh = refreshes[cache.make_key("test")]
+    await cache.disconnect()
+    assert refresh.done()
+    assert refresh.result() == "New"
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_stale_value(caplog):
+    async def default():
+        raise ValueError("Failed!")
+
+    async with Cache("locmem://") as cache:
+        await cache.get_or_set("test", "Ok!", ttl=1, grace=10)
+        await asyncio.sleep(1.5)
+        assert await cache.get_or_set("test", default, ttl=1, grace=10) == "Ok!"
+        await asyncio.sleep(0)
+        assert await cache.get_or_set("test", "New", ttl=1, grace=10) == "Ok!"
+    assert "Failed!" in caplog.text
+
+
+def _count_get_many_calls(cache):
+    calls = []
+    get_many = cache._backend.get_many  # pylint: disable=protected-access
+
+    async def counted_get_many(keys):
+        calls.append(list(keys))
+        return await get_many(keys)
+
+    cache._backend.get_many = counted_get_many  # pylint: disable=protected-access
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_gets_are_read_from_backend_in_single_batch():
+    async with Cache("locmem://", batch_size=100) as cache:
+        await cache.set_many({"a": 1, "b": 2})
+        calls = _count_get_many_calls(cache)
+        results = await asyncio.gather(cache.get("a"), cache.get("b"), cache.get("a"))
+        assert results == [1, 2, 1]
+        assert calls == [[cache.make_key("a"), cache.make_key("b")]]
+
+
+@pytest.mark.asyncio
+async def test_batched_get_returns_default_for_undefined_key():
+    async with Cache("locmem://?batch_size=100") as cache:
+        await cache.set("test", "Ok!")
+        results = await asyncio.gather(
+            cache.get("test", "default"), cache.get("undefined", "default")
+        )
+        assert results == ["Ok!", "default"]
+
+
+@pytest.mark.asyncio
+async def test_batched_get_respects_key_version():
+    async with Cache("locmem://", batch_size=100) as cache:
+        await cache.set("test", "Ok!", version=1)
+        await cache.set("test", "Nope!", version=2)
+        results = await asyncio.gather(
+            cache.get("test", version=1), cache.get("test", version=2)
+        )
+        assert results == ["Ok!", "Nope!"]
+
+
+@pytest.mark.asyncio
+async def test_batch_is_read_when_its_size_limit_is_reached():
+    async with Cache("locmem://", batch_size=2) as cache:
+        calls = _count_get_many_calls(cache)
+        await asyncio.gather(*[cache.get(str(i)) for i in range(5)])
+        assert [len(keys) for keys in calls] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_batch_waits_for_more_keys_if_wait_time_is_set():
+    async with Cache("locmem://", batch_size=100, batch_wait=50000) as cache:
+        calls = _count_get_many_calls(cache)
+
+        async def delayed_get(key):
+            await asyncio.sleep(0.01)
+            return await cache.get(key)
+
+        await asyncio.gather(cache.get("a"), delayed_get("b"))
+        assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_error_is_raised_for_all_gets_in_batch():
+    async with Cache("locmem://", batch_size=100) as cache:
+
+        async def failing_get_many(keys):
+            raise ValueError("Failed!")
+
+        cache._backend.get_many = failing_get_many  # pylint: disable=protected-access
+        results = await asyncio.gather(
+            cache.get("a"), cache.get("b"), return_exceptions=True
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_batching_can_be_disabled_with_zero_batch_size_overriding_url():
+    async with Cache("locmem://?batch_size=100&batch_wait=5", batch_size=0) as cache:
+        await cache.set_many({"a": 1, "b": 2})
+        calls = _count_get_many_calls(cache)
+        assert await asyncio.gather(cache.get("a"), cache.get("b")) == [1, 2]
+        assert not calls
+        assert cache.batch_size == 0
+        assert cache.batch_wait == 5
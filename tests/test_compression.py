@@ -0,0 +1,54 @@
+import pytest
+
+from caches.compression import (
+    LZMACompressor,
+    ZlibCompressor,
+    compress,
+    decompress,
+    get_compressor,
+)
+
+
+@pytest.mark.parametrize("name", ["lz4", "lzma", "zlib", "zstd"])
+def test_compressed_value_is_decompressed(name):
+    if name == "lz4":
+        pytest.importorskip("lz4.frame")
+    if name == "zstd":
+        pytest.importorskip("zstandard")
+    value = b'{"hello": "world"}' * 100
+    compressed = compress(value, get_compressor(name), 100)
+    assert len(compressed) < len(value)
+    assert decompress(compressed) == value
+
+
+def test_str_value_is_compressed_as_utf8_bytes():
+    value = '"łóć"' * 100
+    compressed = compress(value, ZlibCompressor(), 100)
+    assert decompress(compressed) == value.encode("utf-8")
+
+
+def test_value_shorter_than_threshold_is_not_compressed():
+    value = b'{"hello": "world"}' * 10
+    assert compress(value, ZlibCompressor(), 1000) is value
+
+
+def test_value_is_not_compressed_if_compression_makes_it_larger():
+    value = bytes(range(200))
+    assert compress(value, LZMACompressor(), 100) is value
+
+
+def test_value_compressed_by_other_compressor_is_decompressed():
+    value = b"[1, 2, 3]" * 100
+    assert decompress(compress(value, LZMACompressor(), 10)) == value
+
+
+@pytest.mark.parametrize(
+    "value", [b'{"hello": "world"}', b"\x80\x04K\x01.", b"\x01", "str"]
+)
+def test_uncompressed_value_is_returned_unchanged(value):
+    assert decompress(value) is value
+
+
+def test_getting_unsupported_compressor_raises_value_error():
+    with pytest.raises(ValueError):
+        get_compressor("rar")
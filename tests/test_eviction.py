@@ -0,0 +1,71 @@
+import pytest
+
+from caches.eviction import LFUPolicy, LRUPolicy, get_eviction_policy
+
+
+def test_lru_policy_evicts_least_recently_used_key():
+    policy = LRUPolicy()
+    policy.add("a", 1)
+    policy.add("b", 1)
+    policy.add("c", 1)
+    policy.touch("a")
+    assert policy.evict() == "b"
+    assert policy.evict() == "c"
+    assert policy.evict() == "a"
+
+
+def test_lfu_policy_evicts_least_frequently_used_key():
+    policy = LFUPolicy()
+    policy.add("a", 1)
+    policy.add("b", 1)
+    policy.add("c", 1)
+    policy.touch("a")
+    policy.touch("a")
+    policy.touch("c")
+    assert policy.evict() == "b"
+    assert policy.evict() == "c"
+    assert policy.evict() == "a"
+
+
+def test_lfu_policy_evicts_least_recently_used_key_on_frequency_tie():
+    policy = LFUPolicy()
+    policy.add("a", 1)
+    policy.add("b", 1)
+    policy.touch("b")
+    policy.touch("a")
+    assert policy.evict() == "b"
+
+
+def test_lfu_policy_handles_removal_of_least_frequent_key():
+    policy = LFUPolicy()
+    policy.add("a", 1)
+    policy.add("b", 1)
+    policy.touch("b")
+    policy.remove("a")
+    policy.add("c", 1)
+    assert policy.evict() == "c"
+    assert policy.evict() == "b"
+
+
+def test_policy_tracks_total_size_of_keys():
+    policy = LRUPolicy()
+    policy.add("a", 10)
+    policy.add("b", 5)
+    policy.add("a", 2)
+    assert policy.size == 7
+    policy.remove("b")
+    assert policy.size == 2
+    assert len(policy) == 1
+
+
+def test_policy_counts_evictions():
+    policy = LFUPolicy()
+    policy.add("a", 1)
+    policy.add("b", 1)
+    policy.evict()
+    assert policy.evictions == 1
+
+
+def test_getting_unsupported_eviction_policy_raises_value_error():
+    with pytest.raises(ValueError):
+        get_eviction_policy("fifo")
@@ -0,0 +1,65 @@
+import pytest
+
+from caches.hashring import HashRing
+
+KEYS = [f"key:{i}" for i in range(10000)]
+
+
+def test_hash_ring_maps_key_to_same_node():
+    ring = HashRing(["a", "b", "c"])
+    assert ring.get_node("test") == ring.get_node("test")
+    assert ring.get_node("test") == HashRing(["c", "b", "a"]).get_node("test")
+
+
+def test_hash_ring_spreads_keys_evenly_over_nodes():
+    ring = HashRing(["a", "b", "c", "d"])
+    counts = {node: 0 for node in ring.nodes}
+    for key in KEYS:
+        counts[ring.get_node(key)] += 1
+    for count in counts.values():
+        assert 1800 < count < 3200
+
+
+def test_adding_node_to_hash_ring_moves_keys_only_to_new_node():
+    ring = HashRing(["a", "b", "c", "d"])
+    before = {key: ring.get_node(key) for key in KEYS}
+    ring.add("e")
+    moved = [key for key in KEYS if ring.get_node(key) != before[key]]
+    assert all(ring.get_node(key) == "e" for key in moved)
+    assert 1400 < len(moved) < 2600
+
+
+def test_removing_node_from_hash_ring_moves_only_its_keys():
+    ring = HashRing(["a", "b", "c", "d"])
+    before = {key: ring.get_node(key) for key in KEYS}
+    ring.remove("d")
+    for key in KEYS:
+        if before[key] != "d":
+            assert ring.get_node(key) == before[key]
+        else:
+            assert ring.get_node(key) != "d"
+
+
+def test_hash_ring_has_points_for_every_virtual_node():
+    ring = HashRing(["a", "b"], vnodes=10)
+    assert len(ring._points) == 20  # pylint: disable=protected-access
+
+
+def test_hash_ring_tracks_its_nodes():
+    ring = HashRing(["a"])
+    ring.add("b")
+    assert len(ring) == 2
+    assert "b" in ring
+    ring.remove("a")
+    assert ring.nodes == ["b"]
+
+
+def test_adding_node_already_in_hash_ring_raises_error():
+    ring = HashRing(["a"])
+    with pytest.raises(AssertionError):
+        ring.add("a")
+
+
+def test_empty_hash_ring_raises_error_for_key():
+    with pytest.raises(AssertionError):
+        HashRing().get_node("test")
@@ -0,0 +1,76 @@
+import pytest
+
+from caches import Cache
+from caches.serializers import (
+    JSONSerializer,
+    NullSerializer,
+    PickleSerializer,
+    get_serializer,
+)
+
+
+class CustomSerializer:
+    def dumps(self, value):
+        return repr(value)
+
+    def loads(self, value):
+        return value
+
+
+def test_json_serializer_is_used_by_default():
+    assert isinstance(get_serializer(), JSONSerializer)
+
+
+def test_serializer_can_be_get_by_name():
+    assert isinstance(get_serializer("pickle"), PickleSerializer)
+    assert isinstance(get_serializer("none"), NullSerializer)
+
+
+def test_serializer_can_be_get_by_import_string():
+    serializer = get_serializer("tests.test_serializers:CustomSerializer")
+    assert isinstance(serializer, CustomSerializer)
+
+
+def test_custom_serializer_class_is_instantiated():
+    assert isinstance(get_serializer(CustomSerializer), CustomSerializer)
+
+
+def test_custom_serializer_instance_is_returned_unchanged():
+    serializer = CustomSerializer()
+    assert get_serializer(serializer) is serializer
+
+
+def test_getting_unsupported_serializer_raises_value_error():
+    with pytest.raises(ValueError):
+        get_serializer("invalid")
+
+
+def test_getting_object_without_dumps_and_loads_raises_value_error():
+    with pytest.raises(ValueError):
+        get_serializer(object())
+
+
+@pytest.mark.parametrize("name", ["json", "msgpack", "orjson", "pickle"])
+def test_serializer_restores_serialized_value(name):
+    if name in ("msgpack", "orjson"):
+        pytest.importorskip(name)
+    serializer = get_serializer(name)
+    value = {"hello": ["world", 1, 2.5, True, None]}
+    assert serializer.loads(serializer.dumps(value)) == value
+
+
+def test_pickle_serializer_preserves_tuples():
+    serializer = PickleSerializer()
+    assert serializer.loads(serializer.dumps(("a", 1))) == ("a", 1)
+
+
+def test_serializer_can_be_set_on_cache_in_url():
+    cache = Cache("dummy://null?serializer=pickle")
+    serializer = cache._backend._serializer  # pylint: disable=protected-access
+    assert isinstance(serializer, PickleSerializer)
+
+
+def test_serializer_can_be_set_on_cache_in_kwarg():
+    cache = Cache("dummy://null?serializer=json", serializer="pickle")
+    serializer = cache._backend._serializer  # pylint: disable=protected-access
+    assert isinstance(serializer, PickleSerializer)
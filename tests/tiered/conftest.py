@@ -0,0 +1,13 @@
+import pytest
+
+from caches import Cache
+
+
+@pytest.fixture
+async def cache():
+    obj = Cache("tiered://?l1=locmem&l2=redis://localhost:6379/1")
+    await obj.connect()
+    await obj.clear()
+    yield obj
+    await obj.clear()
+    await obj.disconnect()
@@ -0,0 +1,73 @@
+# pylint: disable=protected-access
+import pytest
+
+from caches import Cache
+from caches.backends.locmem import LocMemBackend
+from caches.backends.redis import RedisBackend
+from caches.serializers import JSONSerializer, PickleSerializer
+
+
+def test_tiered_cache_can_be_initialized_with_l1_and_l2_urls():
+    cache = Cache("tiered://?l1=locmem://near&l2=redis://localhost/1")
+    assert isinstance(cache._backend._l1, LocMemBackend)
+    assert isinstance(cache._backend._l2, RedisBackend)
+
+
+def test_tiered_cache_can_be_initialized_with_l1_and_l2_kwargs():
+    cache = Cache("tiered://", l1="locmem", l2="redis://localhost/1")
+    assert isinstance(cache._backend._l1, LocMemBackend)
+    assert isinstance(cache._backend._l2, RedisBackend)
+
+
+def test_tiered_cache_l1_defaults_to_locmem():
+    cache = Cache("tiered://?l2=redis://localhost/1")
+    assert isinstance(cache._backend._l1, LocMemBackend)
+
+
+def test_tiered_cache_requires_l2():
+    with pytest.raises(AssertionError):
+        Cache("tiered://?l1=locmem")
+
+
+def test_tiered_cache_errors_for_invalid_tier_backend():
+    with pytest.raises(AssertionError):
+        Cache("tiered://?l2=invalid://")
+
+
+def test_tiered_cache_l1_is_bounded_by_default():
+    cache = Cache("tiered://?l2=redis://localhost/1&l1_max_entries=100")
+    assert cache._backend._l1._get_option("max_entries") == 100
+
+
+def test_tiered_cache_l1_limit_can_be_set_in_l1_url():
+    cache = Cache(
+        "tiered://", l1="locmem://near?max_bytes=1000", l2="redis://localhost/1"
+    )
+    assert cache._backend._l1._get_option("max_entries") is None
+    assert cache._backend._l1._get_option("max_bytes") == "1000"
+
+
+def test_tiered_cache_l1_ttl_can_be_set_in_url():
+    cache = Cache("tiered://?l2=redis://localhost/1&l1_ttl=2")
+    assert cache._backend._l1_ttl == 2
+
+
+def test_tiered_cache_passes_url_options_to_tiers():
+    cache = Cache("tiered://?l1=locmem&l2=redis://localhost/1&serializer=pickle")
+    assert isinstance(cache._backend._l1._serializer, PickleSerializer)
+    assert isinstance(cache._backend._l2._serializer, PickleSerializer)
+
+
+def test_tiered_cache_url_options_dont_override_tier_url_options():
+    cache = Cache(
+        "tiered://?serializer=pickle",
+        l1="locmem",
+        l2="redis://localhost/1?serializer=json",
+    )
+    assert isinstance(cache._backend._l1._serializer, PickleSerializer)
+    assert isinstance(cache._backend._l2._serializer, JSONSerializer)
+
+
+def test_tiered_cache_l1_limit_can_be_set_in_url():
+    cache = Cache("tiered://?l2=redis://localhost/1&max_entries=100")
+    assert cache._backend._l1._get_option("max_entries") == "100"
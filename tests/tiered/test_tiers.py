@@ -0,0 +1,64 @@
+# pylint: disable=protected-access
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_value_read_from_l2_is_stored_in_l1(cache):
+    key = cache.make_key("test")
+    await cache._backend._l2.set(key, "Ok!", ttl=None)
+    assert await cache.get("test") == "Ok!"
+    assert await cache._backend._l1.get(key, None) == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_value_is_read_from_l1_before_l2(cache):
+    key = cache.make_key("test")
+    await cache.set("test", "Ok!")
+    await cache._backend._l2.set(key, "Changed", ttl=None)
+    assert await cache.get("test") == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_set_value_is_written_to_both_tiers(cache):
+    key = cache.make_key("test")
+    await cache.set("test", "Ok!")
+    assert await cache._backend._l1.get(key, None) == "Ok!"
+    assert await cache._backend._l2.get(key, None) == "Ok!"
+
+
+@pytest.mark.asyncio
+async def test_deleted_value_is_removed_from_both_tiers(cache):
+    key = cache.make_key("test")
+    await cache.set("test", "Ok!")
+    await cache.delete("test")
+    assert await cache._backend._l1.get(key, None) is None
+    assert await cache._backend._l2.get(key, None) is None
+
+
+@pytest.mark.asyncio
+async def test_many_values_missing_in_l1_are_read_from_l2(cache):
+    await cache.set("test", "Ok!")
+    await cache._backend._l2.set(cache.make_key("other"), "Hello", ttl=None)
+    assert await cache.get_many(["test", "other", "undefined"]) == {
+        "test": "Ok!",
+        "other": "Hello",
+        "undefined": None,
+    }
+    assert await cache._backend._l1.get(cache.make_key("other"), None) == "Hello"
+
+
+@pytest.mark.asyncio
+async def test_increased_value_is_removed_from_l1(cache):
+    await cache.set("test", 1)
+    assert await cache.incr("test") == 2
+    assert await cache._backend._l1.get(cache.make_key("test"), None) is None
+    assert await cache.get("test") == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidated_tag_deletes_key_from_both_tiers(cache):
+    key = cache.make_key("test")
+    await cache.set("test", "Ok!", tags=["users"])
+    await cache.invalidate_tags(["users"])
+    assert await cache._backend._l1.get(key, None) is None
+    assert await cache._backend._l2.get(key, None) is None